@@ -1,3 +1,14 @@
 from django.contrib import admin
+from .models import SiteStats
 
-# Register your models here.
+
+@admin.register(SiteStats)
+class SiteStatsAdmin(admin.ModelAdmin):
+    list_display = ('site_name', 'total_time', 'samples', 'p50_ms', 'p95_ms', 'p99_ms', 'error_rate', 'breaker_state', 'updated_at')
+    list_filter = ('breaker_state',)
+    search_fields = ('site_name',)
+    ordering = ('-total_time',)
+    readonly_fields = [field.name for field in SiteStats._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
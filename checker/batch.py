@@ -0,0 +1,307 @@
+"""
+Enquêtes par lots : usernames × sites à travers le pipeline partagé.
+
+Les résultats sont ajoutés ligne par ligne dans un fichier JSONL ou CSV.
+Un lot interrompu se reprend en relançant le même lot sur le même fichier :
+les couples (site, username) au verdict définitif ne sont pas sondés à
+nouveau. Les sondes sautées (disjoncteur) ou sans réponse exploitable
+(erreur, 5xx, 429) sont retirées du fichier et refaites.
+"""
+import csv
+import json
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.urls import reverse
+
+from .cache import verdict_of
+from .catalog import get_catalog
+from .engine import get_engine
+
+FORMATS = ("jsonl", "csv")
+CSV_FIELDS = ["username", "site", "category", "exists", "status", "url", "error"]
+
+# Suivi des lots lancés depuis l'API (même principe que perforNet)
+batch_jobs = {}
+batch_jobs_lock = threading.Lock()
+
+
+def read_usernames(lines):
+    """Un username par ligne ; lignes vides et commentaires (#) ignorés, doublons retirés"""
+    seen = set()
+    usernames = []
+    for line in lines:
+        username = line.strip()
+        if not username or username.startswith("#") or username in seen:
+            continue
+        seen.add(username)
+        usernames.append(username)
+    return usernames
+
+
+def read_usernames_file(path):
+    with open(path, encoding="utf-8") as f:
+        return read_usernames(f)
+
+
+def is_definitive(row):
+    """Verdict à garder à la reprise : ni sonde sautée, ni erreur (voir cache.verdict_of)"""
+    status = row.get("status")
+    if status in (None, ""):
+        # Ligne CSV tronquée par une interruption
+        return False
+    if isinstance(status, str) and status.isdigit():
+        # Le CSV ne garde que du texte
+        status = int(status)
+    if status == "NO_URL":
+        # Pas d'URL pour ce site : une nouvelle sonde n'y changerait rien
+        return True
+    return status != "SKIPPED" and verdict_of({"status": status}) != "error"
+
+
+def read_rows(f, fmt):
+    """Lignes (dict) d'un fichier de résultats ouvert"""
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+    for line in f:
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            # Dernière ligne tronquée par une interruption : elle sera refaite
+            continue
+
+
+def completed_pairs(output_path, fmt):
+    """Couples (site, username) du fichier de sortie dont le verdict est définitif"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, encoding="utf-8", newline="") as f:
+        for row in read_rows(f, fmt):
+            if is_definitive(row):
+                done.add((row["site"], row["username"]))
+    return done
+
+
+def truncate_partial_line(path):
+    """Supprime une dernière ligne incomplète (JSONL ou CSV) avant de reprendre"""
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        position = size - 1
+        while position > 0:
+            f.seek(position - 1)
+            if f.read(1) == b"\n":
+                break
+            position -= 1
+        f.truncate(position)
+
+
+def prepare_output(output_path, fmt):
+    """
+    Reprise : retire la ligne tronquée par une interruption et les lignes à
+    refaire (is_definitive faux), qui seront réécrites par les nouvelles sondes
+    """
+    if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+        return
+    truncate_partial_line(output_path)
+    with open(output_path, encoding="utf-8", newline="") as f:
+        if all(is_definitive(row) for row in read_rows(f, fmt)):
+            return
+
+    temp_path = output_path + ".part"
+    with open(output_path, encoding="utf-8", newline="") as src, \
+            open(temp_path, "w", encoding="utf-8", newline="") as dst:
+        if fmt == "csv":
+            writer = csv.DictWriter(dst, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+        for row in read_rows(src, fmt):
+            if not is_definitive(row):
+                continue
+            if fmt == "csv":
+                writer.writerow(row)
+            else:
+                dst.write(json.dumps(row, ensure_ascii=False) + "\n")
+    os.replace(temp_path, output_path)
+
+
+class ResultWriter:
+    """Ajoute les verdicts au fichier de sortie, une ligne à la fois"""
+
+    def __init__(self, output_path, fmt):
+        self.fmt = fmt
+        is_new = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self._file = open(output_path, "a", encoding="utf-8", newline="")
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+            if is_new:
+                self._csv.writeheader()
+
+    def write(self, row):
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def run_batch(usernames, output_path, fmt="jsonl", category=None,
+              force_refresh=False, progress=None, stop=None):
+    """
+    Exécute (ou reprend) un lot. `progress(done, total)` est appelé au fil
+    de l'eau ; `stop` (threading.Event) permet d'interrompre proprement.
+    Renvoie le nombre de sondes effectuées pendant cet appel.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format inconnu : {fmt}")
+
+    sites = get_catalog().for_category(category)
+    total = len(usernames) * len(sites)
+    prepare_output(output_path, fmt)
+    skip = completed_pairs(output_path, fmt)
+    done = len(skip)
+    if progress is not None:
+        progress(done, total)
+
+    def batches():
+        for username in usernames:
+            items = [(site.name, site) for site in sites if (site.name, username) not in skip]
+            if items:
+                yield username, items
+
+    engine = get_engine()
+    window = engine.max_workers * 4
+    writer = ResultWriter(output_path, fmt)
+    probed = 0
+    try:
+        for _, site, username, scan in engine.iter_batches(batches(), force_refresh, window):
+            writer.write({
+                "username": username,
+                "site": site.name,
+                "category": site.cat,
+                "exists": bool(scan.get("exists")),
+                "status": scan.get("status"),
+                "url": scan.get("url"),
+                # Une ligne par sonde, y compris en CSV (reprise ligne à ligne)
+                "error": " ".join(scan.get("error", "").split()),
+            })
+            probed += 1
+            done += 1
+            if progress is not None:
+                progress(done, total)
+            if stop is not None and stop.is_set():
+                break
+    finally:
+        writer.close()
+    return probed
+
+
+# --- Lots lancés depuis l'API --------------------------------------------------
+
+def batch_dir():
+    path = getattr(settings, "CHECKER_BATCH_DIR", "checker_batches")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def job_paths(job_id, fmt):
+    """(liste des usernames, métadonnées, fichier de résultats)"""
+    base = os.path.join(batch_dir(), job_id)
+    return base + ".txt", base + ".json", f"{base}.{fmt}"
+
+
+def create_job(usernames, fmt="jsonl", category=None, force_refresh=False):
+    """Enregistre la liste sur disque et démarre le lot en arrière-plan"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Format inconnu : {fmt}")
+    job_id = uuid.uuid4().hex[:12]
+    input_path, meta_path, _ = job_paths(job_id, fmt)
+    with open(input_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(usernames) + "\n")
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"format": fmt, "category": category or ""}, f)
+    return start_job(job_id, force_refresh)
+
+
+def load_job_meta(job_id):
+    """Métadonnées d'un lot, ou None s'il n'existe pas sur disque"""
+    if not job_id.isalnum():
+        return None
+    _, meta_path, _ = job_paths(job_id, "jsonl")
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def start_job(job_id, force_refresh=False):
+    """Démarre (ou reprend, y compris après redémarrage) un lot dans un thread"""
+    meta = load_job_meta(job_id)
+    if meta is None:
+        return None
+    fmt, category = meta["format"], meta["category"] or None
+    input_path, _, output_path = job_paths(job_id, fmt)
+    usernames = read_usernames_file(input_path)
+
+    with batch_jobs_lock:
+        job = batch_jobs.get(job_id)
+        if job is not None and job["status"] == "running":
+            return job
+        job = {
+            "id": job_id,
+            "status": "running",
+            "format": fmt,
+            "category": category or "",
+            "usernames": len(usernames),
+            "done": 0,
+            "total": 0,
+            "output": output_path,
+            "started_at": time.time(),
+            "error": "",
+            "stop": threading.Event(),
+        }
+        batch_jobs[job_id] = job
+
+    def progress(done, total):
+        job["done"] = done
+        job["total"] = total
+
+    def target():
+        try:
+            run_batch(usernames, output_path, fmt, category, force_refresh,
+                      progress=progress, stop=job["stop"])
+            job["status"] = "stopped" if job["stop"].is_set() else "completed"
+        except Exception as e:
+            print(f"[checker] Lot {job_id} en erreur : {e}")
+            job["status"] = "failed"
+            job["error"] = str(e)
+
+    threading.Thread(target=target, daemon=True).start()
+    return job
+
+
+def download_url(job_id):
+    """URL de téléchargement des résultats (le chemin sur le serveur n'est jamais exposé)"""
+    return reverse("batch_download", args=[job_id])
+
+
+def job_status(job):
+    """Vue sérialisable d'un lot"""
+    status = {key: value for key, value in job.items() if key not in ("stop", "output")}
+    status["download"] = download_url(job["id"])
+    return status
@@ -0,0 +1,144 @@
+"""
+Banc d'essai hors ligne du pipeline checker.
+
+Un serveur HTTP local (processus séparé) imite chaque site du catalogue sur
+/s/<index>/<account> : latence, codes, taille de corps et timeouts sont
+configurables. Le moteur (cache et statistiques en mémoire uniquement) est
+lancé sur ce catalogue réécrit et on mesure le temps mural des recherches,
+les sondes par seconde, les latences p50/p99 par sonde, les connexions TCP
+ouvertes (réutilisation keep-alive) et le pic de RSS.
+"""
+import multiprocessing
+import random
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from django.conf import settings
+
+from . import client
+from .cache import ProbeCache
+from .catalog import CompiledSite
+from .engine import ProbeEngine
+from .health import HealthTracker, percentile
+from .stub_server import ERROR, FOUND, MISSING, TIMEOUT, serve
+
+
+def build_specs(sites, options):
+    """Comportement déterministe (graine) de chaque site imité"""
+    rng = random.Random(options["seed"])
+    specs = []
+    for site in sites:
+        roll = rng.random()
+        if roll < options["error_ratio"]:
+            kind = ERROR
+        elif roll < options["error_ratio"] + options["timeout_ratio"]:
+            kind = TIMEOUT
+        elif roll < options["error_ratio"] + options["timeout_ratio"] + options["found_ratio"]:
+            kind = FOUND
+        else:
+            kind = MISSING
+        specs.append({
+            "kind": kind,
+            "e_code": site.e_code,
+            "e_string": site.e_string,
+            "m_code": site.m_code,
+            "m_string": site.m_string,
+            "latency": options["latency_ms"] / 1000 * rng.lognormvariate(0, options["jitter"]),
+        })
+    return specs
+
+
+def stub_sites(sites, port):
+    """Copie du catalogue dont chaque site pointe vers le serveur local"""
+    stubs = []
+    for index, site in enumerate(sites):
+        raw = dict(site.raw)
+        raw["uri_check"] = f"http://127.0.0.1:{port}/s/{index}/{{account}}"
+        raw.pop("uri_pretty", None)
+        stubs.append(CompiledSite(raw))
+    return stubs
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss est en kilo-octets sous Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def run_benchmark(sites, options):
+    """
+    Lance le serveur, exécute les recherches et renvoie un rapport (dict).
+    Options : latency_ms, jitter, found_ratio, error_ratio, timeout_ratio,
+    body_kb, match_position, probe_timeout, workers, per_host, runs, seed.
+    """
+    sites = list(sites)
+    specs = build_specs(sites, options)
+
+    context = multiprocessing.get_context("spawn")
+    port_queue = context.Queue()
+    server = context.Process(target=serve, args=(specs, options, port_queue), daemon=True)
+    server.start()
+    try:
+        port = port_queue.get(timeout=30)
+        stubs = stub_sites(sites, port)
+
+        health = HealthTracker(
+            window=options["runs"] + 1,
+            max_timeout=options["probe_timeout"],
+            persistent=False,
+        )
+        per_host = options["per_host"] or options["workers"]
+        engine = ProbeEngine(
+            max_workers=options["workers"],
+            per_host_limit=per_host,
+            timeout=options["probe_timeout"],
+            cache=ProbeCache(persistent=False),
+            health=health,
+            session=client.build_session(
+                per_host=per_host,
+                retries=getattr(settings, "CHECKER_RETRIES", 1),
+                backoff=getattr(settings, "CHECKER_RETRY_BACKOFF", 0.3),
+            ),
+        )
+
+        walls = []
+        correct = 0
+        opened_before = client.connections_opened()
+        for _ in range(options["runs"]):
+            started = time.perf_counter()
+            results = engine.search(stubs, "benchuser", force_refresh=True)
+            walls.append(time.perf_counter() - started)
+            for spec, (_, scan) in zip(specs, results):
+                correct += int(bool(scan.get("exists")) == (spec["kind"] == FOUND))
+
+        latencies = sorted(health.latencies())
+        probes = len(stubs) * options["runs"]
+        total_wall = sum(walls)
+        return {
+            "sites": len(stubs),
+            "runs": options["runs"],
+            "options": options,
+            "wall_time_s": {
+                "mean": round(total_wall / len(walls), 3),
+                "min": round(min(walls), 3),
+                "max": round(max(walls), 3),
+            },
+            "probes_per_s": round(probes / total_wall, 1) if total_wall else None,
+            "probe_latency_ms": {
+                "p50": round(percentile(latencies, 0.50) * 1000, 1) if latencies else None,
+                "p99": round(percentile(latencies, 0.99) * 1000, 1) if latencies else None,
+            },
+            "connections_opened": client.connections_opened() - opened_before,
+            "verdict_accuracy": round(correct / probes, 4) if probes else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "kinds": {kind: sum(1 for spec in specs if spec["kind"] == kind)
+                      for kind in (FOUND, MISSING, ERROR, TIMEOUT)},
+        }
+    finally:
+        server.terminate()
+        server.join(timeout=5)
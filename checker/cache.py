@@ -0,0 +1,215 @@
+"""
+Cache des sondes checker, clé (site, username normalisé).
+
+Deux tiers :
+- LRU borné en mémoire (par processus) ;
+- table ProbeResult en base, partagée entre processus et redémarrages.
+
+Le TTL dépend du verdict (trouvé / absent / erreur). Les lectures base sont
+groupées en une seule requête par recherche et les écritures regroupées
+dans flush(). Les lignes expirées depuis plus de CHECKER_CACHE_RETENTION_DAYS
+sont supprimées au plus une fois par PRUNE_INTERVAL (elles servent encore à
+l'historique de scheduler.py jusque-là).
+"""
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .models import ProbeResult
+
+# Codes HTTP qui ne disent rien du compte : site en panne ou limitation de débit
+RETRY_LATER_STATUSES = (408, 429)
+
+# Intervalle minimal entre deux purges des sondes expirées (secondes)
+PRUNE_INTERVAL = 3600
+
+
+def normalize_username(site, username):
+    """
+    Forme canonique du username pour un site : espaces retirés, Unicode NFC
+    et caractères strip_bad_char supprimés (la casse est conservée, la
+    recherche reste sensible à la casse).
+    """
+    return site.account(unicodedata.normalize("NFC", username.strip()))
+
+
+def verdict_of(scan):
+    """
+    found / missing, ou error (TTL court) quand la sonde n'a pas de réponse
+    exploitable : exception (timeout compris), 5xx, 408 ou 429
+    """
+    status = scan.get("status")
+    if status in ("ERROR", "NO_URL"):
+        return "error"
+    if isinstance(status, int) and (status >= 500 or status in RETRY_LATER_STATUSES):
+        return "error"
+    return "found" if scan.get("exists") else "missing"
+
+
+def prune_expired(retention_days):
+    """Supprime les sondes expirées depuis plus de `retention_days` jours ; renvoie leur nombre"""
+    limit = timezone.now() - timedelta(days=retention_days)
+    deleted, _ = ProbeResult.objects.filter(expires_at__lt=limit).delete()
+    return deleted
+
+
+class ProbeCache:
+    """Cache à deux tiers des résultats de sondes"""
+
+    def __init__(self, max_entries=20000, ttls=None, persistent=True, retention_days=7):
+        self.max_entries = max_entries
+        self.persistent = persistent
+        self.ttls = ttls or {"found": 86400, "missing": 21600, "error": 300}
+        self.retention_days = retention_days
+        self._pruned_at = 0.0
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+
+    # --- tier mémoire -------------------------------------------------------
+
+    def _lru_get(self, key, now):
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return None
+            expires_at, scan = entry
+            if expires_at <= now:
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            return scan
+
+    def _lru_put(self, key, expires_at, scan):
+        with self._lock:
+            self._lru[key] = (expires_at, scan)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    # --- API ----------------------------------------------------------------
+
+    def get_many(self, sites, username):
+        """
+        Renvoie {nom du site: scan} pour les sondes encore valides.
+        Le tier base n'est interrogé qu'une fois, pour les absents du LRU.
+        """
+        now = time.time()
+        hits = {}
+        misses = {}
+        for site in sites:
+            key = (site.name, normalize_username(site, username))
+            scan = self._lru_get(key, now)
+            if scan is not None:
+                hits[site.name] = scan
+            else:
+                misses[key] = site
+
+        if misses and self.persistent:
+            try:
+                rows = ProbeResult.objects.filter(
+                    username__in={key[1] for key in misses},
+                    site_name__in={key[0] for key in misses},
+                    expires_at__gt=timezone.now(),
+                ).values_list("site_name", "username", "scan", "expires_at")
+                for site_name, stored_username, scan, expires_at in rows:
+                    key = (site_name, stored_username)
+                    if key in misses:
+                        self._lru_put(key, expires_at.timestamp(), scan)
+                        hits[site_name] = scan
+            except DatabaseError as e:
+                print(f"[checker] Cache base indisponible : {e}")
+
+        # L'URL affichée suit le username saisi, pas la forme normalisée
+        by_name = {site.name: site for site in sites}
+        return {
+            name: {**scan, "url": by_name[name].pretty_url_for(username), "cached": True}
+            for name, scan in hits.items()
+        }
+
+    def put(self, site, username, scan):
+        """Enregistre une sonde (LRU immédiatement, base au prochain flush)"""
+        if scan is None or scan.get("status") == "SKIPPED":
+            return
+        verdict = verdict_of(scan)
+        expires_at = time.time() + self.ttls[verdict]
+        key = (site.name, normalize_username(site, username))
+        self._lru_put(key, expires_at, scan)
+        if self.persistent:
+            with self._pending_lock:
+                self._pending[key] = (verdict, scan, expires_at)
+
+    def flush(self):
+        """Écrit en base les sondes en attente (un seul upsert groupé)"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        rows = [
+            ProbeResult(
+                site_name=site_name,
+                username=username,
+                verdict=verdict,
+                scan=scan,
+                expires_at=datetime.fromtimestamp(expires_at, tz=dt_timezone.utc),
+            )
+            for (site_name, username), (verdict, scan, expires_at) in pending.items()
+        ]
+        try:
+            ProbeResult.objects.bulk_create(
+                rows,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["site_name", "username"],
+                update_fields=["verdict", "scan", "expires_at", "updated_at"],
+            )
+        except DatabaseError as e:
+            print(f"[checker] Écriture du cache impossible : {e}")
+        self.prune()
+
+    def prune(self, force=False):
+        """Purge du tier base, au plus une fois par PRUNE_INTERVAL par processus"""
+        if not self.persistent or not self.retention_days:
+            return
+        if not force and time.time() - self._pruned_at < PRUNE_INTERVAL:
+            return
+        self._pruned_at = time.time()
+        try:
+            deleted = prune_expired(self.retention_days)
+        except DatabaseError as e:
+            print(f"[checker] Purge du cache impossible : {e}")
+            return
+        if deleted:
+            print(f"[checker] Cache : {deleted} sonde(s) expirée(s) supprimée(s)")
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ProbeCache(
+                    max_entries=getattr(settings, "CHECKER_CACHE_MAX_ENTRIES", 20000),
+                    ttls={
+                        "found": getattr(settings, "CHECKER_CACHE_TTL_FOUND", 86400),
+                        "missing": getattr(settings, "CHECKER_CACHE_TTL_MISSING", 21600),
+                        "error": getattr(settings, "CHECKER_CACHE_TTL_ERROR", 300),
+                    },
+                    retention_days=getattr(settings, "CHECKER_CACHE_RETENTION_DAYS", 7),
+                )
+    return _cache
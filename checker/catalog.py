@@ -0,0 +1,264 @@
+"""
+Catalogue WhatsMyName précompilé.
+
+Le fichier wmn-data.json est lu une seule fois par processus, validé contre
+wmn-data-schema.json puis compilé en objets CompiledSite prêts à l'emploi
+(gabarit d'URL, codes attendus, chaînes de correspondance). Le catalogue est
+indexé par catégorie (`cat`) et rechargé automatiquement quand le mtime du
+fichier change.
+
+Si un catalogue actif existe (wmn-active.json, produit par la commande
+checker_validate dans CHECKER_RUNTIME_DIR, hors du paquet), les recherches
+n'utilisent que les sites qu'il retient.
+"""
+import json
+import os
+import threading
+from urllib.parse import quote
+
+from django.conf import settings
+
+from .matcher import BodyMatcher
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DATA_PATH = os.path.join(DATA_DIR, "wmn-data.json")
+SCHEMA_PATH = os.path.join(DATA_DIR, "wmn-data-schema.json")
+ACTIVE_NAME = "wmn-active.json"
+
+ACCOUNT_PLACEHOLDER = "{account}"
+
+JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "object": dict,
+    "array": list,
+}
+
+
+class CatalogError(ValueError):
+    """Catalogue illisible ou non conforme au schéma"""
+
+
+def _check_type(value, expected):
+    python_type = JSON_TYPES.get(expected)
+    if python_type is None:
+        return True
+    # bool est une sous-classe d'int en Python, mais pas un entier JSON
+    if python_type is int and isinstance(value, bool):
+        return False
+    return isinstance(value, python_type)
+
+
+def validate_site(site, item_schema):
+    """Renvoie la liste des erreurs de schéma pour une entrée du catalogue"""
+    errors = []
+    for key in item_schema.get("required", []):
+        if key not in site:
+            errors.append(f"champ requis manquant : {key}")
+    for key, prop in item_schema.get("properties", {}).items():
+        if key in site and not _check_type(site[key], prop.get("type")):
+            errors.append(f"{key} : type {prop.get('type')} attendu")
+    return errors
+
+
+def validate(data, schema):
+    """
+    Validation légère contre wmn-data-schema.json (champs requis et types).
+    Lève CatalogError si la racine est invalide, renvoie {index: erreurs}
+    pour les sites rejetés (le nom peut manquer ou être partagé).
+    """
+    if not isinstance(data, dict):
+        raise CatalogError("la racine du catalogue doit être un objet")
+    for key in schema.get("required", []):
+        if key not in data:
+            raise CatalogError(f"champ racine manquant : {key}")
+
+    item_schema = schema.get("properties", {}).get("sites", {}).get("items", {})
+    rejected = {}
+    for index, site in enumerate(data["sites"]):
+        if not isinstance(site, dict):
+            rejected[index] = ["entrée non objet"]
+            continue
+        errors = validate_site(site, item_schema)
+        if errors:
+            rejected[index] = errors
+    return rejected
+
+
+def _compile_template(template):
+    """Découpe un gabarit autour de {account} pour une substitution rapide"""
+    if not template:
+        return None
+    return tuple(template.split(ACCOUNT_PLACEHOLDER))
+
+
+class CompiledSite:
+    """Entrée du catalogue compilée en sonde prête à l'emploi"""
+
+    __slots__ = (
+        "name", "cat", "e_code", "e_string", "m_code", "m_string",
+        "headers", "known", "protection", "strip_bad_char",
+        "matcher", "_uri_check", "_uri_pretty", "_post_body", "raw",
+    )
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.name = raw["name"]
+        self.cat = raw["cat"]
+        self.e_code = raw["e_code"]
+        self.e_string = raw["e_string"]
+        self.m_code = raw["m_code"]
+        self.m_string = raw["m_string"]
+        self.headers = dict(raw.get("headers") or {})
+        self.known = list(raw.get("known") or [])
+        self.protection = list(raw.get("protection") or [])
+        self.strip_bad_char = raw.get("strip_bad_char", "")
+        self._uri_check = _compile_template(raw["uri_check"])
+        self._uri_pretty = _compile_template(raw.get("uri_pretty")) or self._uri_check
+        self._post_body = _compile_template(raw.get("post_body"))
+        self.matcher = BodyMatcher(self.e_code, self.e_string, self.m_code, self.m_string)
+
+    def __repr__(self):
+        return f"<CompiledSite {self.name}>"
+
+    @property
+    def method(self):
+        return "POST" if self._post_body else "GET"
+
+    def account(self, username):
+        """Nettoie le username selon strip_bad_char"""
+        for char in self.strip_bad_char:
+            username = username.replace(char, "")
+        return username
+
+    def _render(self, parts, value):
+        if parts is None:
+            return None
+        return value.join(parts)
+
+    def url_for(self, username):
+        """URL à sonder pour ce username"""
+        return self._render(self._uri_check, quote(self.account(username), safe="@"))
+
+    def pretty_url_for(self, username):
+        """URL lisible (profil) à afficher à l'utilisateur"""
+        return self._render(self._uri_pretty, quote(self.account(username), safe="@"))
+
+    def body_for(self, username):
+        """Corps POST éventuel (encodé en UTF-8)"""
+        body = self._render(self._post_body, self.account(username))
+        return body.encode("utf-8") if body is not None else None
+
+    def verdict(self, status_code, chunks, max_bytes=None):
+        """
+        Règle WhatsMyName : le compte existe si le code vaut e_code
+        et que e_string est présent dans la réponse.
+        `chunks` est un itérable d'octets, lu seulement si nécessaire.
+        """
+        return self.matcher.verdict(status_code, chunks, max_bytes)
+
+
+class SiteCatalog:
+    """Catalogue compilé, indexé par nom et par catégorie"""
+
+    def __init__(self, data, schema, mtime=None, active=None):
+        self.mtime = mtime
+        rejected = validate(data, schema)
+        # Sites rejetés pour l'affichage : nom, ou rang dans le catalogue
+        self.rejected = {}
+        self.categories = list(data.get("categories", []))
+        self.sites = []
+        for index, raw in enumerate(data["sites"]):
+            if index in rejected:
+                name = raw.get("name") if isinstance(raw, dict) else None
+                self.rejected[f"{name or ''}#{index}"] = rejected[index]
+            else:
+                self.sites.append(CompiledSite(raw))
+
+        self.by_name = {site.name: site for site in self.sites}
+        # Rang dans le catalogue : l'affichage garde cet ordre quel que soit l'ordre des sondes
+        self.position = {site.name: index for index, site in enumerate(self.sites)}
+
+        # Sites retenus pour les recherches : tous, ou ceux du catalogue actif
+        self.active_names = set(active) if active is not None else None
+        self.live = [
+            site for site in self.sites
+            if self.active_names is None or site.name in self.active_names
+        ]
+        self.by_category = {cat: [] for cat in self.categories}
+        for site in self.live:
+            self.by_category.setdefault(site.cat, []).append(site)
+
+    @classmethod
+    def from_files(cls, data_path=DATA_PATH, schema_path=SCHEMA_PATH, active_path=None):
+        active_path = active_path or active_catalog_path()
+        mtime = catalog_mtime(data_path, active_path)
+        try:
+            with open(data_path, encoding="utf-8") as f:
+                data = json.load(f)
+            with open(schema_path, encoding="utf-8") as f:
+                schema = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise CatalogError(f"Impossible de charger le catalogue : {e}") from e
+        return cls(data, schema, mtime=mtime, active=load_active(active_path))
+
+    def __len__(self):
+        return len(self.live)
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def for_category(self, cat=None):
+        """Sites actifs d'une catégorie (tous les sites actifs si cat est vide)"""
+        if not cat:
+            return self.live
+        return self.by_category.get(cat, [])
+
+
+def active_catalog_path():
+    """Catalogue actif : fichier d'exécution, écrit par checker_validate"""
+    return os.path.join(getattr(settings, "CHECKER_RUNTIME_DIR", "checker_data"), ACTIVE_NAME)
+
+
+def load_active(path):
+    """Noms des sites du catalogue actif, ou None s'il n'y en a pas"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["sites"]
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        print(f"[checker] Catalogue actif ignoré : {e}")
+        return None
+
+
+def catalog_mtime(data_path=DATA_PATH, active_path=None):
+    """Signature de fraîcheur : mtime du catalogue et du catalogue actif"""
+    active_path = active_path or active_catalog_path()
+    try:
+        active_mtime = os.stat(active_path).st_mtime
+    except FileNotFoundError:
+        active_mtime = None
+    return os.stat(data_path).st_mtime, active_mtime
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """
+    Catalogue partagé par le processus.
+    Deux stat() par appel ; rechargement si un des fichiers a changé.
+    """
+    global _catalog
+    mtime = catalog_mtime()
+    if _catalog is None or _catalog.mtime != mtime:
+        with _catalog_lock:
+            if _catalog is None or _catalog.mtime != mtime:
+                catalog = SiteCatalog.from_files()
+                if catalog.rejected:
+                    print(f"[checker] {len(catalog.rejected)} site(s) rejeté(s) par le schéma : "
+                          f"{', '.join(sorted(catalog.rejected))}")
+                _catalog = catalog
+    return _catalog
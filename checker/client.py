@@ -0,0 +1,180 @@
+"""
+Client HTTP partagé par toutes les sondes checker du processus.
+
+Une seule requests.Session, dont les pools de connexions keep-alive sont
+bornés par hôte (CHECKER_PER_HOST_LIMIT, comme le moteur) : les sites qui
+partagent un hôte ou un CDN ne repaient pas une poignée de main TCP+TLS à
+chaque sonde. Les résolutions DNS sont gardées en mémoire (CHECKER_DNS_TTL)
+et les erreurs transitoires (connexion, 429/502/503/504) sont rejouées avec
+un backoff exponentiel (CHECKER_RETRIES, CHECKER_RETRY_BACKOFF).
+
+Les cookies sont refusés : la session est partagée entre usernames et sites.
+"""
+import ipaddress
+import socket
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.retry import Retry
+
+USER_AGENT = "Mozilla/5.0 (OSINT Django Scanner)"
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class DNSCache:
+    """Résolutions getaddrinfo mémorisées par (hôte, port) pendant `ttl` secondes"""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host, port):
+        """Adresse IP à utiliser pour l'hôte (l'hôte lui-même si c'est déjà une IP)"""
+        if self.ttl <= 0:
+            return host
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        # Hors verrou : une résolution lente ne bloque pas les autres hôtes
+        infos = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+        address = infos[0][4][0]
+        with self._lock:
+            self._entries[key] = (now + self.ttl, address)
+        return address
+
+    def forget(self, host, port):
+        """Oublie une résolution (connexion refusée : l'adresse a pu changer)"""
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+dns_cache = DNSCache(getattr(settings, "CHECKER_DNS_TTL", 300))
+
+# Connexions TCP réellement ouvertes (la différence avec le nombre de sondes
+# correspond aux connexions réutilisées)
+_opened = 0
+_opened_lock = threading.Lock()
+
+
+def connections_opened():
+    return _opened
+
+
+class CachedDNSMixin:
+    """
+    Connecte le socket à l'adresse mise en cache. self.host reste le nom
+    d'hôte : en-tête Host, SNI et vérification du certificat sont inchangés.
+    """
+
+    def _new_conn(self):
+        global _opened
+        dns_host = self._dns_host
+        try:
+            self._dns_host = dns_cache.resolve(dns_host, self.port)
+        except OSError:
+            # Laisse urllib3 produire son erreur de résolution habituelle
+            return super()._new_conn()
+        try:
+            conn = super()._new_conn()
+        except Exception:
+            dns_cache.forget(dns_host, self.port)
+            raise
+        finally:
+            self._dns_host = dns_host
+        with _opened_lock:
+            _opened += 1
+        return conn
+
+
+class CachedDNSHTTPConnection(CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class CachedDNSHTTPSConnection(CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+class CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+
+class CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """Adaptateur dont les pools utilisent les connexions à DNS en cache"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CachedDNSHTTPConnectionPool,
+            "https": CachedDNSHTTPSConnectionPool,
+        }
+
+
+def build_session(per_host=4, hosts=256, retries=1, backoff=0.3):
+    """
+    Session dont chaque hôte a un pool de `per_host` connexions keep-alive,
+    `hosts` pools étant gardés au plus (LRU côté urllib3)
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,  # un timeout de lecture a déjà consommé tout le budget de la sonde
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=False,  # un Retry-After d'une heure bloquerait un worker
+        raise_on_status=False,  # la dernière réponse est rendue, pas une exception
+    )
+    adapter = PooledAdapter(pool_connections=hosts, pool_maxsize=per_host, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Session HTTP du processus, créée au premier appel"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session(
+                    per_host=getattr(settings, "CHECKER_PER_HOST_LIMIT", 4),
+                    hosts=getattr(settings, "CHECKER_POOL_HOSTS", 256),
+                    retries=getattr(settings, "CHECKER_RETRIES", 1),
+                    backoff=getattr(settings, "CHECKER_RETRY_BACKOFF", 0.3),
+                )
+    return _session
@@ -0,0 +1,240 @@
+"""
+Moteur de recherche concurrent pour le checker.
+
+Toutes les sondes d'une recherche partent en parallèle dans un pool de threads
+partagé par le processus (plafond global), avec un plafond supplémentaire par
+hôte pour ne pas marteler un même serveur. Une sonde au-delà du plafond de son
+hôte n'occupe pas de worker : elle est mise de côté et soumise au pool quand
+une sonde du même hôte se termine. Les résultats sont renvoyés dans
+l'ordre du catalogue. Les sondes encore valides dans le cache (voir cache.py)
+sont servies sans aucun accès réseau ; les sites dont le disjoncteur est
+ouvert (voir health.py) sont ignorés.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+from .cache import get_cache
+from .client import get_session
+from .health import get_health
+from .osint import check_username, get_site_url
+
+# Les verdicts frais sont écrits en base par paquets pendant les longs lots
+FLUSH_EVERY = 500
+
+
+class ProbeEngine:
+    """Exécute les sondes (site, username) en parallèle"""
+
+    def __init__(self, max_workers=64, per_host_limit=4, timeout=10, cache=None, health=None, session=None):
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="checker-probe"
+        )
+        # Hôte → [sondes en cours, sondes différées] ; l'entrée disparaît quand l'hôte est inactif
+        self._hosts = {}
+        self._hosts_guard = threading.Lock()
+        # Cache, statistiques et session HTTP du processus par défaut (injectables pour les benchmarks)
+        self._cache = cache
+        self._health = health
+        self._session = session
+
+    @property
+    def cache(self):
+        return self._cache or get_cache()
+
+    @property
+    def health(self):
+        return self._health or get_health()
+
+    @property
+    def session(self):
+        return self._session or get_session()
+
+    def probe(self, site, username, cancelled=None):
+        """Sonde un site (le plafond par hôte est appliqué par submit)"""
+        if cancelled is not None and cancelled.is_set():
+            return None
+        health = self.health
+        if not health.allow(site.name):
+            return {
+                "exists": False,
+                "status": "SKIPPED",
+                "url": site.pretty_url_for(username)
+            }
+
+        started = time.monotonic()
+        scan = check_username(
+            site, username,
+            timeout=health.timeout_for(site.name, self.timeout),
+            session=self.session
+        )
+        elapsed = time.monotonic() - started
+
+        status = scan["status"]
+        failed = status == "ERROR" or (isinstance(status, int) and status >= 500)
+        health.record(site.name, elapsed, failed)
+        return scan
+
+    def submit(self, site, username, cancelled=None):
+        """
+        Sonde en arrière-plan ; renvoie un Future. Au-delà de per_host_limit
+        sondes en cours vers l'hôte, la sonde est différée sans bloquer de worker.
+        """
+        future = Future()
+        work = (future, site, username, cancelled)
+        url = get_site_url(site, username)
+        host = urlparse(url).hostname if url else None
+        if host:
+            with self._hosts_guard:
+                state = self._hosts.setdefault(host, [0, deque()])
+                if state[0] >= self.per_host_limit:
+                    state[1].append(work)
+                    return future
+                state[0] += 1
+        self._executor.submit(self._run, host, work)
+        return future
+
+    def _run(self, host, work):
+        future, site, username, cancelled = work
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self.probe(site, username, cancelled))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            if host:
+                self._release(host)
+
+    def _release(self, host):
+        """Fin d'une sonde vers `host` : la sonde différée suivante prend sa place"""
+        with self._hosts_guard:
+            state = self._hosts[host]
+            if not state[1]:
+                state[0] -= 1
+                if state[0] == 0:
+                    del self._hosts[host]
+                return
+            work = state[1].popleft()
+        self._executor.submit(self._run, host, work)
+
+    def search(self, sites, username, force_refresh=False, deadline=None):
+        """
+        Sonde tous les sites en parallèle.
+        Renvoie une liste de (site, scan) dans l'ordre des sites fournis ;
+        scan vaut None pour les sondes non terminées à l'échéance `deadline`.
+        """
+        sites = list(sites)
+        scans = [None] * len(sites)
+        for index, site, scan in self.iter_search(sites, username, force_refresh, deadline):
+            scans[index] = scan
+        return list(zip(sites, scans))
+
+    def iter_search(self, sites, username, force_refresh=False, deadline=None):
+        """
+        Sonde tous les sites en parallèle et produit (index, site, scan)
+        au fur et à mesure que les sondes se terminent.
+        Les résultats en cache sont produits en premier, sans réseau, sauf si
+        force_refresh est demandé. Les sondes sont soumises dans l'ordre des
+        sites fournis (voir scheduler.py pour l'ordre par priorité).
+        Seuls les résultats pas encore consommés sont gardés en mémoire ;
+        si le consommateur abandonne, les sondes non démarrées sont annulées.
+        """
+        batch = [(username, list(enumerate(sites)))]
+        for index, site, _, scan in self.iter_batches(batch, force_refresh, deadline=deadline):
+            yield index, site, scan
+
+    def iter_batches(self, batches, force_refresh=False, window=None, deadline=None):
+        """
+        Pipeline partagé pour plusieurs usernames.
+
+        `batches` est un itérable (éventuellement paresseux) de
+        (username, [(clé, site), ...]) ; produit (clé, site, username, scan).
+        `window` borne le nombre de sondes en vol (None = toutes d'un coup),
+        ce qui permet de traiter usernames × sites sans tout soumettre.
+        `deadline` (time.monotonic()) arrête la production à l'échéance :
+        le consommateur garde les résultats partiels déjà reçus.
+        """
+        cache = self.cache
+        health = self.health
+        health.load()
+        done = queue.Queue()
+        cancelled = threading.Event()
+        in_flight = 0
+        fresh = 0
+
+        def collect():
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                key, site, username, future = done.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            scan = future.result()
+            cache.put(site, username, scan)
+            return key, site, username, scan
+
+        try:
+            for username, items in batches:
+                sites = [site for _, site in items]
+                cached = {} if force_refresh else cache.get_many(sites, username)
+
+                for key, site in items:
+                    if site.name in cached:
+                        yield key, site, username, cached[site.name]
+                        continue
+
+                    while window is not None and in_flight >= window:
+                        in_flight -= 1
+                        fresh += 1
+                        item = collect()
+                        if item is None:
+                            return
+                        yield item
+
+                    future = self.submit(site, username, cancelled)
+                    future.add_done_callback(
+                        lambda f, k=key, s=site, u=username: done.put((k, s, u, f))
+                    )
+                    in_flight += 1
+
+                if fresh >= FLUSH_EVERY:
+                    cache.flush()
+                    fresh = 0
+
+            while in_flight:
+                in_flight -= 1
+                item = collect()
+                if item is None:
+                    return
+                yield item
+        finally:
+            cancelled.set()
+            cache.flush()
+            health.flush()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Moteur unique par processus (le plafond global est partagé entre requêtes)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = ProbeEngine(
+                    max_workers=getattr(settings, "CHECKER_MAX_WORKERS", 64),
+                    per_host_limit=getattr(settings, "CHECKER_PER_HOST_LIMIT", 4),
+                    timeout=getattr(settings, "CHECKER_TIMEOUT", 10),
+                )
+    return _engine
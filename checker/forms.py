@@ -1,5 +1,7 @@
 from django import forms
 
+from .catalog import get_catalog
+
 class UsernameForm(forms.Form):
     username = forms.CharField(
         label="Nom d’utilisateur",
@@ -9,3 +11,26 @@ class UsernameForm(forms.Form):
             "placeholder": "ex: johndoe"
         })
     )
+    category = forms.MultipleChoiceField(
+        label="Catégories",
+        required=False,
+        widget=forms.SelectMultiple(attrs={"class": "form-select"})
+    )
+    budget = forms.FloatField(
+        label="Budget (secondes)",
+        required=False,
+        min_value=0.5,
+        max_value=300,
+        widget=forms.NumberInput(attrs={
+            "class": "form-control",
+            "placeholder": "sans limite",
+            "step": "0.5"
+        })
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Seules les catégories ayant au moins un site actif sont proposées
+        self.fields["category"].choices = [
+            (cat, cat) for cat, sites in get_catalog().by_category.items() if sites
+        ]
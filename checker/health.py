@@ -0,0 +1,253 @@
+"""
+Statistiques par site et disjoncteur pour les sondes checker.
+
+Pour chaque site on garde une fenêtre glissante des dernières latences et
+erreurs (percentiles, taux d'erreur, temps mural cumulé). Le timeout de
+chaque sonde est dérivé du p95 du site. Un site qui échoue plusieurs fois
+de suite ouvre son disjoncteur : il est ignoré jusqu'à la fin d'une période
+de refroidissement, puis sondé une seule fois (demi-ouvert) ; un succès le
+referme, un nouvel échec le rouvre pour plus longtemps.
+
+Les agrégats sont recopiés périodiquement dans la table SiteStats, visible
+dans l'admin.
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from .models import SiteStats
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def percentile(sorted_values, fraction):
+    """Percentile par rang le plus proche sur une liste déjà triée"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class SiteHealth:
+    """Fenêtre glissante et état du disjoncteur d'un site"""
+
+    def __init__(self, window):
+        self.latencies = deque(maxlen=window)
+        self.failures = deque(maxlen=window)
+        self.samples = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.open_until = 0.0
+        self.cooldown = 0.0
+        self.trial_running = False
+
+    def percentiles(self):
+        ordered = sorted(self.latencies)
+        return percentile(ordered, 0.50), percentile(ordered, 0.95), percentile(ordered, 0.99)
+
+    def error_rate(self):
+        if not self.failures:
+            return 0.0
+        return sum(self.failures) / len(self.failures)
+
+
+class HealthTracker:
+    """Suivi de tous les sites, partagé par le processus"""
+
+    def __init__(self, window=100, min_samples=10, timeout_factor=2.0,
+                 min_timeout=2.0, max_timeout=10.0, failure_threshold=5,
+                 cooldown=300.0, max_cooldown=3600.0, flush_interval=30.0, persistent=True):
+        self.window = window
+        self.persistent = persistent
+        self.min_samples = min_samples
+        self.timeout_factor = timeout_factor
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.flush_interval = flush_interval
+        self._sites = {}
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._last_flush = time.time()
+        self._loaded = False
+
+    def _get(self, name):
+        health = self._sites.get(name)
+        if health is None:
+            health = SiteHealth(self.window)
+            self._sites[name] = health
+        return health
+
+    def load(self):
+        """
+        Reprend l'état des disjoncteurs et les cumuls après un redémarrage
+        (une seule fois par processus, depuis le thread de la requête)
+        """
+        if self._loaded or not self.persistent:
+            return
+        self._loaded = True
+        try:
+            rows = list(SiteStats.objects.all())
+        except DatabaseError:
+            return
+        with self._lock:
+            for row in rows:
+                health = self._get(row.site_name)
+                health.samples = row.samples
+                health.errors = row.errors
+                health.total_time = row.total_time
+                health.consecutive_failures = row.consecutive_failures
+                if row.breaker_state != CLOSED and row.open_until:
+                    health.state = OPEN
+                    health.open_until = row.open_until.timestamp()
+                    health.cooldown = self.base_cooldown
+
+    # --- décisions avant sonde ----------------------------------------------
+
+    def allow(self, name):
+        """
+        True si le site peut être sondé maintenant.
+        Disjoncteur ouvert : refus jusqu'à la fin du refroidissement, puis
+        une seule sonde d'essai à la fois.
+        """
+        with self._lock:
+            health = self._get(name)
+            if health.state == CLOSED:
+                return True
+            if health.state == OPEN and time.time() >= health.open_until:
+                health.state = HALF_OPEN
+            if health.state == HALF_OPEN and not health.trial_running:
+                health.trial_running = True
+                return True
+            return False
+
+    def timeout_for(self, name, default):
+        """Timeout adaptatif : p95 du site × facteur, borné"""
+        with self._lock:
+            health = self._sites.get(name)
+            if health is None or len(health.latencies) < self.min_samples:
+                return default
+            _, p95, _ = health.percentiles()
+        return max(self.min_timeout, min(self.max_timeout, default, p95 * self.timeout_factor))
+
+    # --- après sonde --------------------------------------------------------
+
+    def record(self, name, elapsed, failed):
+        with self._lock:
+            health = self._get(name)
+            health.latencies.append(elapsed)
+            health.failures.append(1 if failed else 0)
+            health.samples += 1
+            health.total_time += elapsed
+            self._dirty.add(name)
+
+            if failed:
+                health.errors += 1
+                health.consecutive_failures += 1
+                if health.state == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+                    self._trip(health)
+            else:
+                health.consecutive_failures = 0
+                health.state = CLOSED
+                health.cooldown = 0.0
+            health.trial_running = False
+
+    def _trip(self, health):
+        health.cooldown = min(self.max_cooldown, health.cooldown * 2 or self.base_cooldown)
+        health.state = OPEN
+        health.open_until = time.time() + health.cooldown
+
+    def snapshot(self, name):
+        """Vue instantanée d'un site (pour l'ordonnancement et les rapports)"""
+        with self._lock:
+            health = self._sites.get(name)
+            if health is None:
+                return None
+            p50, p95, p99 = health.percentiles()
+            return {
+                "p50": p50, "p95": p95, "p99": p99,
+                "error_rate": health.error_rate(),
+                "samples": health.samples,
+                "total_time": health.total_time,
+                "state": health.state,
+            }
+
+    def latencies(self):
+        """Toutes les latences des fenêtres, tous sites confondus"""
+        with self._lock:
+            return [value for health in self._sites.values() for value in health.latencies]
+
+    # --- persistance --------------------------------------------------------
+
+    def flush(self, force=False):
+        """Recopie les sites modifiés dans SiteStats (au plus toutes les flush_interval s)"""
+        now = time.time()
+        if not self.persistent or (not force and now - self._last_flush < self.flush_interval):
+            return
+        with self._lock:
+            self._last_flush = now
+            dirty, self._dirty = self._dirty, set()
+            rows = []
+            for name in dirty:
+                health = self._sites[name]
+                p50, p95, p99 = health.percentiles()
+                rows.append(SiteStats(
+                    site_name=name,
+                    samples=health.samples,
+                    errors=health.errors,
+                    error_rate=health.error_rate(),
+                    p50_ms=round(p50 * 1000) if p50 is not None else None,
+                    p95_ms=round(p95 * 1000) if p95 is not None else None,
+                    p99_ms=round(p99 * 1000) if p99 is not None else None,
+                    total_time=health.total_time,
+                    consecutive_failures=health.consecutive_failures,
+                    breaker_state=health.state,
+                    open_until=(
+                        datetime.fromtimestamp(health.open_until, tz=dt_timezone.utc)
+                        if health.state != CLOSED else None
+                    ),
+                ))
+        if not rows:
+            return
+        try:
+            SiteStats.objects.bulk_create(
+                rows,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["site_name"],
+                update_fields=[
+                    "samples", "errors", "error_rate", "p50_ms", "p95_ms", "p99_ms",
+                    "total_time", "consecutive_failures", "breaker_state",
+                    "open_until", "updated_at",
+                ],
+            )
+        except DatabaseError as e:
+            print(f"[checker] Écriture des statistiques impossible : {e}")
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_health():
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = HealthTracker(
+                    max_timeout=getattr(settings, "CHECKER_TIMEOUT", 10),
+                    failure_threshold=getattr(settings, "CHECKER_BREAKER_THRESHOLD", 5),
+                    cooldown=getattr(settings, "CHECKER_BREAKER_COOLDOWN", 300),
+                    max_cooldown=getattr(settings, "CHECKER_BREAKER_MAX_COOLDOWN", 3600),
+                )
+    return _tracker
@@ -0,0 +1,60 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from checker.batch import FORMATS, read_usernames_file, run_batch
+from checker.catalog import get_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Vérifie une liste de usernames (un par ligne) sur tout le catalogue. "
+        "Relancer la même commande sur le même fichier de sortie reprend le lot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("usernames_file", help="Fichier texte, un username par ligne")
+        parser.add_argument("-o", "--output", help="Fichier de résultats (.jsonl ou .csv)")
+        parser.add_argument("--format", choices=FORMATS, help="Déduit de l'extension par défaut")
+        parser.add_argument("--category", help="Limiter à une catégorie du catalogue (cat)")
+        parser.add_argument("--refresh", action="store_true", help="Ignorer le cache des sondes")
+
+    def handle(self, *args, **options):
+        try:
+            usernames = read_usernames_file(options["usernames_file"])
+        except OSError as e:
+            raise CommandError(f"Lecture impossible : {e}")
+        if not usernames:
+            raise CommandError("Aucun username dans le fichier")
+
+        output = options["output"] or os.path.splitext(options["usernames_file"])[0] + ".jsonl"
+        fmt = options["format"] or os.path.splitext(output)[1].lstrip(".").lower()
+        if fmt not in FORMATS:
+            raise CommandError(f"Format de sortie inconnu : {fmt} ({', '.join(FORMATS)})")
+
+        category = options["category"]
+        if category and category not in get_catalog().by_category:
+            raise CommandError(f"Catégorie inconnue : {category}")
+
+        self.stdout.write(f"🔄 {len(usernames)} username(s) → {output}")
+        started = time.time()
+        last_report = [0.0]
+
+        def progress(done, total):
+            now = time.time()
+            if now - last_report[0] >= 2 or done == total:
+                last_report[0] = now
+                self.stdout.write(f"   {done}/{total} sondes")
+
+        try:
+            probed = run_batch(usernames, output, fmt, category, options["refresh"], progress=progress)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING(
+                "Interrompu : relancez la même commande pour reprendre le lot"
+            ))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {probed} sonde(s) en {time.time() - started:.1f}s — résultats dans {output}"
+        ))
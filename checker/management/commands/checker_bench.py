@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from checker.benchmark import run_benchmark
+from checker.catalog import get_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Banc d'essai hors ligne : imite le catalogue avec un serveur HTTP local "
+        "et mesure temps mural, sondes/s, latences p50/p99 et pic de RSS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sites", type=int, default=0, help="Nombre de sites (0 = tout le catalogue)")
+        parser.add_argument("--runs", type=int, default=3, help="Recherches complètes à chronométrer")
+        parser.add_argument("--latency-ms", type=float, default=150.0, help="Latence médiane d'un site imité")
+        parser.add_argument("--jitter", type=float, default=0.5, help="Écart-type log-normal de la latence")
+        parser.add_argument("--found-ratio", type=float, default=0.1)
+        parser.add_argument("--error-ratio", type=float, default=0.02, help="Sites répondant 503")
+        parser.add_argument("--timeout-ratio", type=float, default=0.01, help="Sites ne répondant pas à temps")
+        parser.add_argument("--body-kb", type=int, default=64, help="Taille des corps de réponse")
+        parser.add_argument("--match-position", choices=("start", "end"), default="end",
+                            help="Position de la chaîne décisive dans le corps")
+        parser.add_argument("--probe-timeout", type=float, default=2.0)
+        parser.add_argument("--workers", type=int, default=64)
+        parser.add_argument("--per-host", type=int, default=0, help="0 = égal à --workers (un seul hôte local)")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--json", action="store_true", help="Sortie JSON uniquement")
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs doit être >= 1")
+        sites = get_catalog().sites
+        if options["sites"]:
+            sites = sites[:options["sites"]]
+
+        bench_options = {
+            key: options[key] for key in (
+                "runs", "latency_ms", "jitter", "found_ratio", "error_ratio",
+                "timeout_ratio", "body_kb", "match_position", "probe_timeout",
+                "workers", "per_host", "seed",
+            )
+        }
+        if not options["json"]:
+            self.stdout.write(f"🔄 {len(sites)} site(s) imités, {options['runs']} recherche(s)...")
+
+        report = run_benchmark(sites, bench_options)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report))
+            return
+
+        wall = report["wall_time_s"]
+        latency = report["probe_latency_ms"]
+        self.stdout.write(f"   Temps mural     : {wall['mean']}s (min {wall['min']}s, max {wall['max']}s)")
+        self.stdout.write(f"   Débit           : {report['probes_per_s']} sondes/s")
+        self.stdout.write(f"   Latence sonde   : p50 {latency['p50']} ms, p99 {latency['p99']} ms")
+        self.stdout.write(f"   Connexions TCP  : {report['connections_opened']} ouvertes")
+        self.stdout.write(f"   Verdicts justes : {report['verdict_accuracy']:.1%}")
+        self.stdout.write(f"   Pic RSS         : {report['peak_rss_mb']} Mo")
+        self.stdout.write(self.style.SUCCESS("✅ Banc d'essai terminé"))
@@ -0,0 +1,64 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from checker.catalog import active_catalog_path, get_catalog
+from checker.validation import KEPT, validate_sites, write_active_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Valide le catalogue avec les comptes `known` et un username aléatoire, "
+        "puis écrit le catalogue actif utilisé par les recherches. "
+        "À planifier (cron) par exemple une fois par nuit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--known", type=int, default=2, help="Comptes connus sondés par site")
+        parser.add_argument("--category", help="Ne valider qu'une catégorie (cat)")
+        parser.add_argument("--output", help="Chemin du catalogue actif (défaut : CHECKER_RUNTIME_DIR/wmn-active.json)")
+        parser.add_argument("--dry-run", action="store_true", help="Afficher le rapport sans écrire")
+
+    def handle(self, *args, **options):
+        catalog = get_catalog()
+        sites = catalog.sites
+        if options["category"]:
+            sites = [site for site in sites if site.cat == options["category"]]
+            if not sites:
+                raise CommandError(f"Catégorie inconnue : {options['category']}")
+
+        self.stdout.write(f"🔄 Validation de {len(sites)} site(s)...")
+        started = time.time()
+        last_report = [0.0]
+
+        def progress(done, total):
+            now = time.time()
+            if now - last_report[0] >= 5 or done == total:
+                last_report[0] = now
+                self.stdout.write(f"   {done}/{total} sondes")
+
+        report = validate_sites(sites, options["known"], progress=progress)
+
+        counts = Counter(entry["verdict"] for entry in report.values())
+        for verdict, count in counts.most_common():
+            self.stdout.write(f"   {verdict:<15} {count}")
+        for name, entry in sorted(report.items()):
+            if entry["verdict"] not in KEPT:
+                self.stdout.write(f"   ✗ {name} : {entry['verdict']}")
+
+        if options["dry_run"]:
+            return
+
+        if options["category"]:
+            # Validation partielle : les autres sites gardent leur verdict précédent
+            previous = set(catalog.active_names or (site.name for site in catalog.sites))
+            for site in catalog.sites:
+                if site.name not in report and site.name in previous:
+                    report[site.name] = {"verdict": "ok", "known": [], "random": None, "carried_over": True}
+
+        output = options["output"] or active_catalog_path()
+        active = write_active_catalog(report, output)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(active)}/{len(catalog.sites)} site(s) actifs en {time.time() - started:.0f}s → {output}"
+        ))
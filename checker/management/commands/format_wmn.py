@@ -1,15 +1,12 @@
 from django.core.management.base import BaseCommand
 import json
-import os
+from checker.catalog import DATA_PATH
 
 class Command(BaseCommand):
     help = "Formatte wmn-data.json"
 
     def handle(self, *args, **kwargs):
-        path = os.path.join(
-            os.path.dirname(__file__),
-            "../../../data/wmn-data.json"
-        )
+        path = DATA_PATH
 
         with open(path, encoding="utf-8") as f:
             data = json.load(f)
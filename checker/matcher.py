@@ -0,0 +1,62 @@
+"""
+Matcher de corps à arrêt anticipé pour les sondes checker.
+
+Le verdict est décidé avec le minimum de lecture :
+- si le code HTTP ne vaut pas e_code, le compte n'existe pas : le corps
+  n'est jamais lu ;
+- sinon le corps est lu par morceaux et la lecture s'arrête dès que
+  e_string apparaît (trouvé), ou quand la limite de taille est atteinte.
+
+e_string l'emporte toujours, comme le test `e_string in body` d'origine :
+une page peut contenir m_string (« not found » d'un widget) avant le
+e_string d'un profil existant. m_string ne permet donc pas d'arrêter la
+lecture et n'intervient pas dans le verdict.
+"""
+
+
+class BodyMatcher:
+    """Recherche de e_string dans le corps d'un site du catalogue"""
+
+    __slots__ = ("e_code", "m_code", "pattern", "_overlap")
+
+    def __init__(self, e_code, e_string, m_code, m_string=None):
+        self.e_code = e_code
+        self.m_code = m_code
+        self.pattern = e_string.encode("utf-8") if e_string else None
+        # Une correspondance à cheval sur deux morceaux doit rester visible
+        self._overlap = len(self.pattern) - 1 if self.pattern else 0
+
+    def settled_by_status(self, status_code):
+        """
+        Verdict décidé par le seul code HTTP, ou None s'il faut lire le corps
+        """
+        if status_code != self.e_code:
+            return False
+        if self.pattern is None:
+            return True
+        return None
+
+    def scan(self, chunks, max_bytes=None):
+        """
+        Parcourt les morceaux jusqu'à e_string ou la limite de taille.
+        Renvoie True (e_string vu) ou False.
+        """
+        carry = b""
+        read = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            buffer = carry + chunk
+            if buffer.find(self.pattern) != -1:
+                return True
+            read += len(chunk)
+            if max_bytes is not None and read >= max_bytes:
+                break
+            carry = buffer[-self._overlap:] if self._overlap else b""
+        return False
+
+    def verdict(self, status_code, chunks, max_bytes=None):
+        settled = self.settled_by_status(status_code)
+        if settled is not None:
+            return settled
+        return self.scan(chunks, max_bytes)
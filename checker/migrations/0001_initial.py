@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProbeResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('site_name', models.CharField(max_length=255)),
+                ('username', models.CharField(max_length=255)),
+                ('verdict', models.CharField(choices=[('found', 'Trouvé'), ('missing', 'Absent'), ('error', 'Erreur')], max_length=10)),
+                ('scan', models.JSONField(default=dict)),
+                ('expires_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Résultat de sonde',
+                'verbose_name_plural': 'Résultats de sondes',
+                'indexes': [models.Index(fields=['username', 'expires_at'], name='checker_pro_usernam_81564f_idx')],
+                'constraints': [models.UniqueConstraint(fields=('site_name', 'username'), name='checker_probe_site_username')],
+            },
+        ),
+    ]
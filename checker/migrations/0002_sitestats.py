@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checker', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('site_name', models.CharField(max_length=255, unique=True)),
+                ('samples', models.IntegerField(default=0)),
+                ('errors', models.IntegerField(default=0)),
+                ('error_rate', models.FloatField(default=0.0, help_text="Taux d'erreur sur la fenêtre glissante")),
+                ('p50_ms', models.IntegerField(blank=True, null=True)),
+                ('p95_ms', models.IntegerField(blank=True, null=True)),
+                ('p99_ms', models.IntegerField(blank=True, null=True)),
+                ('total_time', models.FloatField(default=0.0, help_text='Temps mural cumulé des sondes en secondes')),
+                ('consecutive_failures', models.IntegerField(default=0)),
+                ('breaker_state', models.CharField(choices=[('closed', 'Fermé'), ('open', 'Ouvert'), ('half_open', 'Demi-ouvert')], default='closed', max_length=10)),
+                ('open_until', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Statistiques site',
+                'verbose_name_plural': 'Statistiques sites',
+                'ordering': ['-total_time'],
+            },
+        ),
+    ]
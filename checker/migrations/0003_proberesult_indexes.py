@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checker', '0002_sitestats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='proberesult',
+            index=models.Index(fields=['expires_at'], name='checker_pro_expires_d9a3ac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proberesult',
+            index=models.Index(fields=['updated_at', 'site_name'], name='checker_pro_updated_003131_idx'),
+        ),
+    ]
@@ -1,3 +1,69 @@
 from django.db import models
 
-# Create your models here.
+
+class ProbeResult(models.Model):
+    """
+    Tier persistant du cache des sondes (site, username).
+    Une ligne par couple, remplacée à chaque nouvelle sonde.
+    """
+    VERDICT_CHOICES = [
+        ('found', 'Trouvé'),
+        ('missing', 'Absent'),
+        ('error', 'Erreur'),
+    ]
+
+    site_name = models.CharField(max_length=255)
+    username = models.CharField(max_length=255)
+    verdict = models.CharField(max_length=10, choices=VERDICT_CHOICES)
+    scan = models.JSONField(default=dict)
+    expires_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['site_name', 'username'], name='checker_probe_site_username'),
+        ]
+        indexes = [
+            models.Index(fields=['username', 'expires_at']),
+            # Purge des sondes expirées (cache.py) et fenêtre de l'historique (scheduler.py)
+            models.Index(fields=['expires_at']),
+            models.Index(fields=['updated_at', 'site_name']),
+        ]
+        verbose_name = "Résultat de sonde"
+        verbose_name_plural = "Résultats de sondes"
+
+    def __str__(self):
+        return f"{self.site_name} / {self.username} : {self.verdict}"
+
+
+class SiteStats(models.Model):
+    """
+    Agrégats de latence et d'erreurs par site, recopiés depuis health.py.
+    Sert à repérer les sites qui coûtent le plus de temps mural.
+    """
+    BREAKER_CHOICES = [
+        ('closed', 'Fermé'),
+        ('open', 'Ouvert'),
+        ('half_open', 'Demi-ouvert'),
+    ]
+
+    site_name = models.CharField(max_length=255, unique=True)
+    samples = models.IntegerField(default=0)
+    errors = models.IntegerField(default=0)
+    error_rate = models.FloatField(default=0.0, help_text="Taux d'erreur sur la fenêtre glissante")
+    p50_ms = models.IntegerField(blank=True, null=True)
+    p95_ms = models.IntegerField(blank=True, null=True)
+    p99_ms = models.IntegerField(blank=True, null=True)
+    total_time = models.FloatField(default=0.0, help_text="Temps mural cumulé des sondes en secondes")
+    consecutive_failures = models.IntegerField(default=0)
+    breaker_state = models.CharField(max_length=10, choices=BREAKER_CHOICES, default='closed')
+    open_until = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-total_time']
+        verbose_name = "Statistiques site"
+        verbose_name_plural = "Statistiques sites"
+
+    def __str__(self):
+        return f"{self.site_name} (p95 {self.p95_ms} ms, {self.error_rate:.0%} erreurs)"
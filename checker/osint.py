@@ -1,19 +1,36 @@
-import requests
+from django.conf import settings
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (OSINT Django Scanner)"
-}
+from .client import get_session
+
+CHUNK_SIZE = 16 * 1024
+MAX_BODY_BYTES = getattr(settings, "CHECKER_MAX_BODY_BYTES", 2 * 1024 * 1024)
+# Reste du corps lu après le verdict pour rendre la connexion au pool ;
+# au-delà, la connexion est fermée (moins coûteux qu'un long téléchargement)
+DRAIN_BYTES = 64 * 1024
 
 def get_site_url(site, username):
     """
-    Récupère dynamiquement l’URL selon les clés existantes
+    URL à sonder pour un site compilé du catalogue (voir catalog.CompiledSite)
+    """
+    return site.url_for(username)
+
+def drain(chunks, limit=DRAIN_BYTES):
     """
-    for key in ["url", "check_uri", "uri_check", "uri"]:
-        if key in site and site[key]:
-            return site[key].replace("{username}", username)
-    return None
+    Consomme la fin du corps si elle est courte : une réponse lue jusqu'au
+    bout libère sa connexion keep-alive au lieu de la fermer
+    """
+    read = 0
+    try:
+        for chunk in chunks:
+            read += len(chunk)
+            if read > limit:
+                return False
+    except Exception:
+        # Le verdict est déjà connu : une erreur ici ne coûte que la connexion
+        return False
+    return True
 
-def check_username(site, username, timeout=10):
+def check_username(site, username, timeout=10, session=None):
     url = get_site_url(site, username)
 
     # ❌ Aucun schéma exploitable → on ignore
@@ -24,30 +41,32 @@ def check_username(site, username, timeout=10):
             "url": None
         }
 
+    profile_url = site.pretty_url_for(username)
+
     try:
-        resp = requests.get(
+        # Corps lu en flux : la lecture s'arrête dès que le verdict est connu ;
+        # la session partagée (client.py) réutilise les connexions par hôte
+        with (session or get_session()).request(
+            site.method,
             url,
-            headers=HEADERS,
+            headers=site.headers,
+            data=site.body_for(username),
             timeout=timeout,
-            allow_redirects=True
-        )
-
-        exists = False
-
-        if site.get("errorType") == "status_code":
-            exists = resp.status_code != site.get("errorCode", 404)
-
-        elif site.get("errorType") == "message":
-            error_msg = site.get("errorMsg", "")
-            exists = error_msg not in resp.text
-
-        else:
-            exists = resp.status_code == 200
+            allow_redirects=True,
+            stream=True
+        ) as resp:
+            exists = site.matcher.settled_by_status(resp.status_code)
+            if exists is None:
+                chunks = resp.iter_content(CHUNK_SIZE)
+                exists = site.matcher.scan(chunks, MAX_BODY_BYTES)
+                drain(chunks)
+            # Verdict donné par le seul code HTTP : le corps n'est pas lu, la
+            # connexion est fermée à la sortie du with
 
         return {
             "exists": exists,
             "status": resp.status_code,
-            "url": url
+            "url": profile_url
         }
 
     except Exception as e:
@@ -55,5 +74,5 @@ def check_username(site, username, timeout=10):
             "exists": False,
             "status": "ERROR",
             "error": str(e),
-            "url": url
+            "url": profile_url
         }
@@ -0,0 +1,118 @@
+"""
+Ordonnancement des sondes checker par catégorie et par priorité.
+
+Les sites sont choisis via l'index par catégorie du catalogue puis triés
+pour que les sites historiquement rapides et qui trouvent souvent des
+comptes partent en premier. Combiné à un budget de temps, l'analyste reçoit
+les réponses les plus utiles en quelques secondes et des résultats partiels
+si l'échéance tombe avant la fin.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import ProbeResult, SiteStats
+
+# Rafraîchissement des historiques (taux de succès, latences) en secondes
+HISTORY_TTL = 600
+
+# Lissage du taux de succès : un site jamais vu part avec ce taux a priori
+PRIOR_HITS = 1
+PRIOR_PROBES = 20
+
+
+class SiteHistory:
+    """
+    Taux de succès (sondes des `window_days` derniers jours) et latences
+    médianes par site, tirés de la base
+    """
+
+    def __init__(self, ttl=HISTORY_TTL, window_days=None):
+        self.ttl = ttl
+        self.window_days = window_days
+        self.hit_rates = {}
+        self.latencies = {}
+        self.default_latency = 1.0
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force=False):
+        if not force and time.time() - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            if not force and time.time() - self._loaded_at < self.ttl:
+                return
+            window_days = self.window_days or getattr(settings, "CHECKER_HISTORY_DAYS", 7)
+            since = timezone.now() - timedelta(days=window_days)
+            try:
+                counts = ProbeResult.objects.filter(updated_at__gte=since).values("site_name").annotate(
+                    probes=Count("id"),
+                    hits=Count("id", filter=Q(verdict="found")),
+                )
+                hit_rates = {
+                    row["site_name"]: (row["hits"] + PRIOR_HITS) / (row["probes"] + PRIOR_PROBES)
+                    for row in counts
+                }
+                latencies = {
+                    name: p50_ms / 1000
+                    for name, p50_ms in SiteStats.objects.exclude(p50_ms=None).values_list("site_name", "p50_ms")
+                }
+            except DatabaseError as e:
+                print(f"[checker] Historique indisponible pour l'ordonnancement : {e}")
+                return
+            self.hit_rates = hit_rates
+            self.latencies = latencies
+            if latencies:
+                ordered = sorted(latencies.values())
+                self.default_latency = ordered[len(ordered) // 2]
+            self._loaded_at = time.time()
+
+    def score(self, site, live_latency=None):
+        """Comptes trouvés attendus par seconde de sonde"""
+        hit_rate = self.hit_rates.get(site.name, PRIOR_HITS / PRIOR_PROBES)
+        latency = live_latency or self.latencies.get(site.name, self.default_latency)
+        return hit_rate / max(latency, 0.05)
+
+
+_history = SiteHistory()
+
+
+def select_sites(catalog, categories=None):
+    """Sites actifs des catégories demandées (index précalculé), sans doublon"""
+    if not categories:
+        return list(catalog.live)
+    selected = []
+    seen = set()
+    for cat in categories:
+        for site in catalog.for_category(cat):
+            if site.name not in seen:
+                seen.add(site.name)
+                selected.append(site)
+    return selected
+
+
+def plan(catalog, categories=None, health=None):
+    """
+    Sites à sonder, du plus au moins prioritaire.
+    La latence p50 en mémoire (health.py) prime sur l'historique en base.
+    """
+    _history.refresh()
+    sites = select_sites(catalog, categories)
+
+    def priority(site):
+        live = health.snapshot(site.name) if health is not None else None
+        return _history.score(site, live["p50"] if live else None)
+
+    return sorted(sites, key=priority, reverse=True)
+
+
+def deadline_for(budget):
+    """Échéance time.monotonic() pour un budget en secondes (None = pas de limite)"""
+    if not budget or budget <= 0:
+        return None
+    return time.monotonic() + budget
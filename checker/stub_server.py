@@ -0,0 +1,89 @@
+"""
+Serveur HTTP local imitant les sites du catalogue (banc d'essai checker).
+
+Module volontairement indépendant de Django : il est lancé dans un processus
+séparé pour que ses threads ne faussent ni le CPU ni la RSS mesurés.
+"""
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FOUND = "found"
+MISSING = "missing"
+ERROR = "error"
+TIMEOUT = "timeout"
+
+FILLER = b"<div class='filler'>lorem ipsum dolor sit amet</div>\n"
+
+
+def make_body(marker, size, position):
+    """Corps de `size` octets contenant `marker` au début ou à la fin"""
+    marker = marker.encode("utf-8")
+    padding = max(0, size - len(marker))
+    filler = (FILLER * (padding // len(FILLER) + 1))[:padding]
+    return marker + filler if position == "start" else filler + marker
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    specs = []
+    options = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self):
+        try:
+            _, prefix, index, _account = self.path.split("/", 3)
+            spec = self.specs[int(index)]
+        except (ValueError, IndexError):
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        time.sleep(spec["latency"])
+        kind = spec["kind"]
+        if kind == TIMEOUT:
+            time.sleep(self.options["probe_timeout"] + 1)
+            status, marker = spec["m_code"], spec["m_string"]
+        elif kind == ERROR:
+            status, marker = 503, "Service Unavailable"
+        elif kind == FOUND:
+            status, marker = spec["e_code"], spec["e_string"]
+        else:
+            status, marker = spec["m_code"], spec["m_string"]
+
+        body = make_body(marker, self.options["body_kb"] * 1024, self.options["match_position"])
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            for offset in range(0, len(body), 16 * 1024):
+                self.wfile.write(body[offset:offset + 16 * 1024])
+        except (BrokenPipeError, ConnectionResetError):
+            # Le client a fermé dès que le verdict était connu
+            pass
+
+    do_GET = _respond
+    do_POST = _respond
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # Connexions coupées par le client après un verdict anticipé : normal
+        pass
+
+
+def serve(specs, options, port_queue):
+    """Point d'entrée du processus serveur"""
+    StubHandler.specs = specs
+    StubHandler.options = options
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
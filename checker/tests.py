@@ -1,3 +1,161 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import tempfile
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .batch import CSV_FIELDS, completed_pairs, prepare_output
+from .cache import verdict_of
+from .catalog import SCHEMA_PATH, SiteCatalog
+from .matcher import BodyMatcher
+from .validation import FALSE_NEGATIVE, FALSE_POSITIVE, FLAKY, OK, UNKNOWN, UNREACHABLE, classify
+
+
+class BodyMatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.matcher = BodyMatcher(200, "profile-header", 200, "page not found")
+
+    def test_other_status_is_missing_without_reading_body(self):
+        def chunks():
+            raise AssertionError("corps lu")
+            yield b""
+
+        self.assertFalse(self.matcher.verdict(404, chunks()))
+
+    def test_e_string_wins_over_earlier_m_string(self):
+        self.assertTrue(self.matcher.verdict(200, [b"... page not found ... profile-header ..."]))
+
+    def test_m_string_alone_is_missing(self):
+        self.assertFalse(self.matcher.verdict(200, [b"page not found", b" nothing else"]))
+
+    def test_e_string_split_across_chunks(self):
+        self.assertTrue(self.matcher.verdict(200, [b"xx profile-", b"header yy"]))
+
+    def test_stops_at_byte_cap(self):
+        self.assertFalse(self.matcher.verdict(200, [b"a" * 10, b"profile-header"], max_bytes=10))
+
+    def test_status_only_site(self):
+        matcher = BodyMatcher(200, "", 404, "")
+        self.assertTrue(matcher.verdict(200, []))
+        self.assertFalse(matcher.verdict(404, []))
+
+
+class VerdictOfTests(SimpleTestCase):
+    def test_found_and_missing(self):
+        self.assertEqual(verdict_of({"status": 200, "exists": True}), "found")
+        self.assertEqual(verdict_of({"status": 404, "exists": False}), "missing")
+
+    def test_exception_and_timeout_are_errors(self):
+        self.assertEqual(verdict_of({"status": "ERROR", "error": "Read timed out", "exists": False}), "error")
+        self.assertEqual(verdict_of({"status": "NO_URL", "exists": False}), "error")
+
+    def test_server_errors_and_rate_limits_are_errors(self):
+        for status in (500, 502, 503, 504, 429, 408):
+            with self.subTest(status=status):
+                self.assertEqual(verdict_of({"status": status, "exists": False}), "error")
+        # Même si la règle du site concluait à l'existence du compte
+        self.assertEqual(verdict_of({"status": 503, "exists": True}), "error")
+
+
+class CompletedPairsTests(SimpleTestCase):
+    ROWS = [
+        {"username": "u", "site": "A", "status": 200, "exists": True},
+        {"username": "u", "site": "B", "status": "ERROR", "exists": False},
+        {"username": "u", "site": "C", "status": "SKIPPED", "exists": False},
+        {"username": "u", "site": "D", "status": 429, "exists": False},
+        {"username": "u", "site": "E", "status": 404, "exists": False},
+        {"username": "u", "site": "F", "status": "NO_URL", "exists": False},
+    ]
+    DEFINITIVE = {("A", "u"), ("E", "u"), ("F", "u")}
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def write_jsonl(self, tail=""):
+        path = os.path.join(self.dir.name, "out.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(row) + "\n" for row in self.ROWS) + tail)
+        return path
+
+    def write_csv(self, tail=""):
+        path = os.path.join(self.dir.name, "out.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(self.ROWS)
+            f.write(tail)
+        return path
+
+    def test_missing_file(self):
+        self.assertEqual(completed_pairs(os.path.join(self.dir.name, "none.jsonl"), "jsonl"), set())
+
+    def test_only_definitive_verdicts_count(self):
+        self.assertEqual(completed_pairs(self.write_jsonl(), "jsonl"), self.DEFINITIVE)
+        self.assertEqual(completed_pairs(self.write_csv(), "csv"), self.DEFINITIVE)
+
+    def test_partial_last_line_is_ignored(self):
+        self.assertEqual(completed_pairs(self.write_jsonl('{"username": "u", "si'), "jsonl"), self.DEFINITIVE)
+        self.assertEqual(completed_pairs(self.write_csv("u,G,cat,Fa"), "csv"), self.DEFINITIVE)
+
+    def test_prepare_output_drops_rows_to_retry(self):
+        for fmt, path in (("jsonl", self.write_jsonl('{"user')), ("csv", self.write_csv("u,G,ca"))):
+            with self.subTest(fmt=fmt):
+                prepare_output(path, fmt)
+                with open(path, encoding="utf-8", newline="") as f:
+                    content = f.read()
+                self.assertTrue(content.endswith("\n"))
+                self.assertEqual(completed_pairs(path, fmt), self.DEFINITIVE)
+                self.assertEqual(len(content.splitlines()), len(self.DEFINITIVE) + (fmt == "csv"))
+
+
+class ClassifyTests(SimpleTestCase):
+    FOUND = {"status": 200, "exists": True}
+    MISSING = {"status": 404, "exists": False}
+    ERROR = {"status": "ERROR", "exists": False}
+
+    def test_ok_and_flaky(self):
+        self.assertEqual(classify([self.FOUND, self.FOUND], self.MISSING), OK)
+        self.assertEqual(classify([self.FOUND, self.MISSING], self.MISSING), FLAKY)
+
+    def test_false_positive_and_negative(self):
+        self.assertEqual(classify([self.FOUND], self.FOUND), FALSE_POSITIVE)
+        self.assertEqual(classify([self.MISSING, self.MISSING], self.MISSING), FALSE_NEGATIVE)
+
+    def test_failed_known_probe_is_unknown_not_false_negative(self):
+        self.assertEqual(classify([self.ERROR], self.MISSING), UNKNOWN)
+        self.assertEqual(classify([{"status": 429, "exists": False}], self.MISSING), UNKNOWN)
+        self.assertEqual(classify([self.FOUND, self.ERROR], self.MISSING), UNKNOWN)
+
+    def test_failed_random_probe_is_unknown(self):
+        self.assertEqual(classify([self.FOUND], {"status": 503, "exists": True}), UNKNOWN)
+
+    def test_everything_failed(self):
+        self.assertEqual(classify([self.ERROR], {"status": "SKIPPED", "exists": False}), UNREACHABLE)
+
+
+class SiteCatalogTests(SimpleTestCase):
+    def site(self, name, **fields):
+        site = {"name": name, "uri_check": "https://example.com/{account}", "e_code": 200, "e_string": "ok",
+                "m_code": 404, "m_string": "", "known": ["a"], "cat": "social"}
+        site.update(fields)
+        return site
+
+    def catalog(self, sites):
+        with open(SCHEMA_PATH, encoding="utf-8") as f:
+            schema = json.load(f)
+        data = {"license": [], "authors": [], "categories": ["social"], "sites": sites}
+        return SiteCatalog(data, schema)
+
+    def test_nameless_entry_is_rejected(self):
+        nameless = self.site("x")
+        del nameless["name"]
+        catalog = self.catalog([nameless, self.site("Good"), "pas un objet"])
+        self.assertEqual([site.name for site in catalog.sites], ["Good"])
+        self.assertEqual(sorted(catalog.rejected), ["#0", "#2"])
+
+    def test_valid_site_sharing_a_rejected_name_is_kept(self):
+        catalog = self.catalog([self.site("Dup", e_code="200"), self.site("Dup", uri_check="https://other/{account}")])
+        self.assertEqual([site.raw["uri_check"] for site in catalog.sites], ["https://other/{account}"])
+        self.assertEqual(list(catalog.rejected), ["Dup#0"])
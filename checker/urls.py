@@ -4,5 +4,11 @@ from . import views
 urlpatterns = [
     path("", views.index),
     path("results/", views.results, name="results"),
+    path("results/stream/", views.results_stream, name="results_stream"),
     path("api/search/", views.api_search),
+    path("api/batch/", views.api_batch_create, name="batch_create"),
+    path("api/batch/<str:job_id>/", views.api_batch_status, name="batch_status"),
+    path("api/batch/<str:job_id>/resume/", views.api_batch_resume, name="batch_resume"),
+    path("api/batch/<str:job_id>/stop/", views.api_batch_stop, name="batch_stop"),
+    path("api/batch/<str:job_id>/download/", views.api_batch_download, name="batch_download"),
 ]
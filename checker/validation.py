@@ -0,0 +1,122 @@
+"""
+Validation du catalogue à partir des comptes `known` de wmn-data.json.
+
+Chaque site est sondé avec ses comptes connus (qui doivent exister) et avec
+un username aléatoire (qui ne doit pas exister). Les sites dont le matcher
+produit des faux positifs, des faux négatifs ou qui sont injoignables sont
+écartés du catalogue actif (wmn-active.json, dans CHECKER_RUNTIME_DIR)
+utilisé par les recherches. Une sonde en erreur ne prouve rien : un site
+dont un contrôle a échoué reste actif avec le verdict « unknown ».
+"""
+import json
+import os
+import secrets
+import string
+import tempfile
+import time
+
+from .cache import verdict_of
+from .catalog import active_catalog_path
+from .engine import get_engine
+
+OK = "ok"
+FLAKY = "flaky"
+FALSE_POSITIVE = "false_positive"
+FALSE_NEGATIVE = "false_negative"
+UNREACHABLE = "unreachable"
+UNKNOWN = "unknown"
+
+# Verdicts qui laissent le site dans le catalogue actif
+KEPT = (OK, FLAKY, UNKNOWN)
+
+
+def random_handle():
+    """Username qui n'existe (presque) sûrement nulle part"""
+    return "zq" + "".join(secrets.choice(string.ascii_lowercase + string.digits) for _ in range(14))
+
+
+def failed(scan):
+    """Sonde sans réponse exploitable (sautée, erreur, 5xx, 429...)"""
+    return scan["status"] == "SKIPPED" or verdict_of(scan) == "error"
+
+
+def classify(known_scans, random_scan):
+    """
+    Verdict d'un site à partir de ses sondes de contrôle ; seules les sondes
+    qui ont abouti comptent pour les faux positifs et faux négatifs
+    """
+    scans = known_scans + [random_scan]
+    if all(failed(scan) for scan in scans):
+        return UNREACHABLE
+    if not failed(random_scan) and random_scan.get("exists"):
+        return FALSE_POSITIVE
+    answered = [scan for scan in known_scans if not failed(scan)]
+    found = sum(1 for scan in answered if scan.get("exists"))
+    if answered and found == 0:
+        return FALSE_NEGATIVE
+    if found < len(answered):
+        return FLAKY
+    if failed(random_scan) or len(answered) < len(known_scans):
+        return UNKNOWN
+    return OK
+
+
+def validate_sites(sites, known_per_site=2, progress=None):
+    """
+    Sonde tous les sites (cache ignoré) et renvoie {nom: rapport}.
+    Le même username aléatoire sert pour tous les sites d'une exécution.
+    """
+    handle = random_handle()
+    sites = list(sites)
+    by_name = {site.name: site for site in sites}
+
+    batches = {}
+    for site in sites:
+        for account in site.known[:known_per_site]:
+            batches.setdefault(account, []).append(((site.name, "known"), site))
+        batches.setdefault(handle, []).append(((site.name, "random"), site))
+
+    collected = {name: {"known": [], "random": None} for name in by_name}
+    total = sum(len(items) for items in batches.values())
+    done = 0
+    engine = get_engine()
+    for (name, kind), _, username, scan in engine.iter_batches(batches.items(), force_refresh=True):
+        entry = {"username": username, "status": scan["status"], "exists": bool(scan.get("exists"))}
+        if kind == "known":
+            collected[name]["known"].append(entry)
+        else:
+            collected[name]["random"] = entry
+        done += 1
+        if progress is not None:
+            progress(done, total)
+
+    report = {}
+    for name, entry in collected.items():
+        report[name] = {
+            "verdict": classify(entry["known"], entry["random"]),
+            "known": entry["known"],
+            "random": entry["random"],
+        }
+    return report
+
+
+def write_active_catalog(report, path=None):
+    """Écrit le catalogue actif de façon atomique (rechargé par get_catalog)"""
+    path = path or active_catalog_path()
+    active = sorted(name for name, entry in report.items() if entry["verdict"] in KEPT)
+    payload = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "sites": active,
+        "report": report,
+    }
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return active
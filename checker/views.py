@@ -1,65 +1,202 @@
 
 import json
-import os
+from django.conf import settings
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
 from .forms import UsernameForm
-from .osint import check_username
+from .engine import get_engine
+from .catalog import get_catalog
+from . import batch, scheduler
 
-DATA_PATH = os.path.join(
-    os.path.dirname(__file__),
-    "data",
-    "wmn-data.json"
-)
+def wants_refresh(request):
+    """Paramètre explicite ?refresh=1 pour ignorer le cache des sondes"""
+    return request.GET.get("refresh", "").lower() in ("1", "true", "yes", "on")
 
-def load_data():
-    with open(DATA_PATH, encoding="utf-8") as f:
-        return json.load(f)
+def result_row(site, scan):
+    return {
+        "name": site.name,
+        "category": site.cat,
+        "url": scan["url"],
+        "exists": scan.get("exists"),
+        "status": scan.get("status", "N/A"),
+        "cached": scan.get("cached", False)
+    }
 
 def index(request):
     return render(request, "checker/index.html", {
-        "form": UsernameForm()
+        "form": UsernameForm(),
+        # Formulaire des lots (api_batch_*), une seule catégorie par lot
+        "batch_categories": [cat for cat, sites in get_catalog().by_category.items() if sites],
+        "batch_formats": batch.FORMATS
     })
 
+def search_plan(form):
+    """
+    Sites à sonder (catégories choisies, ordre de priorité) et échéance
+    dérivée du budget, à partir d'un UsernameForm valide
+    """
+    catalog = get_catalog()
+    sites = scheduler.plan(catalog, form.cleaned_data.get("category"), get_engine().health)
+    budget = form.cleaned_data.get("budget") or settings.CHECKER_DEFAULT_BUDGET
+    return catalog, sites, scheduler.deadline_for(budget)
+
 def results(request):
+    """
+    Page de résultats : rendue immédiatement, le tableau est rempli
+    progressivement par results_stream (server-sent events)
+    """
     form = UsernameForm(request.GET)
-    results = []
-
-    if form.is_valid():
-        username = form.cleaned_data["username"]
-        data = load_data()
-
-        for site in data["sites"][:50]:  # limite sécurité
-            scan = check_username(site, username)
-            results.append({
-                "name": site.get("name"),
-                "category": site.get("category"),
-                "url": scan["url"],
-                "exists": scan.get("exists"),
-                "status": scan.get("status", "N/A")
-            })
+    valid = form.is_valid()
+    username = form.cleaned_data["username"] if valid else ""
+    categories = form.cleaned_data.get("category", []) if valid else []
 
     return render(request, "checker/results.html", {
         "form": form,
-        "results": results
+        "username": username,
+        "categories": categories,
+        # Mêmes paramètres (catégories, budget, refresh) pour le flux SSE
+        "stream_query": request.GET.urlencode(),
+        "total_sites": len(scheduler.select_sites(get_catalog(), categories)) if username else 0
     })
 
-def api_search(request):
-    username = request.GET.get("username")
-    if not username:
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_results(username, catalog, sites, deadline=None, force_refresh=False):
+    """Émet chaque verdict dès que sa sonde se termine (sites prioritaires d'abord)"""
+    yield sse_event("start", {"username": username, "total": len(sites)})
+
+    found = 0
+    done = 0
+    for _, site, scan in get_engine().iter_search(sites, username, force_refresh, deadline):
+        row = result_row(site, scan)
+        row["index"] = catalog.position[site.name]
+        found += 1 if row["exists"] else 0
+        done += 1
+        yield sse_event("result", row)
+
+    yield sse_event("done", {"total": len(sites), "found": found, "partial": done < len(sites)})
+
+def results_stream(request):
+    form = UsernameForm(request.GET)
+    if not form.is_valid():
         return JsonResponse({"error": "username requis"}, status=400)
 
-    data = load_data()
+    catalog, sites, deadline = search_plan(form)
+    response = StreamingHttpResponse(
+        stream_results(form.cleaned_data["username"], catalog, sites, deadline, wants_refresh(request)),
+        content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # pas de mise en tampon côté proxy
+    return response
+
+def api_search(request):
+    """
+    Recherche synchrone. Paramètres optionnels : `category` (répétable) et
+    `budget` en secondes ; à l'échéance, les sites non sondés sont listés
+    dans `pending` et `partial` vaut true.
+    """
+    form = UsernameForm(request.GET)
+    if not form.is_valid():
+        if "username" in form.errors:
+            return JsonResponse({"error": "username requis"}, status=400)
+        return JsonResponse({"error": form.errors.get_json_data()}, status=400)
+    username = form.cleaned_data["username"]
+
     output = []
+    pending = []
+
+    catalog, sites, deadline = search_plan(form)
+    for site, scan in get_engine().search(sites, username, wants_refresh(request), deadline):
+        if scan is None:
+            pending.append(site.name)
+            continue
+        if scan["status"] == "NO_URL":
+            continue
+        output.append(result_row(site, scan))
+    output.sort(key=lambda row: catalog.position[row["name"]])
+
+    return JsonResponse({
+        "username": username,
+        "results": output,
+        "partial": bool(pending),
+        "pending": pending
+    })
+
+
+def api_batch_create(request):
+    """
+    Lance un lot : fichier `usernames_file` (multipart) ou champ `usernames`,
+    paramètres optionnels `format` (jsonl/csv), `category`, `refresh`.
+    Appelé par le formulaire de la page d'accueil : comme tous les POST
+    api_batch_*, protégé par le jeton CSRF (en-tête X-CSRFToken).
+    """
+    if request.method != "POST":
+        return JsonResponse({"success": False, "error": "POST requis"}, status=405)
+
+    upload = request.FILES.get("usernames_file")
+    if upload is not None:
+        lines = (line.decode("utf-8", errors="replace") for line in upload)
+    else:
+        lines = request.POST.get("usernames", "").splitlines()
+    usernames = batch.read_usernames(lines)
+    if not usernames:
+        return JsonResponse({"success": False, "error": "Aucun username fourni"}, status=400)
+
+    fmt = request.POST.get("format", "jsonl")
+    category = request.POST.get("category") or None
+    if fmt not in batch.FORMATS:
+        return JsonResponse({"success": False, "error": f"Format inconnu : {fmt}"}, status=400)
+    if category and category not in get_catalog().by_category:
+        return JsonResponse({"success": False, "error": f"Catégorie inconnue : {category}"}, status=400)
+
+    job = batch.create_job(usernames, fmt, category, request.POST.get("refresh") in ("1", "true", "on"))
+    return JsonResponse({"success": True, "job": batch.job_status(job)}, status=202)
+
+def api_batch_status(request, job_id):
+    job = batch.batch_jobs.get(job_id)
+    if job is not None:
+        return JsonResponse({"success": True, "job": batch.job_status(job)})
+
+    # Lot connu sur disque mais pas dans ce processus (redémarrage) : reprenable
+    meta = batch.load_job_meta(job_id)
+    if meta is None:
+        return JsonResponse({"success": False, "error": "Lot introuvable"}, status=404)
+    _, _, output_path = batch.job_paths(job_id, meta["format"])
+    return JsonResponse({"success": True, "job": {
+        "id": job_id,
+        "status": "stopped",
+        "format": meta["format"],
+        "category": meta["category"],
+        "done": len(batch.completed_pairs(output_path, meta["format"])),
+        "download": batch.download_url(job_id),
+    }})
+
+def api_batch_resume(request, job_id):
+    if request.method != "POST":
+        return JsonResponse({"success": False, "error": "POST requis"}, status=405)
+    job = batch.start_job(job_id, request.POST.get("refresh") in ("1", "true", "on"))
+    if job is None:
+        return JsonResponse({"success": False, "error": "Lot introuvable"}, status=404)
+    return JsonResponse({"success": True, "job": batch.job_status(job)}, status=202)
+
+def api_batch_stop(request, job_id):
+    if request.method != "POST":
+        return JsonResponse({"success": False, "error": "POST requis"}, status=405)
+    job = batch.batch_jobs.get(job_id)
+    if job is None:
+        return JsonResponse({"success": False, "error": "Lot introuvable"}, status=404)
+    job["stop"].set()
+    return JsonResponse({"success": True, "job": batch.job_status(job)})
 
-    for site in data["sites"]:
-        scan = check_username(site, username)
-        if scan["status"]=="NO_URL":
-
-            results.append({
-                "name":site.get("name"),
-                "category":site.get("category","N/A"),
-                "url":scan["url"],
-                "exists":scan["exists"],
-                "status":scan["status"]
-            })
+def api_batch_download(request, job_id):
+    meta = batch.load_job_meta(job_id)
+    if meta is None:
+        return JsonResponse({"success": False, "error": "Lot introuvable"}, status=404)
+    _, _, output_path = batch.job_paths(job_id, meta["format"])
+    try:
+        handle = open(output_path, "rb")
+    except OSError:
+        return JsonResponse({"success": False, "error": "Aucun résultat pour ce lot"}, status=404)
+    return FileResponse(handle, as_attachment=True, filename=f"checker_{job_id}.{meta['format']}")
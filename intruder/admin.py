@@ -1,3 +1,19 @@
 from django.contrib import admin
+from .models import IntruderCluster, IntruderRun
 
-# Register your models here.
+
+@admin.register(IntruderRun)
+class IntruderRunAdmin(admin.ModelAdmin):
+    list_display = ('id', 'target_url', 'mode', 'status', 'done', 'total', 'vulnerable', 'created_at')
+    list_filter = ('status', 'mode', 'created_at')
+    search_fields = ('target_url',)
+    ordering = ('-created_at',)
+    readonly_fields = ('cursor', 'created_at', 'updated_at', 'finished_at')
+
+
+@admin.register(IntruderCluster)
+class IntruderClusterAdmin(admin.ModelAdmin):
+    list_display = ('run', 'fingerprint', 'status', 'length', 'count', 'payload')
+    list_filter = ('status',)
+    search_fields = ('fingerprint', 'payload')
+    ordering = ('run', '-count')
@@ -0,0 +1,178 @@
+"""
+Détection d'anomalies sur les réponses de l'intruder.
+
+Les injections aveugles ne laissent pas de chaîne reconnaissable mais
+changent le code HTTP, la taille, le nombre de mots ou le temps de réponse.
+Chaque réponse est réduite à ces caractéristiques (plus un hash du corps),
+stockées dans des tableaux numpy contigus ; les statistiques sont calculées
+sur tout le tableau d'un coup, sans boucle Python par réponse.
+
+Référence : les requêtes baseline (payload neutre) envoyées avant l'attaque,
+ou à défaut l'ensemble des réponses. Écarts mesurés en z-score robuste
+(médiane / MAD) ; les tailles sont aussi regroupées par tranches de 2 % :
+une réponse d'une tranche rare dans l'attaque (et absente de la baseline,
+s'il y en a une) est signalée même sous le seuil de z-score.
+"""
+import threading
+
+import numpy as np
+
+# Seuils de signalement (z-scores robustes)
+LENGTH_Z = 4.0
+WORDS_Z = 4.0
+TIME_Z = 6.0
+# Une tranche de taille est rare si elle regroupe moins de cette part des réponses
+RARE_CLUSTER_SHARE = 0.01
+# Au-delà de cette part de réponses dans des tranches rares, les tailles sont simplement dispersées
+RARE_TOTAL_SHARE = 0.05
+# Regroupement des tailles : tranches logarithmiques de 2 %
+LENGTH_BUCKET = np.log(1.02)
+
+ERROR_STATUS = -1
+
+DTYPE = np.dtype([
+    ("index", np.int64),
+    ("status", np.int16),
+    ("length", np.int64),
+    ("words", np.int32),
+    ("time", np.float32),
+    ("hash", np.uint64),
+])
+
+
+class FeatureStore:
+    """Caractéristiques des réponses, dans un tableau structuré qui double de taille au besoin"""
+
+    def __init__(self, capacity=1024):
+        self._data = np.zeros(capacity, dtype=DTYPE)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def append(self, index, status, length, words, elapsed, body_hash):
+        with self._lock:
+            if self._size == len(self._data):
+                grown = np.zeros(len(self._data) * 2, dtype=DTYPE)
+                grown[:self._size] = self._data
+                self._data = grown
+            self._data[self._size] = (index, status, length, words, elapsed, body_hash)
+            self._size += 1
+
+    def extend(self, rows):
+        """Ajoute d'un coup des lignes déjà structurées (reprise d'une attaque)"""
+        with self._lock:
+            needed = self._size + len(rows)
+            if needed > len(self._data):
+                grown = np.zeros(max(needed, len(self._data) * 2), dtype=DTYPE)
+                grown[:self._size] = self._data[:self._size]
+                self._data = grown
+            self._data[self._size:needed] = rows
+            self._size = needed
+
+    def view(self):
+        """Copie des lignes remplies (cohérente même si des réponses arrivent)"""
+        with self._lock:
+            return self._data[:self._size].copy()
+
+
+def robust_center(values):
+    """Médiane et dispersion (MAD normalisée, jamais nulle)"""
+    median = np.median(values)
+    mad = np.median(np.abs(values - median)) * 1.4826
+    return median, mad
+
+
+def robust_z(values, reference, floor):
+    if reference.size == 0:
+        return np.zeros(values.shape, dtype=np.float64)
+    median, mad = robust_center(reference.astype(np.float64))
+    return np.abs(values.astype(np.float64) - median) / max(mad, floor(median))
+
+
+def summarize(baseline):
+    """Résumé de la baseline pour l'affichage"""
+    ok = baseline[baseline["status"] != ERROR_STATUS]
+    if ok.size == 0:
+        return None
+    statuses, counts = np.unique(ok["status"], return_counts=True)
+    return {
+        "requests": int(baseline.size),
+        "status": int(statuses[np.argmax(counts)]),
+        "length": int(np.median(ok["length"])),
+        "words": int(np.median(ok["words"])),
+        "time": round(float(np.median(ok["time"])), 3),
+    }
+
+
+def length_buckets(lengths):
+    """Tranche logarithmique de 2 % de chaque taille"""
+    return np.floor(np.log1p(lengths.astype(np.float64)) / LENGTH_BUCKET).astype(np.int64)
+
+
+def find_anomalies(responses, baseline, limit=200):
+    """
+    Réponses qui s'écartent de la référence.
+    Renvoie [(index du payload, score, raisons), ...] trié par score décroissant.
+    """
+    if responses.size == 0:
+        return []
+
+    valid = responses["status"] != ERROR_STATUS
+    reference = baseline[baseline["status"] != ERROR_STATUS]
+    has_baseline = reference.size >= 2
+    if not has_baseline:
+        # Pas de baseline exploitable : l'attaque est sa propre référence
+        reference = responses[valid]
+    if reference.size == 0:
+        return []
+
+    statuses, counts = np.unique(reference["status"], return_counts=True)
+    expected_status = statuses[np.argmax(counts)]
+
+    # Planchers : quelques octets / mots de bruit, 50 ms de gigue réseau
+    length_z = robust_z(responses["length"], reference["length"], lambda m: max(8.0, m * 0.01))
+    words_z = robust_z(responses["words"], reference["words"], lambda m: max(2.0, m * 0.01))
+    time_z = robust_z(responses["time"], reference["time"], lambda m: max(0.05, m * 0.1))
+
+    # Tranches de taille rares parmi toutes les réponses
+    buckets = length_buckets(responses["length"])
+    _, inverse, bucket_counts = np.unique(buckets, return_inverse=True, return_counts=True)
+    rare = (bucket_counts[inverse] / responses.size) < RARE_CLUSTER_SHARE
+    if has_baseline:
+        # Une tranche déjà vue dans la baseline est une taille normale de la page
+        rare &= ~np.isin(buckets, length_buckets(reference["length"]))
+    # Une part de 1 % n'a de sens qu'à partir de 1 / RARE_CLUSTER_SHARE réponses
+    if responses.size < 1 / RARE_CLUSTER_SHARE or rare.mean() > RARE_TOTAL_SHARE:
+        rare[:] = False
+
+    status_flag = valid & (responses["status"] != expected_status)
+    length_flag = valid & (length_z > LENGTH_Z)
+    words_flag = valid & (words_z > WORDS_Z)
+    time_flag = valid & (time_z > TIME_Z)
+    rare_flag = valid & rare
+
+    score = np.maximum.reduce([
+        length_z / LENGTH_Z,
+        words_z / WORDS_Z,
+        time_z / TIME_Z,
+        status_flag * 2.0,
+        rare_flag * 1.0,
+    ])
+    flagged = np.flatnonzero(status_flag | length_flag | words_flag | time_flag | rare_flag)
+    flagged = flagged[np.argsort(-score[flagged], kind="stable")][:limit]
+
+    anomalies = []
+    for position in flagged:
+        reasons = []
+        if status_flag[position]:
+            reasons.append(f"status {int(responses['status'][position])} ≠ {int(expected_status)}")
+        if length_flag[position] or rare_flag[position]:
+            reasons.append("taille" + (" (groupe rare)" if rare_flag[position] else ""))
+        if words_flag[position]:
+            reasons.append("mots")
+        if time_flag[position]:
+            reasons.append("temps")
+        anomalies.append((int(responses["index"][position]), round(float(score[position]), 2), reasons))
+    return anomalies
@@ -0,0 +1,190 @@
+"""
+Points d'insertion et modes d'attaque de l'intruder (à la Burp).
+
+Un point d'insertion désigne où placer un payload dans la requête :
+paramètre de query string, champ de formulaire, en-tête, ou segment de
+chemin marqué §nom§ dans l'URL. Les quatre modes sont des générateurs
+paresseux sur les listes de payloads ; le nombre total de requêtes est connu
+avant le premier envoi, sans jamais matérialiser les combinaisons.
+
+- sniper : chaque point tour à tour, avec chaque payload de la liste ;
+- battering ram : le même payload dans tous les points à la fois ;
+- pitchfork : une liste par point, parcourues en parallèle ;
+- cluster bomb : une liste par point, toutes les combinaisons.
+"""
+import math
+from urllib.parse import quote
+
+LOCATIONS = ("query", "body", "header", "path")
+METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+SNIPER = "sniper"
+BATTERING_RAM = "battering_ram"
+PITCHFORK = "pitchfork"
+CLUSTER_BOMB = "cluster_bomb"
+MODES = (SNIPER, BATTERING_RAM, PITCHFORK, CLUSTER_BOMB)
+
+PATH_MARKER = "§"
+
+
+class AttackError(ValueError):
+    """Configuration d'attaque invalide (message affiché à l'utilisateur)"""
+
+
+class InsertionPoint:
+    __slots__ = ("location", "name")
+
+    def __init__(self, location, name):
+        if location not in LOCATIONS:
+            raise AttackError(f"Emplacement inconnu : {location}")
+        if not name:
+            raise AttackError(f"Nom manquant pour le point d'insertion {location}")
+        self.location = location
+        self.name = name
+
+    def __str__(self):
+        return f"{self.location}:{self.name}"
+
+    @classmethod
+    def parse(cls, spec):
+        """`query:q`, `body:password`, `header:X-Api-Key`, `path:id`"""
+        location, sep, name = spec.strip().partition(":")
+        if not sep:
+            raise AttackError(f"Point d'insertion invalide : {spec} (attendu emplacement:nom)")
+        return cls(location.strip().lower(), name.strip())
+
+
+def header_value(payload):
+    """
+    Valeur d'en-tête : http.client n'encode que le Latin-1, les autres
+    payloads partent en octets UTF-8 bruts (comme dans Burp)
+    """
+    try:
+        payload.encode("latin-1")
+    except UnicodeEncodeError:
+        return payload.encode("utf-8")
+    return payload
+
+
+class RequestTemplate:
+    """Requête de base dans laquelle les payloads sont insérés"""
+
+    def __init__(self, method, url, query=None, body=None, headers=None, points=()):
+        self.method = method.upper()
+        if self.method not in METHODS:
+            raise AttackError(f"Méthode non supportée : {method}")
+        self.url = url
+        self.query = dict(query or {})
+        self.body = dict(body or {})
+        self.headers = dict(headers or {})
+        self.points = list(points)
+        if not self.points:
+            raise AttackError("Au moins un point d'insertion est requis")
+        for point in self.points:
+            if point.location == "path" and f"{PATH_MARKER}{point.name}{PATH_MARKER}" not in url:
+                raise AttackError(f"Marqueur {PATH_MARKER}{point.name}{PATH_MARKER} absent de l'URL")
+
+    def build(self, values):
+        """
+        Arguments de session.request() pour `values` = [(point, payload), ...].
+        Les points absents de `values` gardent leur valeur de base.
+        """
+        url = self.url
+        query = dict(self.query)
+        body = dict(self.body)
+        headers = dict(self.headers)
+        for point, payload in values:
+            if point.location == "query":
+                query[point.name] = payload
+            elif point.location == "body":
+                body[point.name] = payload
+            elif point.location == "header":
+                headers[point.name] = header_value(payload)
+            else:
+                url = url.replace(f"{PATH_MARKER}{point.name}{PATH_MARKER}", quote(payload, safe=""))
+        # Marqueurs de chemin non attaqués dans cette requête : valeur vide
+        for point in self.points:
+            if point.location == "path":
+                url = url.replace(f"{PATH_MARKER}{point.name}{PATH_MARKER}", "")
+        return {
+            "method": self.method,
+            "url": url,
+            "params": query or None,
+            "data": body or None,
+            "headers": headers or None,
+        }
+
+
+class Attack:
+    """
+    Itérable paresseux des requêtes d'une attaque.
+    `payload_sets` : une liste (sniper, battering ram) ou une par point
+    (pitchfork, cluster bomb). Chaque liste doit pouvoir être parcourue
+    plusieurs fois et connaître sa longueur (len).
+    Produit des listes [(point, payload), ...].
+    """
+
+    def __init__(self, mode, points, payload_sets):
+        if mode not in MODES:
+            raise AttackError(f"Mode inconnu : {mode}")
+        if not payload_sets:
+            raise AttackError("Aucune liste de payloads")
+        self.mode = mode
+        self.points = list(points)
+        self.payload_sets = list(payload_sets)
+
+        if mode in (SNIPER, BATTERING_RAM):
+            self.payload_sets = self.payload_sets[:1]
+        elif len(self.payload_sets) != len(self.points):
+            raise AttackError(
+                f"Le mode {mode} demande une liste de payloads par point d'insertion "
+                f"({len(self.points)} point(s), {len(self.payload_sets)} liste(s))"
+            )
+        self.total = self._count()
+
+    def _count(self):
+        sizes = [len(payloads) for payloads in self.payload_sets]
+        if self.mode == SNIPER:
+            return len(self.points) * sizes[0]
+        if self.mode == BATTERING_RAM:
+            return sizes[0]
+        if self.mode == PITCHFORK:
+            return min(sizes)
+        return math.prod(sizes)
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        if self.mode == SNIPER:
+            return self._sniper()
+        if self.mode == BATTERING_RAM:
+            return self._battering_ram()
+        if self.mode == PITCHFORK:
+            return self._pitchfork()
+        return self._cluster_bomb(0, [])
+
+    def _sniper(self):
+        for point in self.points:
+            for payload in self.payload_sets[0]:
+                yield [(point, payload)]
+
+    def _battering_ram(self):
+        for payload in self.payload_sets[0]:
+            yield [(point, payload) for point in self.points]
+
+    def _pitchfork(self):
+        for payloads in zip(*self.payload_sets):
+            yield list(zip(self.points, payloads))
+
+    def _cluster_bomb(self, depth, prefix):
+        # Récursion plutôt qu'itertools.product, qui copierait chaque liste
+        # en mémoire : seules les listes, relues à chaque tour, sont gardées
+        payloads = self.payload_sets[depth]
+        last = depth == len(self.points) - 1
+        for payload in payloads:
+            values = prefix + [(self.points[depth], payload)]
+            if last:
+                yield values
+            else:
+                yield from self._cluster_bomb(depth + 1, values)
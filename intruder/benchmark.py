@@ -0,0 +1,235 @@
+"""
+Banc d'essai hors ligne de l'intruder.
+
+Une cible vulnérable locale (target_server.py, processus séparé) répond
+avec une latence log-normale configurable, des erreurs SQL, de la
+réflexion et des pauses SLEEP. Un jeu fixe de scénarios est lancé sur le
+vrai moteur (IntruderRun en base, wordlists sur disque, détecteurs,
+regroupement, confirmation des délais) et on mesure pour chacun :
+payloads/s, latences p50/p99, temps CPU, pic de RSS et précision/rappel
+des détections par rapport à la vérité terrain de la cible.
+"""
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+from django.conf import settings
+
+from .attacks import BATTERING_RAM, CLUSTER_BOMB, SNIPER
+from .config import build
+from .engine import AttackJob
+from .models import IntruderResult, IntruderRun
+from .target_server import SLEEP, SQLI, XSS, classify, serve
+
+SQLI_PAYLOADS = ["' OR 1=1 -- {n}", "\" OR \"{n}\"=\"{n}", "1' AND '{n}'='{n}", "admin{n}'--"]
+XSS_PAYLOADS = ["<script>alert({n})</script>", "<img src=x onerror=alert({n})>", "<svg onload=alert({n})>"]
+SLEEP_PAYLOADS = ["{n} AND SLEEP(1)", "{n}) AND SLEEP(1)-- -"]
+
+SCENARIOS = ("sniper_get", "battering_ram_post", "cluster_bomb_get", "timing_get")
+
+
+def payload_list(rng, count, options, sleep_ratio=0.0):
+    """`count` payloads uniques, mélange déterministe (graine) de SQLi, XSS, SLEEP et valeurs neutres"""
+    payloads = []
+    for n in range(count):
+        roll = rng.random()
+        if roll < options["sqli_ratio"]:
+            template = rng.choice(SQLI_PAYLOADS)
+        elif roll < options["sqli_ratio"] + options["xss_ratio"]:
+            template = rng.choice(XSS_PAYLOADS)
+        elif roll < options["sqli_ratio"] + options["xss_ratio"] + sleep_ratio:
+            template = rng.choice(SLEEP_PAYLOADS)
+        else:
+            template = "user{n}"
+        payloads.append(template.format(n=n))
+    return payloads
+
+
+def build_scenarios(options):
+    """Scénarios : méthode, points d'insertion, mode, listes de payloads, confirmation des délais"""
+    rng = random.Random(options["seed"])
+    count = options["payloads"]
+    side = max(2, int(math.sqrt(count)))
+    scenarios = {
+        "sniper_get": {
+            "method": "GET", "positions": ["query:q"], "mode": SNIPER,
+            "lists": [payload_list(rng, count, options)],
+        },
+        "battering_ram_post": {
+            "method": "POST", "positions": ["body:q", "body:name"], "mode": BATTERING_RAM,
+            "lists": [payload_list(rng, count, options)],
+        },
+        "cluster_bomb_get": {
+            "method": "GET", "positions": ["query:q", "query:sort"], "mode": CLUSTER_BOMB,
+            "lists": [payload_list(rng, side, options), [f"col{n}" for n in range(side)]],
+        },
+        # Plus court : chaque SLEEP coûte sleep_s secondes, et autant par rejeu
+        "timing_get": {
+            "method": "GET", "positions": ["query:q"], "mode": SNIPER,
+            "lists": [payload_list(rng, max(50, count // 20), options, sleep_ratio=options["sleep_ratio"])],
+            "timing": True,
+        },
+    }
+    return {name: scenarios[name] for name in options["scenarios"]}
+
+
+def write_wordlists(directory, name, lists):
+    """Listes écrites sur disque, lues en flux par le moteur comme des fichiers envoyés"""
+    sources = []
+    for number, payloads in enumerate(lists):
+        path = os.path.join(directory, f"{name}-{number}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(payloads))
+        sources.append({"type": "upload", "path": path, "name": os.path.basename(path)})
+    return sources
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss est en kilo-octets sous Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def ground_truth(attack, timing):
+    """Requêtes qui devraient être détectées (SLEEP seulement avec la confirmation des délais)"""
+    detectable = {SQLI, XSS} | ({SLEEP} if timing else set())
+    return [any(classify(payload) in detectable for _, payload in values) for values in attack]
+
+
+def detection_scores(run, truth):
+    """Précision / rappel des verdicts enregistrés par rapport à la vérité terrain"""
+    verdicts = dict(IntruderResult.objects.filter(run=run).values_list("index", "vulnerable"))
+    tp = fp = fn = 0
+    for index, expected in enumerate(truth):
+        if index not in verdicts:
+            continue
+        if verdicts[index] and expected:
+            tp += 1
+        elif verdicts[index]:
+            fp += 1
+        elif expected:
+            fn += 1
+    return {
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "precision": round(tp / (tp + fp), 4) if tp + fp else None,
+        "recall": round(tp / (tp + fn), 4) if tp + fn else None,
+    }
+
+
+def run_scenario(name, scenario, target_url, directory, options):
+    config = {
+        "method": scenario["method"],
+        "target_url": target_url,
+        "positions": scenario["positions"],
+        "query": {},
+        "body": {},
+        "headers": {},
+        "mode": scenario["mode"],
+        "sources": write_wordlists(directory, name, scenario["lists"]),
+        "transform": {"case": "", "prefix": "", "suffix": "", "b64": False, "url_encode": False},
+        "rules": "",
+        "reflection": True,
+        "timing": scenario.get("timing", False),
+        "workers": options["workers"],
+        "rps": 0,
+    }
+    template, attack, detectors = build(config)
+    # Avant l'attaque : les wordlists sont supprimées quand elle se termine
+    truth = ground_truth(attack, config["timing"])
+    run = IntruderRun.objects.create(mode=config["mode"], target_url=target_url, config=config, total=attack.total)
+    timing = None
+    if config["timing"]:
+        timing = {
+            "repeats": getattr(settings, "INTRUDER_TIMING_REPEATS", 5),
+            "concurrency": getattr(settings, "INTRUDER_TIMING_CONCURRENCY", 2),
+            "min_delay": options["sleep_s"] / 2,
+            "alpha": getattr(settings, "INTRUDER_TIMING_ALPHA", 0.01),
+        }
+    job = AttackJob(
+        run,
+        template,
+        attack,
+        detectors,
+        workers=options["workers"],
+        timeout=options["timeout"],
+        baseline_requests=getattr(settings, "INTRUDER_BASELINE_REQUESTS", 5),
+        timing=timing,
+        sample_bytes=getattr(settings, "INTRUDER_CLUSTER_SAMPLE_BYTES", 64 * 1024)
+    )
+
+    cpu_before = time.process_time()
+    started = time.perf_counter()
+    # Exécuté dans ce thread : le temps mesuré couvre baseline, attaque, écritures et rejeux
+    job.run()
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_before
+
+    times = np.array(IntruderResult.objects.filter(run=run).values_list("time", flat=True), dtype=np.float64)
+    report = {
+        "name": name,
+        "mode": scenario["mode"],
+        "status": job.status,
+        "error": job.error,
+        "requests": job.total,
+        "done": job.done,
+        "wall_s": round(wall, 3),
+        "payloads_per_s": round(job.done / wall, 1) if wall else None,
+        "latency_ms": {
+            "p50": round(float(np.percentile(times, 50)) * 1000, 1) if times.size else None,
+            "p99": round(float(np.percentile(times, 99)) * 1000, 1) if times.size else None,
+        },
+        "cpu_s": round(cpu, 3),
+        "cpu_percent": round(cpu / wall * 100, 1) if wall else None,
+        "cpu_ms_per_payload": round(cpu / job.done * 1000, 3) if job.done else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "clusters": len(job.fingerprints),
+        "timing_confirmed": len(job.timing),
+        "detection": detection_scores(run, truth),
+    }
+    if not options["keep"]:
+        run.delete()
+    return report
+
+
+def run_benchmark(options):
+    """
+    Lance la cible, exécute les scénarios et renvoie un rapport (dict).
+    Options : scenarios, payloads, workers, latency_ms, jitter, sqli_ratio,
+    xss_ratio, sleep_ratio, noise_ratio, sleep_s, body_kb, timeout, seed, keep.
+    """
+    scenarios = build_scenarios(options)
+
+    context = multiprocessing.get_context("spawn")
+    port_queue = context.Queue()
+    server = context.Process(target=serve, args=(options, port_queue), daemon=True)
+    server.start()
+    directory = tempfile.mkdtemp(prefix="intruder-bench-")
+    try:
+        port = port_queue.get(timeout=30)
+        target_url = f"http://127.0.0.1:{port}/search"
+        reports = [
+            run_scenario(name, scenario, target_url, directory, options)
+            for name, scenario in scenarios.items()
+        ]
+        return {
+            "options": options,
+            "scenarios": reports,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+    finally:
+        server.terminate()
+        server.join(timeout=5)
+        shutil.rmtree(directory, ignore_errors=True)
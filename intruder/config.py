@@ -0,0 +1,156 @@
+"""
+Configuration d'une attaque intruder.
+
+Le formulaire est d'abord réduit à un dict JSON (stocké dans
+IntruderRun.config), puis l'attaque est reconstruite à partir de ce dict :
+le même chemin sert au lancement et à la reprise d'une attaque arrêtée.
+"""
+import os
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+from .attacks import SNIPER, Attack, AttackError, InsertionPoint, RequestTemplate
+from .detectors import DEFAULT_RULES, DetectorPipeline, parse_rules
+from .wordlists import FileWordlist, TextWordlist, Transformed, open_server_wordlist, store_upload
+
+CASES = ("", "lower", "upper", "variants")
+
+
+def parse_pairs(raw, separator):
+    """Lignes `nom=valeur` (ou `Nom: valeur` pour les en-têtes) en dict"""
+    pairs = {}
+    for line in raw.splitlines():
+        name, sep, value = line.partition(separator)
+        if sep and name.strip():
+            pairs[name.strip()] = value.strip()
+    return pairs
+
+
+def int_param(value, default, minimum=0, maximum=None):
+    """Entier d'un champ de formulaire, borné (valeur par défaut si invalide)"""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    value = max(minimum, value)
+    return min(value, maximum) if maximum is not None else value
+
+
+def config_from_request(post, files):
+    """
+    Formulaire → configuration JSON. Les fichiers envoyés sont recopiés sur
+    disque et référencés par leur chemin (AttackError si invalide).
+    """
+    target_url = post.get("target_url", "").strip()
+
+    # Vérification URL valide
+    parsed = urlparse(target_url)
+    if not parsed.scheme or not parsed.netloc:
+        raise AttackError("URL invalide. Exemple: https://example.com")
+
+    positions = [line.strip() for line in post.get("positions", "").splitlines() if line.strip()]
+    if not positions and post.get("param_name", "").strip():
+        # Ancien formulaire : un seul paramètre de query string
+        positions = [f"query:{post['param_name'].strip()}"]
+
+    # Listes de payloads, dans l'ordre : zones de saisie, fichiers envoyés, wordlists serveur
+    sources = []
+    for raw in post.getlist("payloads"):
+        payloads = TextWordlist(raw).payloads
+        if payloads:
+            sources.append({"type": "text", "payloads": payloads})
+    for relative_path in post.getlist("wordlists"):
+        if relative_path and open_server_wordlist(relative_path) is None:
+            raise AttackError(f"Wordlist introuvable : {relative_path}")
+    for upload in files.getlist("payload_files"):
+        wordlist = store_upload(upload)
+        sources.append({"type": "upload", "path": wordlist.path, "name": wordlist.name})
+    for relative_path in post.getlist("wordlists"):
+        if relative_path:
+            sources.append({"type": "server", "path": relative_path})
+
+    config = {
+        "method": post.get("method", "GET"),
+        "target_url": target_url,
+        "positions": positions,
+        "query": parse_pairs(post.get("query_params", ""), "="),
+        "body": parse_pairs(post.get("body_params", ""), "="),
+        "headers": parse_pairs(post.get("headers", ""), ":"),
+        "mode": post.get("mode", SNIPER),
+        "sources": sources,
+        "transform": {
+            "case": post.get("case", ""),
+            "prefix": post.get("prefix", ""),
+            "suffix": post.get("suffix", ""),
+            "b64": post.get("base64") in ("1", "on"),
+            "url_encode": post.get("url_encode") in ("1", "on"),
+        },
+        "rules": post.get("rules", ""),
+        "reflection": post.get("reflection", "on") in ("1", "on"),
+        "timing": post.get("timing") in ("1", "on"),
+        "workers": int_param(post.get("workers"), None, minimum=1),
+        "rps": int_param(post.get("rps"), 0),
+    }
+
+    # Validation complète avant d'enregistrer quoi que ce soit
+    try:
+        build(config)
+    except AttackError:
+        remove_uploads(config)
+        raise
+    return config
+
+
+def open_source(source):
+    if source["type"] == "text":
+        return TextWordlist("\n".join(source["payloads"]))
+    if source["type"] == "upload":
+        if not os.path.isfile(source["path"]):
+            raise AttackError(f"Fichier de payloads disparu : {source['name']}")
+        return FileWordlist(source["path"], name=source["name"])
+    wordlist = open_server_wordlist(source["path"])
+    if wordlist is None:
+        raise AttackError(f"Wordlist introuvable : {source['path']}")
+    return wordlist
+
+
+def build(config):
+    """Configuration → (requête de base, attaque, détecteurs)"""
+    points = [InsertionPoint.parse(spec) for spec in config["positions"]]
+    template = RequestTemplate(
+        config["method"],
+        config["target_url"],
+        query=config["query"],
+        body=config["body"],
+        headers=config["headers"],
+        points=points,
+    )
+
+    transform = config["transform"]
+    if transform["case"] not in CASES:
+        raise AttackError(f"Transformation de casse inconnue : {transform['case']}")
+    payload_sets = [open_source(source) for source in config["sources"]]
+    if not payload_sets:
+        raise AttackError("Aucun payload fourni")
+    if any(transform.values()):
+        payload_sets = [Transformed(wordlist, **transform) for wordlist in payload_sets]
+
+    detectors = DetectorPipeline(
+        DEFAULT_RULES + parse_rules(config["rules"]),
+        reflection=config["reflection"],
+        max_bytes=getattr(settings, "INTRUDER_MAX_BODY_BYTES", 1024 * 1024)
+    )
+    return template, Attack(config["mode"], points, payload_sets), detectors
+
+
+def uploads_of(config):
+    return [source["path"] for source in config["sources"] if source["type"] == "upload"]
+
+
+def remove_uploads(config):
+    for path in uploads_of(config):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
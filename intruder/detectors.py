@@ -0,0 +1,214 @@
+"""
+Pipeline de détection de l'intruder.
+
+Toutes les signatures (erreurs SQL, règles personnalisées en texte ou en
+regex) sont compilées une fois par attaque en une seule expression régulière
+sur octets, appliquée au corps brut (plafonné à INTRUDER_MAX_BODY_BYTES,
+insensible à la casse, sans copie en minuscules). Les règles texte y forment
+un arbre de préfixes (trie) : à chaque position, le coût dépend de la
+longueur des motifs et de leurs octets de départ, pas de leur nombre.
+
+Le parcours unique (finditer) ne rapporte qu'une occurrence par position et
+saute ce qui chevauche une occurrence trouvée : un second passage, limité aux
+positions couvertes par ces occurrences, y cherche les règles pas encore
+trouvées. Toutes les règles présentes sont donc rapportées, même
+chevauchantes, sans reparcourir le corps.
+
+Les regex personnalisées à groupes (références arrière, groupes nommés) ne
+peuvent pas être combinées : elles sont appliquées chacune au corps.
+La réflexion coûte une recherche par payload inséré.
+"""
+import re
+
+from .attacks import AttackError
+
+LOW = "Low"
+MEDIUM = "Medium"
+HIGH = "High"
+RISK_ORDER = {LOW: 0, MEDIUM: 1, HIGH: 2}
+
+REFLECTION = "reflection"
+
+
+class Rule:
+    """Signature de détection : texte littéral ou regex, et risque associé"""
+    __slots__ = ("name", "pattern", "risk", "regex")
+
+    def __init__(self, name, pattern, risk=MEDIUM, regex=False):
+        if risk not in RISK_ORDER:
+            raise AttackError(f"Risque inconnu : {risk}")
+        if not pattern:
+            raise AttackError(f"Règle {name} vide")
+        self.name = name
+        self.pattern = pattern
+        self.risk = risk
+        self.regex = regex
+
+    def source(self):
+        """Motif en octets (texte échappé pour une règle littérale)"""
+        if not self.regex:
+            return re.escape(self.pattern.encode("utf-8"))
+        return self.pattern.encode("utf-8")
+
+    def compile(self):
+        """Regex seule de la règle (validation, second passage)"""
+        try:
+            return re.compile(self.source(), re.IGNORECASE)
+        except re.error as e:
+            raise AttackError(f"Regex invalide ({self.name}) : {e}") from e
+
+
+# Détection simple SQL
+SQL_ERRORS = [
+    "sql syntax",
+    "mysql",
+    "warning",
+    "unterminated",
+    "odbc",
+    "syntax error"
+]
+
+DEFAULT_RULES = [Rule(f"sql:{error}", error, HIGH) for error in SQL_ERRORS]
+
+
+def parse_rules(raw):
+    """
+    Règles personnalisées, une par ligne : `motif` (texte) ou `re:motif`
+    (regex), précédées éventuellement du risque `High|`, `Medium|` ou `Low|`.
+    """
+    rules = []
+    for number, line in enumerate(raw.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        risk = MEDIUM
+        head, sep, rest = line.partition("|")
+        if sep and head.strip().capitalize() in RISK_ORDER:
+            risk, line = head.strip().capitalize(), rest.strip()
+        regex = line.startswith("re:")
+        pattern = line[3:] if regex else line
+        rules.append(Rule(f"custom:{number}", pattern, risk, regex=regex))
+    return rules
+
+
+def trie_pattern(words):
+    """Alternation en arbre de préfixes des littéraux `words` (octets en minuscules)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for byte in word:
+            node = node.setdefault(byte, {})
+        node[None] = {}
+
+    def emit(node):
+        parts = []
+        # Chaîne sans embranchement : simple concaténation
+        while len(node) == 1 and None not in node:
+            (byte, node), = node.items()
+            parts.append(re.escape(bytes([byte])))
+        branches = [re.escape(bytes([byte])) + emit(child)
+                    for byte, child in sorted(item for item in node.items() if item[0] is not None)]
+        if branches:
+            rest = branches[0] if len(branches) == 1 else b"(?:" + b"|".join(branches) + b")"
+            # Fin de mot possible ici : la suite est optionnelle (gloutonne, le plus long d'abord)
+            parts.append(b"(?:" + rest + b")?" if None in node else rest)
+        return b"".join(parts)
+
+    return emit(trie)
+
+
+def literal_pattern(words):
+    """
+    Littéraux `words` (octets en minuscules) insensibles à la casse. Le premier
+    octet reste un littéral des deux casses, hors (?i) : re en tire l'ensemble
+    des octets de départ possibles et saute en C les autres positions.
+    """
+    by_first = {}
+    for word in words:
+        by_first.setdefault(word[0], []).append(word[1:])
+    alternatives = []
+    for first, rests in sorted(by_first.items()):
+        rest = b"(?i:" + trie_pattern(rests) + b")"
+        for variant in sorted({bytes([first]), bytes([first]).upper()}):
+            alternatives.append(re.escape(variant) + rest)
+    return b"|".join(alternatives)
+
+
+class DetectorPipeline:
+    """Règles compilées une fois par attaque, appliquées à chaque réponse"""
+
+    def __init__(self, rules=None, reflection=True, max_bytes=1024 * 1024):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self.reflection = reflection
+        self.max_bytes = max_bytes
+        # Regex seule de chaque règle, dans l'ordre des règles (valide aussi les regex)
+        self._single = [rule.compile() for rule in self.rules]
+
+        # Littéraux en minuscules -> index des règles ; regex sans groupe combinables
+        self._literals = {}
+        self._separate = []
+        alternatives = []
+        # Règle de chaque groupe de l'expression combinée (None : trie des littéraux)
+        self._groups = [None]
+        for index, (rule, single) in enumerate(zip(self.rules, self._single)):
+            if not rule.regex:
+                self._literals.setdefault(rule.pattern.encode("utf-8").lower(), []).append(index)
+            elif single.groups or single.flags != re.IGNORECASE:
+                # Groupes (numérotation décalée une fois combinée) ou drapeaux en ligne
+                self._separate.append(index)
+            else:
+                alternatives.append(b"((?i:" + rule.source() + b"))")
+                self._groups.append(index)
+        if self._literals:
+            alternatives.insert(0, b"(" + literal_pattern(self._literals) + b")")
+            self._groups.insert(1, None)
+        self._matcher = re.compile(b"|".join(alternatives)) if alternatives else None
+
+    def matches(self, body):
+        """Toutes les règles présentes dans le corps, dans l'ordre des règles"""
+        body = body[:self.max_bytes]
+        found = set()
+        spans = []
+        if self._matcher is not None:
+            for match in self._matcher.finditer(body):
+                index = self._groups[match.lastindex]
+                if index is None:
+                    found.update(self._literals[match.group().lower()])
+                else:
+                    found.add(index)
+                spans.append(match.span())
+
+        # Second passage : règles masquées par une occurrence trouvée (même position ou chevauchement)
+        missing = [index for index in range(len(self.rules)) if index not in found and index not in self._separate]
+        for start, end in spans:
+            for position in range(start, max(end, start + 1)):
+                if not missing:
+                    break
+                hits = [index for index in missing if self._single[index].match(body, position)]
+                if hits:
+                    found.update(hits)
+                    missing = [index for index in missing if index not in found]
+
+        for index in self._separate:
+            if self._single[index].search(body):
+                found.add(index)
+        return [self.rules[index] for index in sorted(found)]
+
+    def analyze(self, payloads, status, body):
+        """
+        Verdict d'une réponse : (vulnérable, risque, noms des règles touchées).
+        `body` : octets bruts de la réponse.
+        """
+        body = body[:self.max_bytes]
+        hits = self.matches(body)
+        names = [rule.name for rule in hits]
+        risk = max((rule.risk for rule in hits), key=RISK_ORDER.get, default=LOW)
+
+        if self.reflection:
+            for payload in payloads:
+                if payload and re.search(literal_pattern([payload.encode("utf-8").lower()]), body):
+                    names.append(REFLECTION)
+                    risk = max(risk, MEDIUM, key=RISK_ORDER.get)
+                    break
+
+        return bool(names), risk, names
@@ -0,0 +1,650 @@
+"""
+Moteur d'attaque concurrent de l'intruder.
+
+Une attaque tourne en tâche de fond (thread démon, comme les tests perforNet) :
+les requêtes de l'attaque (voir attacks.py) sont envoyées par un pool de workers qui partagent une session
+HTTP (pool de connexions keep-alive vers la cible), sous un plafond de
+requêtes par seconde. La vue ne fait que lancer l'attaque et renvoyer son
+identifiant ; la progression et les résultats sont lus par polling.
+Chaque réponse passe par le pipeline de détection compilé (detectors.py) ;
+des requêtes baseline envoyées d'abord servent de référence à la détection
+d'anomalies (anomaly.py). En option, les payloads lents sont ensuite rejoués
+pour confirmer statistiquement les injections temporelles (timing.py).
+Les réponses quasi identiques sont regroupées par empreinte (fingerprints.py) :
+un seul corps représentatif est enregistré par groupe.
+
+Chaque attaque est un IntruderRun en base : les résultats sont écrits par
+lots (bulk_create) depuis le thread de l'attaque, jamais gardés en mémoire,
+et le curseur du dernier payload traité sans trou permet de reprendre une
+attaque arrêtée ou interrompue (redémarrage du serveur) là où elle en était.
+Le lancement réclame l'attaque en base (un seul UPDATE conditionnel) : deux
+processus ne peuvent pas exécuter la même attaque, et une attaque « running »
+n'est tenue pour interrompue que si son heartbeat n'est plus rafraîchi.
+"""
+import hashlib
+import itertools
+import secrets
+import string
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+import numpy as np
+import requests
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from .anomaly import DTYPE, ERROR_STATUS, FeatureStore, find_anomalies, summarize
+from .attacks import AttackError
+from .config import build, remove_uploads
+from .detectors import HIGH
+from .fingerprints import FingerprintStore, simhash, strip_payloads
+from .models import IntruderCluster, IntruderResult, IntruderRun
+from .timing import candidates, schedule, verdict
+
+CHUNK_SIZE = 64 * 1024
+
+# Attaques en cours ou terminées récemment, par identifiant
+attack_jobs = {}
+
+# Durée de conservation d'une attaque terminée (secondes)
+JOB_RETENTION = 3600
+
+# Intervalle minimal entre deux recalculs des anomalies pendant l'attaque (secondes)
+ANOMALY_REFRESH = 2.0
+
+TIME_BASED = "time-based"
+
+# Écriture des résultats en base : tous les FLUSH_ROWS résultats ou FLUSH_INTERVAL secondes
+FLUSH_ROWS = 200
+FLUSH_INTERVAL = 1.0
+
+# Le thread de l'attaque rafraîchit le heartbeat toutes les HEARTBEAT secondes ;
+# sans signe de vie depuis STALE_AFTER secondes, l'attaque est interrompue
+HEARTBEAT = 15
+STALE_AFTER = 90
+
+
+class RateLimiter:
+    """Seau à jetons partagé par les workers : au plus `rps` requêtes/seconde"""
+
+    def __init__(self, rps):
+        self.rps = rps
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop=None):
+        """Attend le prochain créneau ; renvoie False si l'attaque est arrêtée entre-temps"""
+        if not self.rps:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + 1 / self.rps
+        delay = slot - now
+        if delay <= 0:
+            return True
+        if stop is not None:
+            return not stop.wait(delay)
+        time.sleep(delay)
+        return True
+
+
+def build_session(pool_size):
+    """Session propre à une attaque : cookies isolés, `pool_size` connexions gardées"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def read_body(response, max_bytes):
+    """
+    Corps brut plafonné à `max_bytes` et longueur totale réelle : la suite
+    est lue (la connexion reste réutilisable) mais n'est pas gardée
+    """
+    kept = []
+    size = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        if size < max_bytes:
+            kept.append(chunk[:max_bytes - size])
+        size += len(chunk)
+    return b"".join(kept), size
+
+
+def body_hash(body):
+    """Hash 64 bits du corps (payloads réfléchis déjà retirés)"""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def baseline_token():
+    """Valeur neutre insérée dans les requêtes baseline"""
+    return "".join(secrets.choice(string.ascii_lowercase) for _ in range(10))
+
+
+def send_payload(session, template, values, timeout, detectors):
+    """
+    Envoie une requête de l'attaque (values = [(point, payload), ...]) et
+    renvoie la ligne de résultat, avec le corps et son simhash pour le
+    regroupement (retirés avant l'écriture en base)
+    """
+    payloads = [payload for _, payload in values]
+    payload = " | ".join(payloads)
+    position = ", ".join(str(point) for point, _ in values)
+    start_time = time.time()
+    try:
+        with session.request(timeout=timeout, stream=True, **template.build(values)) as response:
+            body, length = read_body(response, detectors.max_bytes)
+    except (requests.exceptions.RequestException, ValueError):
+        # ValueError : requête impossible à construire pour ce payload (ex. UnicodeEncodeError
+        # dans http.client) ; seule cette ligne est en erreur, pas l'attaque
+        return {
+            "payload": payload,
+            "position": position,
+            "status": "Error",
+            "length": 0,
+            "words": 0,
+            # Un timeout dure aussi longtemps que la pause injectée : le temps compte
+            "time": round(time.time() - start_time, 3),
+            "hash": None,
+            "simhash": 0,
+            "normalized_length": 0,
+            "body": b"",
+            "vulnerable": False,
+            "risk": "Low",
+            "matches": []
+        }
+    response_time = round(time.time() - start_time, 3)
+
+    vulnerable, risk, matches = detectors.analyze(payloads, response.status_code, body)
+    stripped = strip_payloads(body, payloads)
+    return {
+        "payload": payload,
+        "position": position,
+        "status": response.status_code,
+        "length": length,
+        "words": len(body.split()),
+        "time": response_time,
+        "hash": body_hash(stripped),
+        "simhash": simhash(stripped),
+        # Taille sans les payloads réfléchis : la même page pour tous les payloads
+        "normalized_length": length - (len(body) - len(stripped)),
+        "body": body,
+        "vulnerable": vulnerable,
+        "risk": risk,
+        "matches": matches
+    }
+
+
+class AttackJob:
+    """
+    Attaque en tâche de fond (état lu par les vues de polling). Les
+    résultats vont en base ; seules les caractéristiques numériques
+    (anomaly.py) restent en mémoire.
+    """
+
+    def __init__(self, run, template, attack, detectors, workers=10, rps=0, timeout=5, baseline_requests=5,
+                 timing=None, sample_bytes=64 * 1024):
+        self.run_id = run.pk
+        self.id = str(run.pk)
+        self.config = run.config
+        self.template = template
+        self.attack = attack
+        self.detectors = detectors
+        self.workers = workers
+        self.rps = rps
+        self.timeout = timeout
+        self.baseline_requests = baseline_requests
+        # Confirmation des délais : {"repeats", "concurrency", "min_delay", "alpha"}, None si désactivée
+        self.timing_options = timing
+
+        self.status = "pending"
+        self.phase = "attack"
+        self.error = None
+        self.mode = attack.mode
+        self.total = attack.total
+        # Reprise : on repart du curseur et des compteurs enregistrés
+        self.cursor = run.cursor
+        self.done = run.done
+        self.vulnerable = run.vulnerable
+        self.resumed_from = run.done
+        self._buffer = []
+        self._flushed_at = time.monotonic()
+        # Index terminés au-delà du curseur (le curseur n'avance que sans trou)
+        self._completed = set()
+        self.features = FeatureStore()
+        self.baseline_features = FeatureStore(capacity=max(1, baseline_requests))
+        self.fingerprints = FingerprintStore(sample_bytes=sample_bytes)
+        self.baseline = None
+        self.timing = run.timing
+        self._anomalies = []
+        self._anomalies_at = (0.0, -1)
+        self.started_at = None
+        self.finished_at = None
+        self.stop = threading.Event()
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+
+    def _work(self, session, limiter, index, values, record=True):
+        """Envoi d'une requête ; `record` : réponse de l'attaque (regroupée), pas une baseline ou un rejeu"""
+        if self.stop.is_set() or not limiter.acquire(self.stop):
+            return None
+        row = send_payload(session, self.template, values, self.timeout, self.detectors)
+        row["index"] = index
+        # Le corps ne quitte pas le worker : gardé seulement s'il représente un nouveau groupe
+        body = row.pop("body")
+        digest = row.pop("simhash")
+        length = row.pop("normalized_length")
+        if record:
+            status = row["status"] if isinstance(row["status"], int) else None
+            row["fingerprint"] = self.fingerprints.assign(index, row["payload"], status, length, digest, body)
+        return row
+
+    @staticmethod
+    def _append_features(store, row):
+        status = row["status"] if isinstance(row["status"], int) else ERROR_STATUS
+        store.append(row["index"], status, row["length"], row["words"], row["time"], int(row["hash"] or "0", 16))
+
+    def _record(self, row):
+        with self._lock:
+            self._buffer.append(row)
+            self._append_features(self.features, row)
+            self.done += 1
+            if row["vulnerable"]:
+                self.vulnerable += 1
+        if len(self._buffer) >= FLUSH_ROWS or time.monotonic() - self._flushed_at >= FLUSH_INTERVAL:
+            self._flush()
+
+    def _advance(self, indexes):
+        """Ajoute des index terminés et avance le curseur tant qu'il n'y a pas de trou"""
+        self._completed.update(indexes)
+        while self.cursor + 1 in self._completed:
+            self.cursor += 1
+            self._completed.discard(self.cursor)
+
+    def _flush(self):
+        """Écrit les résultats en attente et la progression (thread de l'attaque uniquement)"""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            done, vulnerable = self.done, self.vulnerable
+        self._flushed_at = time.monotonic()
+        new_clusters = self.fingerprints.drain()
+        if new_clusters:
+            IntruderCluster.objects.bulk_create([
+                IntruderCluster(
+                    run_id=self.run_id,
+                    fingerprint=cluster.fingerprint,
+                    status=cluster.status,
+                    length=cluster.length,
+                    simhash=f"{cluster.simhash:016x}",
+                    first_index=cluster.index,
+                    payload=cluster.payload,
+                    body=cluster.sample.decode("utf-8", errors="replace"),
+                )
+                for cluster in new_clusters
+            ], ignore_conflicts=True)
+            for cluster in new_clusters:
+                cluster.sample = None
+        if rows:
+            # Compteurs des groupes et résultats écrits ensemble : un groupe ne compte que des résultats en base
+            with transaction.atomic():
+                self._write_results(rows)
+            self._advance(row["index"] for row in rows)
+        IntruderRun.objects.filter(pk=self.run_id).update(
+            done=done, vulnerable=vulnerable, cursor=self.cursor, updated_at=timezone.now(), heartbeat=timezone.now()
+        )
+
+    def _write_results(self, rows):
+        """Résultats d'un lot et compteurs de leurs groupes (dans la transaction de _flush)"""
+        IntruderResult.objects.bulk_create([
+            IntruderResult(
+                run_id=self.run_id,
+                index=row["index"],
+                payload=row["payload"],
+                position=row["position"][:500],
+                status=row["status"] if isinstance(row["status"], int) else None,
+                length=row["length"],
+                words=row["words"],
+                time=row["time"],
+                hash=row["hash"] or "",
+                vulnerable=row["vulnerable"],
+                risk=row["risk"],
+                matches=row["matches"],
+                fingerprint=row["fingerprint"],
+            )
+            for row in rows
+        ], ignore_conflicts=True)
+        for fingerprint, count in Counter(row["fingerprint"] for row in rows).items():
+            IntruderCluster.objects.filter(run_id=self.run_id, fingerprint=fingerprint).update(count=F("count") + count)
+
+    def _beat(self):
+        """Rafraîchit le heartbeat de l'attaque jusqu'à sa fin (thread démon)"""
+        try:
+            while not self._finished.wait(HEARTBEAT):
+                IntruderRun.objects.filter(pk=self.run_id, status="running").update(heartbeat=timezone.now())
+        finally:
+            connection.close()
+
+    def _load_previous(self):
+        """Reprise : caractéristiques des réponses déjà en base et index déjà traités après le curseur"""
+        stored = IntruderResult.objects.filter(run_id=self.run_id).order_by("index").values_list(
+            "index", "status", "length", "words", "time", "hash"
+        )
+        rows = np.array([
+            (index, ERROR_STATUS if status is None else status, length, words, elapsed, int(digest or "0", 16))
+            for index, status, length, words, elapsed, digest in stored.iterator(chunk_size=5000)
+        ], dtype=DTYPE)
+        self.features.extend(rows)
+        self.fingerprints.load(
+            IntruderCluster.objects.filter(run_id=self.run_id).values_list("fingerprint", "status", "length", "simhash")
+        )
+        self._rebuild_counts()
+        # Les compteurs enregistrés peuvent être en retard sur le dernier lot écrit
+        self.done = len(rows)
+        self.vulnerable = IntruderResult.objects.filter(run_id=self.run_id, vulnerable=True).count()
+        self.resumed_from = self.done
+        self._advance(rows["index"][rows["index"] > self.cursor].tolist())
+        return set(self._completed)
+
+    def _rebuild_counts(self):
+        """
+        Reprise : compteurs des groupes recalculés depuis les résultats en base
+        (une exécution interrompue a pu les laisser en avance ou en retard)
+        """
+        persisted = (
+            IntruderResult.objects.filter(run_id=self.run_id)
+            .values("fingerprint").annotate(total=Count("pk")).values_list("fingerprint", "total")
+        )
+        with transaction.atomic():
+            IntruderCluster.objects.filter(run_id=self.run_id).update(count=0)
+            for fingerprint, total in persisted:
+                IntruderCluster.objects.filter(run_id=self.run_id, fingerprint=fingerprint).update(count=total)
+
+    def _send_baseline(self, executor, session, limiter):
+        """Requêtes de référence (valeur neutre dans chaque point) avant l'attaque"""
+        values = [(point, baseline_token()) for point in self.template.points]
+        futures = [
+            executor.submit(self._work, session, limiter, -1, values, record=False)
+            for _ in range(self.baseline_requests)
+        ]
+        for future in futures:
+            row = future.result()
+            if row is not None:
+                self._append_features(self.baseline_features, row)
+        self.baseline = summarize(self.baseline_features.view())
+
+    def _confirm_timing(self, session, limiter):
+        """Rejoue les payloads lents entre des requêtes baseline et garde les retards significatifs"""
+        options = self.timing_options
+        wanted = candidates(self.features.view(), self.baseline_features.view(), options["min_delay"])
+        self.timing = []
+        if not wanted:
+            return
+        self.phase = "timing"
+        print(f"[Intruder] Attaque {self.id} : confirmation des délais de {len(wanted)} payloads")
+
+        # Les requêtes ne sont pas gardées : on les regénère en reparcourant l'attaque
+        values_of = {}
+        remaining = set(wanted)
+        for index, values in enumerate(self.attack):
+            if index in remaining:
+                values_of[index] = values
+                remaining.discard(index)
+                if not remaining:
+                    break
+
+        neutral = [(point, baseline_token()) for point in self.template.points]
+        samples = {index: [] for index in wanted}
+        reference = []
+        # Faible concurrence : les rejeux ne doivent pas charger la cible au point de fausser les temps
+        with ThreadPoolExecutor(max_workers=options["concurrency"], thread_name_prefix=f"intruder-{self.id}-timing") as executor:
+            futures = [
+                (index, executor.submit(
+                    self._work, session, limiter,
+                    -1 if index is None else index,
+                    neutral if index is None else values_of[index],
+                    record=False
+                ))
+                for index in schedule(wanted, options["repeats"])
+            ]
+            for index, future in futures:
+                row = future.result()
+                if row is not None:
+                    (reference if index is None else samples[index]).append(row["time"])
+        if self.stop.is_set():
+            return
+
+        for index in wanted:
+            finding = verdict(samples[index], reference, options["min_delay"], options["alpha"])
+            result = IntruderResult.objects.filter(run_id=self.run_id, index=index).first()
+            if finding is None or result is None:
+                continue
+            if not result.vulnerable:
+                with self._lock:
+                    self.vulnerable += 1
+            result.vulnerable = True
+            result.risk = HIGH
+            if TIME_BASED not in result.matches:
+                result.matches = result.matches + [TIME_BASED]
+            result.save(update_fields=["vulnerable", "risk", "matches"])
+            self.timing.append({"index": index, "payload": result.payload, **finding})
+
+    def anomalies(self):
+        """Réponses anormales par rapport à la baseline, recalculées au plus toutes les ANOMALY_REFRESH s"""
+        computed_at, computed_done = self._anomalies_at
+        finished = self.finished_at is not None
+        if self.done != computed_done and (finished or time.time() - computed_at >= ANOMALY_REFRESH):
+            done = self.done
+            self._anomalies = [
+                {"index": index, "score": score, "reasons": reasons}
+                for index, score, reasons in find_anomalies(self.features.view(), self.baseline_features.view())
+            ]
+            self._anomalies_at = (time.time(), done)
+        return self._anomalies
+
+    def run(self):
+        self.status = "running"
+        self.started_at = time.time()
+        limiter = RateLimiter(self.rps)
+        session = build_session(self.workers)
+        # Fenêtre de soumission bornée : les payloads ne sont jamais tous en file
+        window = self.workers * 4
+        threading.Thread(target=self._beat, daemon=True).start()
+        try:
+            already_done = self._load_previous()
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"intruder-{self.id}") as executor:
+                self._send_baseline(executor, session, limiter)
+                pending = set()
+                # L'attaque est un générateur : les combinaisons sont produites au fil des envois,
+                # celles déjà traitées (avant le curseur) sont sautées sans être envoyées
+                for index, values in itertools.islice(enumerate(self.attack), self.cursor + 1, None):
+                    if self.stop.is_set():
+                        break
+                    if index in already_done:
+                        continue
+                    if len(pending) >= window:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            row = future.result()
+                            if row is not None:
+                                self._record(row)
+                    pending.add(executor.submit(self._work, session, limiter, index, values))
+
+                for future in pending:
+                    row = future.result()
+                    if row is not None:
+                        self._record(row)
+
+            self._flush()
+            if self.timing_options and not self.stop.is_set():
+                self._confirm_timing(session, limiter)
+            self.status = "stopped" if self.stop.is_set() else "done"
+        except Exception as e:
+            print(f"[Intruder] Erreur attaque {self.id}: {e}")
+            self.status = "error"
+            self.error = str(e)
+        finally:
+            session.close()
+            self.finished_at = time.time()
+            self._finished.set()
+            try:
+                IntruderRun.objects.filter(pk=self.run_id).update(
+                    status=self.status,
+                    error=self.error or "",
+                    done=self.done,
+                    vulnerable=self.vulnerable,
+                    cursor=self.cursor,
+                    baseline=self.baseline,
+                    anomalies=self.anomalies(),
+                    timing=self.timing,
+                    finished_at=timezone.now(),
+                    updated_at=timezone.now(),
+                )
+                if self.status == "done":
+                    # Wordlists envoyées : inutiles une fois l'attaque allée à son terme
+                    remove_uploads(self.config)
+            finally:
+                connection.close()
+
+    def snapshot(self):
+        """État de l'attaque (les résultats se lisent page par page, voir attack_results)"""
+        done = self.done
+        elapsed = (self.finished_at or time.time()) - (self.started_at or time.time())
+        return {
+            "id": self.id,
+            "status": self.status,
+            "phase": self.phase,
+            "error": self.error,
+            "mode": self.mode,
+            "total": self.total,
+            "done": done,
+            "vulnerable": self.vulnerable,
+            "clusters": len(self.fingerprints),
+            "percent": round(done / self.total * 100, 1) if self.total else 100,
+            "rate": round((done - self.resumed_from) / elapsed, 1) if elapsed > 0 else 0,
+            "baseline": self.baseline,
+            "anomalies": self.anomalies(),
+            "timing": self.timing
+        }
+
+
+def is_stale(run):
+    """Attaque en attente ou en cours dont le processus ne donne plus signe de vie"""
+    if run.status not in ("pending", "running"):
+        return False
+    seen = run.heartbeat or run.updated_at
+    return (timezone.now() - seen).total_seconds() > STALE_AFTER
+
+
+def run_snapshot(run):
+    """
+    État d'une attaque sans tâche dans ce processus : terminée, en cours
+    dans un autre processus, ou interrompue (heartbeat trop ancien)
+    """
+    status = "interrupted" if is_stale(run) else run.status
+    return {
+        "id": str(run.pk),
+        "status": status,
+        "phase": None,
+        "error": run.error or None,
+        "mode": run.mode,
+        "total": run.total,
+        "done": run.done,
+        "vulnerable": run.vulnerable,
+        "clusters": run.clusters.count(),
+        "percent": round(run.done / run.total * 100, 1) if run.total else 100,
+        "rate": 0,
+        "baseline": run.baseline,
+        "anomalies": run.anomalies,
+        "timing": run.timing
+    }
+
+
+def purge_jobs():
+    """Oublie les attaques terminées depuis plus de JOB_RETENTION secondes (elles restent en base)"""
+    now = time.time()
+    for job_id, job in list(attack_jobs.items()):
+        if job.finished_at and now - job.finished_at > JOB_RETENTION:
+            attack_jobs.pop(job_id, None)
+
+
+def claim_run(run):
+    """
+    Passe l'attaque à « running » si elle est lançable : en attente, arrêtée,
+    en erreur, ou en cours avec un heartbeat trop ancien. Un seul UPDATE
+    conditionnel : de deux processus, un seul obtient l'attaque. Renvoie True
+    si l'attaque a été obtenue.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=STALE_AFTER)
+    claimed = IntruderRun.objects.filter(
+        Q(status__in=["stopped", "error"])
+        | Q(status="pending", heartbeat__isnull=True)
+        | Q(status__in=["pending", "running"], heartbeat__lt=stale)
+        | Q(status="running", heartbeat__isnull=True, updated_at__lt=stale),
+        pk=run.pk,
+    ).update(status="running", heartbeat=now, error="", finished_at=None, updated_at=now)
+    return claimed == 1
+
+
+def start_run(run):
+    """
+    Reconstruit l'attaque à partir de sa configuration, la lance (ou la
+    reprend) dans un thread démon et renvoie la tâche. AttackError si la
+    configuration n'est plus utilisable (wordlist disparue...) ou si
+    l'attaque tourne déjà dans un autre processus.
+    """
+    job = attack_jobs.get(str(run.pk))
+    if job is not None and job.finished_at is None:
+        return job
+    if not claim_run(run):
+        raise AttackError("Attaque déjà en cours ou terminée")
+
+    try:
+        template, attack, detectors = build(run.config)
+    except AttackError as e:
+        IntruderRun.objects.filter(pk=run.pk).update(status="error", error=str(e))
+        raise
+
+    max_workers = getattr(settings, "INTRUDER_MAX_WORKERS", 50)
+    workers = min(max(1, run.config.get("workers") or getattr(settings, "INTRUDER_WORKERS", 10)), max_workers)
+    # INTRUDER_MAX_RPS est un plafond : on peut demander moins, pas plus
+    rps = run.config.get("rps") or 0
+    max_rps = getattr(settings, "INTRUDER_MAX_RPS", 0)
+    if max_rps:
+        rps = min(rps, max_rps) if rps else max_rps
+
+    timing = None
+    if run.config.get("timing"):
+        timing = {
+            "repeats": max(2, getattr(settings, "INTRUDER_TIMING_REPEATS", 5)),
+            "concurrency": max(1, getattr(settings, "INTRUDER_TIMING_CONCURRENCY", 2)),
+            "min_delay": getattr(settings, "INTRUDER_TIMING_MIN_DELAY", 1.0),
+            "alpha": getattr(settings, "INTRUDER_TIMING_ALPHA", 0.01),
+        }
+
+    purge_jobs()
+    job = AttackJob(
+        run,
+        template,
+        attack,
+        detectors,
+        workers=workers,
+        rps=rps,
+        timeout=getattr(settings, "INTRUDER_TIMEOUT", 5),
+        baseline_requests=getattr(settings, "INTRUDER_BASELINE_REQUESTS", 5),
+        timing=timing,
+        sample_bytes=getattr(settings, "INTRUDER_CLUSTER_SAMPLE_BYTES", 64 * 1024)
+    )
+    attack_jobs[job.id] = job
+    IntruderRun.objects.filter(pk=run.pk).update(total=job.total)
+    action = "Reprise" if run.cursor >= 0 or run.done else "Démarrage"
+    print(f"[Intruder] {action} attaque {job.id} ({attack.mode}, {job.total} requêtes, {workers} workers)")
+    threading.Thread(target=job.run, daemon=True).start()
+    return job
@@ -0,0 +1,135 @@
+"""
+Empreintes des réponses de l'intruder et regroupement des doublons.
+
+Une grosse attaque renvoie surtout la même page. Chaque réponse est
+réduite à une empreinte : code HTTP, tranche de taille normalisée (sans
+les payloads réfléchis, par tranches de 2 % comme anomaly.py) et simhash 64 bits des mots du corps (payloads retirés). Deux
+réponses dont les simhash diffèrent de quelques bits seulement (jeton CSRF,
+horodatage...) tombent dans le même groupe. Seul le premier corps de chaque
+groupe est conservé, comme représentant ; les autres réponses ne comptent
+que pour le total du groupe.
+"""
+import hashlib
+import re
+import threading
+
+import numpy as np
+
+from .anomaly import LENGTH_BUCKET
+
+# Bits de simhash qui peuvent différer au sein d'un même groupe
+SIMHASH_DISTANCE = 3
+# Octets du corps pris en compte pour le simhash
+SIMHASH_BYTES = 64 * 1024
+# Groupes comparés au plus par tranche (les plus récents), pour borner le coût si tout diffère
+MAX_SCAN = 64
+
+# Mots alphabétiques seulement : identifiants, jetons et horodatages (chiffres) ne comptent pas
+TOKEN = re.compile(rb"(?<![A-Za-z0-9_])[A-Za-z]{2,}(?![A-Za-z0-9_])")
+
+
+def strip_payloads(body, payloads):
+    """Corps sans les payloads réfléchis (réponses comparables entre elles)"""
+    for payload in payloads:
+        if payload:
+            body = body.replace(payload.encode("utf-8"), b"")
+    return body
+
+
+def simhash(body):
+    """Simhash 64 bits de l'ensemble des mots du corps"""
+    tokens = set(TOKEN.findall(body[:SIMHASH_BYTES]))
+    if not tokens:
+        return 0
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(token, digest_size=8).digest(), "little") for token in tokens),
+        dtype=np.uint64,
+        count=len(tokens)
+    )
+    # Un vote par mot et par bit : le bit est à 1 si la majorité des mots l'ont à 1
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(tokens)
+    return int(np.packbits(majority, bitorder="little").view(np.uint64)[0])
+
+
+def length_bucket(length):
+    return int(np.floor(np.log1p(length) / LENGTH_BUCKET))
+
+
+def fingerprint_of(status, length, digest):
+    """Identifiant texte d'un groupe (celui de son représentant)"""
+    return f"{'error' if status is None else status}-{length_bucket(length)}-{digest:016x}"
+
+
+class Cluster:
+    __slots__ = ("fingerprint", "status", "length", "simhash", "index", "payload", "sample")
+
+    def __init__(self, fingerprint, status, length, digest, index=None, payload="", sample=None):
+        self.fingerprint = fingerprint
+        self.status = status
+        self.length = length
+        self.simhash = digest
+        self.index = index
+        self.payload = payload
+        self.sample = sample
+
+
+class FingerprintStore:
+    """
+    Groupes d'une attaque, partagés par les workers. Les groupes créés
+    depuis le dernier passage sont récupérés par drain() pour être écrits
+    en base ; leurs compteurs suivent les résultats écrits (voir engine.py).
+    """
+
+    def __init__(self, sample_bytes=64 * 1024, distance=SIMHASH_DISTANCE):
+        self.sample_bytes = sample_bytes
+        self.distance = distance
+        self._by_key = {}
+        self._exact = {}
+        self._new = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._exact)
+
+    def _add(self, cluster):
+        key = (cluster.status, length_bucket(cluster.length))
+        self._by_key.setdefault(key, []).append(cluster)
+        self._exact[key + (cluster.simhash,)] = cluster
+
+    def _find(self, status, length, digest):
+        bucket = length_bucket(length)
+        cluster = self._exact.get((status, bucket, digest))
+        if cluster is not None:
+            return cluster
+        # Tranches voisines : une taille à la frontière ne doit pas créer un groupe à part
+        for key in ((status, bucket), (status, bucket - 1), (status, bucket + 1)):
+            for cluster in reversed(self._by_key.get(key, [])[-MAX_SCAN:]):
+                if (cluster.simhash ^ digest).bit_count() <= self.distance:
+                    return cluster
+        return None
+
+    def assign(self, index, payload, status, length, digest, body):
+        """Groupe de la réponse (créé si besoin, avec son corps comme représentant) ; renvoie l'empreinte"""
+        with self._lock:
+            cluster = self._find(status, length, digest)
+            if cluster is None:
+                cluster = Cluster(
+                    fingerprint_of(status, length, digest), status, length, digest,
+                    index=index, payload=payload, sample=body[:self.sample_bytes]
+                )
+                self._add(cluster)
+                self._new.append(cluster)
+            return cluster.fingerprint
+
+    def load(self, clusters):
+        """Reprise : groupes déjà en base [(empreinte, status, taille, simhash hexa), ...]"""
+        with self._lock:
+            for fingerprint, status, length, digest in clusters:
+                self._add(Cluster(fingerprint, status, length, int(digest, 16)))
+
+    def drain(self):
+        """Groupes créés depuis le dernier appel"""
+        with self._lock:
+            new, self._new = self._new, []
+        return new
@@ -0,0 +1,71 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from intruder.benchmark import SCENARIOS, run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Banc d'essai hors ligne : attaque une cible vulnérable locale avec un jeu "
+        "fixe de scénarios et mesure payloads/s, latence p99, CPU, pic de RSS et "
+        "précision/rappel des détections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenario", action="append", choices=SCENARIOS, dest="scenarios",
+                            help="Scénario à lancer (répétable, défaut : tous)")
+        parser.add_argument("--payloads", type=int, default=2000, help="Payloads par scénario")
+        parser.add_argument("--workers", type=int, default=0, help="0 = INTRUDER_WORKERS")
+        parser.add_argument("--latency-ms", type=float, default=20.0, help="Latence médiane de la cible")
+        parser.add_argument("--jitter", type=float, default=0.5, help="Écart-type log-normal de la latence")
+        parser.add_argument("--sqli-ratio", type=float, default=0.05)
+        parser.add_argument("--xss-ratio", type=float, default=0.05)
+        parser.add_argument("--sleep-ratio", type=float, default=0.05, help="Payloads SLEEP (scénario timing_get)")
+        parser.add_argument("--noise-ratio", type=float, default=0.01,
+                            help="Pages neutres affichant un bandeau « Warning » (faux positifs)")
+        parser.add_argument("--sleep-s", type=float, default=1.0, help="Pause déclenchée par SLEEP")
+        parser.add_argument("--body-kb", type=int, default=16, help="Taille des pages de la cible")
+        parser.add_argument("--timeout", type=float, default=0, help="0 = INTRUDER_TIMEOUT")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep", action="store_true", help="Garder les attaques en base")
+        parser.add_argument("--json", action="store_true", help="Sortie JSON uniquement")
+
+    def handle(self, *args, **options):
+        if options["payloads"] < 1:
+            raise CommandError("--payloads doit être >= 1")
+        bench_options = {
+            key: options[key] for key in (
+                "payloads", "latency_ms", "jitter", "sqli_ratio", "xss_ratio", "sleep_ratio",
+                "noise_ratio", "sleep_s", "body_kb", "seed", "keep",
+            )
+        }
+        bench_options["scenarios"] = options["scenarios"] or list(SCENARIOS)
+        bench_options["workers"] = options["workers"] or getattr(settings, "INTRUDER_WORKERS", 10)
+        bench_options["timeout"] = options["timeout"] or getattr(settings, "INTRUDER_TIMEOUT", 5)
+        if not options["json"]:
+            self.stdout.write(
+                f"🔄 {len(bench_options['scenarios'])} scénario(s), {options['payloads']} payloads, "
+                f"{bench_options['workers']} workers..."
+            )
+
+        report = run_benchmark(bench_options)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report))
+            return
+
+        for scenario in report["scenarios"]:
+            latency = scenario["latency_ms"]
+            detection = scenario["detection"]
+            self.stdout.write(f"   {scenario['name']} ({scenario['status']}, {scenario['done']}/{scenario['requests']} requêtes)")
+            self.stdout.write(f"      Débit          : {scenario['payloads_per_s']} payloads/s en {scenario['wall_s']}s")
+            self.stdout.write(f"      Latence        : p50 {latency['p50']} ms, p99 {latency['p99']} ms")
+            self.stdout.write(f"      CPU            : {scenario['cpu_s']}s ({scenario['cpu_percent']} %, "
+                              f"{scenario['cpu_ms_per_payload']} ms/payload)")
+            self.stdout.write(f"      Détections     : précision {detection['precision']}, rappel {detection['recall']} "
+                              f"(VP {detection['tp']}, FP {detection['fp']}, FN {detection['fn']})")
+            self.stdout.write(f"      Groupes        : {scenario['clusters']}")
+        self.stdout.write(f"   Pic RSS         : {report['peak_rss_mb']} Mo")
+        self.stdout.write(self.style.SUCCESS("✅ Banc d'essai terminé"))
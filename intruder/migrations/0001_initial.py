@@ -0,0 +1,65 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IntruderRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('done', 'Terminée'), ('stopped', 'Arrêtée'), ('error', 'Erreur')], default='pending', max_length=10)),
+                ('mode', models.CharField(max_length=20)),
+                ('target_url', models.CharField(max_length=2048)),
+                ('config', models.JSONField(default=dict, help_text="Formulaire d'origine, relu à la reprise")),
+                ('total', models.BigIntegerField(default=0)),
+                ('done', models.BigIntegerField(default=0)),
+                ('vulnerable', models.BigIntegerField(default=0)),
+                ('cursor', models.BigIntegerField(default=-1, help_text="Dernier index de payload traité, tous les précédents l'étant aussi")),
+                ('baseline', models.JSONField(blank=True, null=True)),
+                ('anomalies', models.JSONField(default=list)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Attaque intruder',
+                'verbose_name_plural': 'Attaques intruder',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='IntruderResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.BigIntegerField()),
+                ('payload', models.TextField()),
+                ('position', models.CharField(blank=True, default='', max_length=500)),
+                ('status', models.IntegerField(blank=True, null=True)),
+                ('length', models.BigIntegerField(default=0)),
+                ('words', models.IntegerField(default=0)),
+                ('time', models.FloatField(default=0.0)),
+                ('hash', models.CharField(blank=True, default='', max_length=16)),
+                ('vulnerable', models.BooleanField(default=False)),
+                ('risk', models.CharField(choices=[('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High')], default='Low', max_length=10)),
+                ('matches', models.JSONField(default=list)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='intruder.intruderrun')),
+            ],
+            options={
+                'verbose_name': 'Résultat intruder',
+                'verbose_name_plural': 'Résultats intruder',
+                'ordering': ['run', 'index'],
+                'indexes': [models.Index(fields=['run', 'status', 'index'], name='intruder_in_run_id_b4d0d0_idx'), models.Index(fields=['run', 'length'], name='intruder_in_run_id_2ef2b2_idx'), models.Index(fields=['run', 'vulnerable', 'index'], name='intruder_in_run_id_4b7968_idx')],
+                'constraints': [models.UniqueConstraint(fields=('run', 'index'), name='intruder_result_run_index')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intruder', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='intruderrun',
+            name='timing',
+            field=models.JSONField(default=list, help_text='Retards confirmés par rejeu (injections temporelles)'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intruder', '0002_intruderrun_timing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IntruderCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('status', models.IntegerField(blank=True, null=True)),
+                ('length', models.BigIntegerField(default=0, help_text='Taille du représentant, payloads réfléchis retirés')),
+                ('simhash', models.CharField(max_length=16)),
+                ('count', models.BigIntegerField(default=0)),
+                ('first_index', models.BigIntegerField(help_text='Payload dont la réponse sert de représentant')),
+                ('payload', models.TextField()),
+                ('body', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'verbose_name': 'Groupe de réponses intruder',
+                'verbose_name_plural': 'Groupes de réponses intruder',
+                'ordering': ['run', '-count'],
+            },
+        ),
+        migrations.AddField(
+            model_name='intruderresult',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', help_text='Groupe de réponses similaires (IntruderCluster)', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='intruderresult',
+            index=models.Index(fields=['run', 'fingerprint', 'index'], name='intruder_in_run_id_1833ad_idx'),
+        ),
+        migrations.AddField(
+            model_name='intrudercluster',
+            name='run',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clusters', to='intruder.intruderrun'),
+        ),
+        migrations.AddIndex(
+            model_name='intrudercluster',
+            index=models.Index(fields=['run', 'count'], name='intruder_in_run_id_f3fdd3_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='intrudercluster',
+            constraint=models.UniqueConstraint(fields=('run', 'fingerprint'), name='intruder_cluster_run_fingerprint'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intruder', '0003_intrudercluster'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='intruderrun',
+            name='heartbeat',
+            field=models.DateTimeField(blank=True, help_text="Dernier signe de vie du processus qui exécute l'attaque", null=True),
+        ),
+    ]
@@ -1,3 +1,112 @@
 from django.db import models
 
-# Create your models here.
+
+class IntruderRun(models.Model):
+    """
+    Attaque intruder persistée : configuration complète (pour la reprise),
+    progression et curseur du dernier payload traité sans trou. Le
+    processus qui exécute l'attaque rafraîchit `heartbeat` : une attaque
+    « running » dont le heartbeat est ancien a été interrompue.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'En attente'),
+        ('running', 'En cours'),
+        ('done', 'Terminée'),
+        ('stopped', 'Arrêtée'),
+        ('error', 'Erreur'),
+    ]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    mode = models.CharField(max_length=20)
+    target_url = models.CharField(max_length=2048)
+    config = models.JSONField(default=dict, help_text="Formulaire d'origine, relu à la reprise")
+    total = models.BigIntegerField(default=0)
+    done = models.BigIntegerField(default=0)
+    vulnerable = models.BigIntegerField(default=0)
+    cursor = models.BigIntegerField(default=-1, help_text="Dernier index de payload traité, tous les précédents l'étant aussi")
+    baseline = models.JSONField(blank=True, null=True)
+    anomalies = models.JSONField(default=list)
+    timing = models.JSONField(default=list, help_text="Retards confirmés par rejeu (injections temporelles)")
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    heartbeat = models.DateTimeField(blank=True, null=True, help_text="Dernier signe de vie du processus qui exécute l'attaque")
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Attaque intruder"
+        verbose_name_plural = "Attaques intruder"
+
+    def __str__(self):
+        return f"#{self.pk} {self.mode} {self.target_url} ({self.status})"
+
+
+class IntruderResult(models.Model):
+    """Réponse à une requête d'une attaque (status null : erreur réseau)"""
+    RISK_CHOICES = [
+        ('Low', 'Low'),
+        ('Medium', 'Medium'),
+        ('High', 'High'),
+    ]
+
+    run = models.ForeignKey(IntruderRun, on_delete=models.CASCADE, related_name='results')
+    index = models.BigIntegerField()
+    payload = models.TextField()
+    position = models.CharField(max_length=500, blank=True, default='')
+    status = models.IntegerField(blank=True, null=True)
+    length = models.BigIntegerField(default=0)
+    words = models.IntegerField(default=0)
+    time = models.FloatField(default=0.0)
+    hash = models.CharField(max_length=16, blank=True, default='')
+    vulnerable = models.BooleanField(default=False)
+    risk = models.CharField(max_length=10, choices=RISK_CHOICES, default='Low')
+    matches = models.JSONField(default=list)
+    fingerprint = models.CharField(max_length=64, blank=True, default='', help_text="Groupe de réponses similaires (IntruderCluster)")
+
+    class Meta:
+        ordering = ['run', 'index']
+        constraints = [
+            models.UniqueConstraint(fields=['run', 'index'], name='intruder_result_run_index'),
+        ]
+        indexes = [
+            models.Index(fields=['run', 'status', 'index']),
+            models.Index(fields=['run', 'length']),
+            models.Index(fields=['run', 'vulnerable', 'index']),
+            models.Index(fields=['run', 'fingerprint', 'index']),
+        ]
+        verbose_name = "Résultat intruder"
+        verbose_name_plural = "Résultats intruder"
+
+    def __str__(self):
+        return f"#{self.run_id}[{self.index}] {self.payload} → {self.status}"
+
+
+class IntruderCluster(models.Model):
+    """
+    Groupe de réponses quasi identiques (même code, taille voisine, simhash
+    proche) : un seul corps représentatif gardé, et le nombre de réponses
+    """
+    run = models.ForeignKey(IntruderRun, on_delete=models.CASCADE, related_name='clusters')
+    fingerprint = models.CharField(max_length=64)
+    status = models.IntegerField(blank=True, null=True)
+    length = models.BigIntegerField(default=0, help_text="Taille du représentant, payloads réfléchis retirés")
+    simhash = models.CharField(max_length=16)
+    count = models.BigIntegerField(default=0)
+    first_index = models.BigIntegerField(help_text="Payload dont la réponse sert de représentant")
+    payload = models.TextField()
+    body = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['run', '-count']
+        constraints = [
+            models.UniqueConstraint(fields=['run', 'fingerprint'], name='intruder_cluster_run_fingerprint'),
+        ]
+        indexes = [
+            models.Index(fields=['run', 'count']),
+        ]
+        verbose_name = "Groupe de réponses intruder"
+        verbose_name_plural = "Groupes de réponses intruder"
+
+    def __str__(self):
+        return f"#{self.run_id} {self.fingerprint} ×{self.count}"
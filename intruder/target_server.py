@@ -0,0 +1,124 @@
+"""
+Cible vulnérable locale pour le banc d'essai de l'intruder.
+
+Module volontairement indépendant de Django : il est lancé dans un processus
+séparé pour que ses threads ne faussent ni le CPU ni la RSS mesurés.
+
+Chaque valeur reçue (query string ou formulaire) est classée par
+classify() : la même fonction sert de vérité terrain au banc d'essai.
+  - SQLI  : apostrophe ou guillemet → erreur SQL dans la page (HTTP 500)
+  - XSS   : chevron → valeur renvoyée telle quelle dans la page
+  - SLEEP : SLEEP(...) → réponse retardée de `sleep_s` secondes
+  - sinon : page neutre, sans réflexion ; une petite part (noise_ratio)
+    affiche un bandeau « Warning » sans rapport avec le payload (faux positif attendu)
+"""
+import random
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SQLI = "sqli"
+XSS = "xss"
+SLEEP = "sleep"
+BENIGN = "benign"
+
+FILLER = b"<div class='filler'>lorem ipsum dolor sit amet</div>\n"
+
+
+def classify(value):
+    """Comportement déclenché par une valeur (vérité terrain)"""
+    if "SLEEP(" in value.upper():
+        return SLEEP
+    if "'" in value or '"' in value:
+        return SQLI
+    if "<" in value:
+        return XSS
+    return BENIGN
+
+
+def is_noise(value, ratio):
+    """Bandeau parasite, déterministe pour une valeur donnée"""
+    return zlib.crc32(value.encode("utf-8")) % 10000 < ratio * 10000
+
+
+def filler(size):
+    return (FILLER * (size // len(FILLER) + 1))[:size]
+
+
+class TargetHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    options = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _values(self):
+        values = []
+        for params in (parse_qs(urlparse(self.path).query), self._form()):
+            for items in params.values():
+                values.extend(items)
+        return values
+
+    def _form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return parse_qs(self.rfile.read(length).decode("utf-8", errors="replace"))
+
+    def _respond(self):
+        options = self.options
+        values = self._values()
+        kinds = {classify(value) for value in values}
+
+        time.sleep(options["latency_ms"] / 1000 * random.lognormvariate(0, options["jitter"]))
+        if SLEEP in kinds:
+            time.sleep(options["sleep_s"])
+
+        status = 200
+        parts = [b"<html><body><h1>Recherche</h1>"]
+        if SQLI in kinds:
+            status = 500
+            parts.append(b"<p>You have an error in your SQL syntax; check the manual for the right syntax</p>")
+        elif XSS in kinds:
+            for value in values:
+                if classify(value) == XSS:
+                    parts.append(b"<p>R\xc3\xa9sultats pour " + value.encode("utf-8") + b"</p>")
+        else:
+            parts.append(b"<p>Aucun r\xc3\xa9sultat</p>")
+            if any(is_noise(value, options["noise_ratio"]) for value in values):
+                parts.append(b"<p class='banner'>Warning: cache stale</p>")
+        # Jeton variable : les pages neutres ne sont jamais identiques octet pour octet
+        parts.append(f"<input type='hidden' name='csrf' value='{random.getrandbits(64):016x}'>".encode())
+        parts.append(filler(options["body_kb"] * 1024))
+        parts.append(b"</body></html>")
+        body = b"".join(parts)
+
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Timeout côté intruder
+            pass
+
+    do_GET = _respond
+    do_POST = _respond
+
+
+class TargetServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+def serve(options, port_queue):
+    """Point d'entrée du processus serveur"""
+    TargetHandler.options = options
+    server = TargetServer(("127.0.0.1", 0), TargetHandler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
@@ -1,3 +1,187 @@
-from django.test import TestCase
+import math
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import requests
+from django.test import SimpleTestCase
+
+from .anomaly import DTYPE, find_anomalies
+from .attacks import (BATTERING_RAM, CLUSTER_BOMB, PITCHFORK, SNIPER, Attack, AttackError, InsertionPoint,
+                      RequestTemplate)
+from .detectors import HIGH, LOW, MEDIUM, DEFAULT_RULES, REFLECTION, DetectorPipeline, Rule, parse_rules
+from .engine import send_payload
+from .timing import candidates, mann_whitney_greater, schedule, verdict
+
+
+class DetectorPipelineTests(SimpleTestCase):
+    def test_reports_every_matching_rule(self):
+        pipeline = DetectorPipeline(DEFAULT_RULES)
+        vulnerable, risk, names = pipeline.analyze([], 500, b"You have an error in your SQL SYNTAX (MySQL)")
+        self.assertTrue(vulnerable)
+        self.assertEqual(risk, HIGH)
+        self.assertEqual(names, ["sql:sql syntax", "sql:mysql"])
+
+    def test_overlapping_matches_are_all_reported(self):
+        # « syntax error » chevauche « sql syntax » : les deux règles sont rapportées
+        pipeline = DetectorPipeline([Rule("a", "sql syntax", LOW), Rule("b", "syntax error", HIGH)])
+        _, risk, names = pipeline.analyze([], 200, b"...sql syntax error...")
+        self.assertEqual(names, ["a", "b"])
+        self.assertEqual(risk, HIGH)
+
+    def test_regex_rules_and_rule_order(self):
+        pipeline = DetectorPipeline(parse_rules("High|re:ora-\\d{5}\nLow|denied"))
+        _, risk, names = pipeline.analyze([], 200, b"Access DENIED: ORA-00933")
+        self.assertEqual(names, ["custom:1", "custom:2"])
+        self.assertEqual(risk, HIGH)
+
+    def test_rules_sharing_a_prefix_or_position(self):
+        # « sql » et « sql syntax » commencent au même octet ; la regex chevauche les deux
+        rules = [Rule("long", "sql syntax"), Rule("short", "SQL"), Rule("re", r"ql\s+syn", LOW, regex=True)]
+        pipeline = DetectorPipeline(rules)
+        _, _, names = pipeline.analyze([], 200, b"<b>SQL Syntax</b>")
+        self.assertEqual(names, ["long", "short", "re"])
+
+    def test_regex_with_groups_is_searched_apart(self):
+        pipeline = DetectorPipeline(parse_rules("re:(?P<q>['\"]).*(?P=q)\nmysql"))
+        _, _, names = pipeline.analyze([], 200, b"MySQL said: 'x'")
+        self.assertEqual(names, ["custom:1", "custom:2"])
+        self.assertEqual(pipeline.matches(b"no quote here"), [])
+
+    def test_many_literal_rules(self):
+        rules = [Rule(f"r{i}", f"marker{i:03d}x") for i in range(300)]
+        pipeline = DetectorPipeline(rules)
+        found = pipeline.matches(b"... MARKER042X ... marker299x ... marker04 ...")
+        self.assertEqual([rule.name for rule in found], ["r42", "r299"])
+
+    def test_body_is_capped(self):
+        pipeline = DetectorPipeline(DEFAULT_RULES, reflection=False, max_bytes=10)
+        self.assertEqual(pipeline.analyze([], 200, b"x" * 20 + b"mysql"), (False, LOW, []))
+
+    def test_reflection_is_case_insensitive(self):
+        pipeline = DetectorPipeline([])
+        self.assertEqual(pipeline.analyze(["<Script>"], 200, b"<p><script></p>"), (True, MEDIUM, [REFLECTION]))
+
+
+class AttackModeTests(SimpleTestCase):
+    def setUp(self):
+        self.a = InsertionPoint("query", "a")
+        self.b = InsertionPoint("body", "b")
+
+    def expand(self, attack):
+        return [[(str(point), payload) for point, payload in values] for values in attack]
+
+    def test_sniper_each_point_in_turn(self):
+        attack = Attack(SNIPER, [self.a, self.b], [["1", "2"]])
+        self.assertEqual(len(attack), 4)
+        self.assertEqual(self.expand(attack), [
+            [("query:a", "1")], [("query:a", "2")], [("body:b", "1")], [("body:b", "2")],
+        ])
+
+    def test_battering_ram_same_payload_everywhere(self):
+        attack = Attack(BATTERING_RAM, [self.a, self.b], [["1", "2"]])
+        self.assertEqual(len(attack), 2)
+        self.assertEqual(self.expand(attack), [
+            [("query:a", "1"), ("body:b", "1")], [("query:a", "2"), ("body:b", "2")],
+        ])
+
+    def test_pitchfork_stops_at_shortest_list(self):
+        attack = Attack(PITCHFORK, [self.a, self.b], [["1", "2", "3"], ["x", "y"]])
+        self.assertEqual(len(attack), 2)
+        self.assertEqual(self.expand(attack), [
+            [("query:a", "1"), ("body:b", "x")], [("query:a", "2"), ("body:b", "y")],
+        ])
+
+    def test_cluster_bomb_all_combinations(self):
+        attack = Attack(CLUSTER_BOMB, [self.a, self.b], [["1", "2"], ["x", "y", "z"]])
+        self.assertEqual(len(attack), 6)
+        expanded = self.expand(attack)
+        self.assertEqual(len(expanded), 6)
+        self.assertEqual(expanded[0], [("query:a", "1"), ("body:b", "x")])
+        self.assertEqual(expanded[-1], [("query:a", "2"), ("body:b", "z")])
+        self.assertEqual(len({tuple(values) for values in expanded}), 6)
+
+    def test_attack_can_be_iterated_twice(self):
+        attack = Attack(CLUSTER_BOMB, [self.a, self.b], [["1"], ["x", "y"]])
+        self.assertEqual(self.expand(attack), self.expand(attack))
+
+    def test_one_list_per_point_required(self):
+        with self.assertRaises(AttackError):
+            Attack(PITCHFORK, [self.a, self.b], [["1"]])
+
+
+class TimingTests(SimpleTestCase):
+    def test_exact_p_value_for_separated_samples(self):
+        # Un seul rangement sur C(10, 5) place les cinq rejeux après les cinq baselines
+        self.assertAlmostEqual(mann_whitney_greater([5, 6, 7, 8, 9], [0, 1, 2, 3, 4]), 1 / math.comb(10, 5))
+        self.assertAlmostEqual(mann_whitney_greater([0, 1, 2, 3, 4], [5, 6, 7, 8, 9]), 1.0)
+
+    def test_identical_samples_are_not_significant(self):
+        self.assertGreater(mann_whitney_greater([1.0] * 5, [1.0] * 5), 0.4)
+        self.assertEqual(mann_whitney_greater([], [1.0]), 1.0)
+
+    def test_verdict_needs_significance_and_minimal_delay(self):
+        reference = [0.10, 0.12, 0.11, 0.09, 0.10]
+        finding = verdict([5.1, 5.0, 5.2, 5.05, 5.1], reference, min_delay=1.0, alpha=0.01)
+        self.assertIsNotNone(finding)
+        self.assertAlmostEqual(finding["delay"], 5.0, places=1)
+        # Significatif mais trop court
+        self.assertIsNone(verdict([0.2, 0.21, 0.22, 0.2, 0.21], reference, min_delay=1.0, alpha=0.01))
+        # Un seul échantillon lent : gigue, pas d'injection
+        self.assertIsNone(verdict([5.0, 0.1, 0.1, 0.12, 0.09], reference, min_delay=1.0, alpha=0.01))
+        self.assertIsNone(verdict([5.0], reference, min_delay=1.0, alpha=0.01))
+
+    def test_schedule_pairs_each_candidate_with_a_baseline(self):
+        self.assertEqual(schedule([3, 7], 2), [None, 3, None, 7, 3, None, 7, None])
+
+    def test_candidates_slowest_first(self):
+        responses = np.array([(0, 200, 10, 1, 0.1, 0), (1, 200, 10, 1, 3.0, 0), (2, 200, 10, 1, 0.2, 0),
+                              (3, 0, 0, 0, 5.0, 0)], dtype=DTYPE)
+        baseline = np.array([(-1, 200, 10, 1, 0.1, 0)] * 3, dtype=DTYPE)
+        self.assertEqual(candidates(responses, baseline, min_delay=1.0), [3, 1])
+        self.assertEqual(candidates(responses, baseline, min_delay=1.0, limit=1), [3])
+        self.assertEqual(candidates(responses[:0], baseline, min_delay=1.0), [])
+
+
+class HeaderPayloadTests(SimpleTestCase):
+    def setUp(self):
+        self.point = InsertionPoint("header", "X-Test")
+        self.template = RequestTemplate("GET", "http://target.test/", points=[self.point])
+
+    def test_non_latin1_header_sent_as_utf8(self):
+        self.assertEqual(self.template.build([(self.point, "é'")])["headers"], {"X-Test": "é'"})
+        self.assertEqual(self.template.build([(self.point, "𝓧'")])["headers"], {"X-Test": "𝓧'".encode("utf-8")})
+
+    def test_unsendable_payload_is_an_error_row(self):
+        session = mock.Mock(spec=requests.Session)
+        session.request.side_effect = UnicodeEncodeError("latin-1", "привет", 0, 1, "ordinal not in range")
+        row = send_payload(session, self.template, [(self.point, "привет")], 5, DetectorPipeline(DEFAULT_RULES))
+        self.assertEqual(row["status"], "Error")
+        self.assertEqual(row["payload"], "привет")
+        self.assertEqual(row["position"], "header:X-Test")
+
+
+class AnomalyTests(SimpleTestCase):
+    def features(self, lengths):
+        responses = np.zeros(len(lengths), dtype=DTYPE)
+        responses["index"] = np.arange(len(lengths))
+        responses["status"] = 200
+        responses["length"] = lengths
+        responses["words"] = 100
+        responses["time"] = 0.1
+        return responses
+
+    def test_rare_length_group_is_flagged_below_z_threshold(self):
+        # 5150 octets : z = 3 (< LENGTH_Z) mais seule réponse de sa tranche de 2 %
+        responses = self.features([5000 + i % 10 for i in range(300)] + [5150])
+        for baseline in (self.features([5000, 5004, 5008]), self.features([])):
+            with self.subTest(baseline=baseline.size):
+                self.assertEqual(find_anomalies(responses, baseline), [(300, 1.0, ["taille (groupe rare)"])])
+
+    def test_rare_group_seen_in_baseline_or_small_attack_is_ignored(self):
+        responses = self.features([5000 + i % 10 for i in range(300)] + [5150])
+        self.assertEqual(find_anomalies(responses, self.features([5000, 5150, 5150, 5004])), [])
+        self.assertEqual(find_anomalies(responses[-50:], self.features([])), [])
+
+    def test_dispersed_lengths_are_not_rare_groups(self):
+        responses = self.features(list(range(1000, 31000, 100)))
+        self.assertEqual(find_anomalies(responses, self.features([])), [])
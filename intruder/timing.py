@@ -0,0 +1,109 @@
+"""
+Confirmation statistique des injections temporelles (SLEEP, WAITFOR...).
+
+Un temps de réponse mesuré une fois ne prouve rien : la gigue réseau suffit
+à produire des pics. Les payloads dont le premier temps est suspect sont
+rejoués plusieurs fois, entrelacés avec des requêtes baseline (valeur
+neutre) : chaque paire baseline/candidat est envoyée dans les mêmes
+conditions de charge, l'ordre alterne d'un tour à l'autre et la
+concurrence reste faible pour ne pas ralentir la cible elle-même.
+
+Un payload est retenu si ses temps sont significativement plus longs que
+ceux de la baseline (test de Mann-Whitney unilatéral, loi exacte pour les
+petits échantillons) ET si le retard médian dépasse un délai minimal :
+la significativité seule signalerait des écarts de quelques millisecondes.
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+# Au plus ce nombre de payloads rejoués par attaque (les plus lents d'abord)
+MAX_CANDIDATES = 20
+# Échantillons plus grands : approximation normale au lieu de la loi exacte
+EXACT_LIMIT = 30
+
+
+@lru_cache(maxsize=None)
+def _u_counts(n1, n2):
+    """Nombre de rangements donnant chaque valeur de U (loi exacte de Mann-Whitney)"""
+    if n1 == 0 or n2 == 0:
+        return (1,)
+    # Le plus grand élément vient du premier échantillon (+n2 à U) ou du second
+    with_first = _u_counts(n1 - 1, n2)
+    with_second = _u_counts(n1, n2 - 1)
+    counts = [0] * (n1 * n2 + 1)
+    for u, count in enumerate(with_first):
+        counts[u + n2] += count
+    for u, count in enumerate(with_second):
+        counts[u] += count
+    return tuple(counts)
+
+
+def mann_whitney_greater(samples, reference):
+    """p-value unilatérale : les `samples` sont-ils plus grands que la `reference` ?"""
+    samples = np.asarray(samples, dtype=np.float64)
+    reference = np.asarray(reference, dtype=np.float64)
+    n1, n2 = samples.size, reference.size
+    if n1 == 0 or n2 == 0:
+        return 1.0
+
+    # U = paires (échantillon, référence) où l'échantillon est plus grand, égalités à 1/2
+    greater = (samples[:, None] > reference[None, :]).sum()
+    ties = (samples[:, None] == reference[None, :]).sum()
+    u = greater + ties / 2
+
+    if not ties and n1 + n2 <= EXACT_LIMIT:
+        counts = _u_counts(n1, n2)
+        return sum(counts[math.ceil(u):]) / math.comb(n1 + n2, n1)
+
+    # Approximation normale avec correction de continuité
+    mean = n1 * n2 / 2
+    sd = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    z = (u - mean - 0.5) / sd
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def candidates(responses, baseline, min_delay, limit=MAX_CANDIDATES):
+    """
+    Index des réponses dont le temps dépasse la médiane de référence d'au
+    moins `min_delay` secondes (les plus lentes d'abord). Les erreurs
+    (timeouts) comptent : une pause plus longue que le timeout en est une.
+    """
+    if responses.size == 0:
+        return []
+    reference = baseline if baseline.size else responses
+    threshold = float(np.median(reference["time"])) + min_delay
+    slow = np.flatnonzero(responses["time"] >= threshold)
+    slow = slow[np.argsort(-responses["time"][slow], kind="stable")][:limit]
+    return [int(index) for index in responses["index"][slow]]
+
+
+def schedule(indexes, repeats):
+    """
+    Ordre d'envoi des rejeux : [(index ou None pour la baseline), ...].
+    Chaque candidat est apparié à une baseline, l'ordre de la paire
+    alternant d'un tour à l'autre ; les candidats se succèdent dans chaque
+    tour pour étaler une éventuelle dérive de la cible sur tous.
+    """
+    order = []
+    for round_number in range(repeats):
+        for index in indexes:
+            pair = [None, index] if round_number % 2 == 0 else [index, None]
+            order.extend(pair)
+    return order
+
+
+def verdict(samples, reference, min_delay, alpha):
+    """Résultat du rejeu d'un payload : dict si le retard est confirmé, sinon None"""
+    if len(samples) < 2 or len(reference) < 2:
+        return None
+    delay = float(np.median(samples) - np.median(reference))
+    p_value = mann_whitney_greater(samples, reference)
+    if delay < min_delay or p_value >= alpha:
+        return None
+    return {
+        "delay": round(delay, 3),
+        "p_value": round(p_value, 5),
+        "samples": [round(float(t), 3) for t in samples],
+    }
@@ -1,6 +1,14 @@
 from django.urls import path
-from .views import intruder_view
+from .views import (
+    attack_cluster, attack_clusters, attack_results, attack_resume, attack_status, attack_stop, intruder_view
+)
 
 urlpatterns = [
     path('', intruder_view, name='intruder'),
-]
\ No newline at end of file
+    path('attack/<str:job_id>/', attack_status, name='intruder_attack_status'),
+    path('attack/<str:job_id>/stop/', attack_stop, name='intruder_attack_stop'),
+    path('attack/<str:job_id>/resume/', attack_resume, name='intruder_attack_resume'),
+    path('attack/<str:job_id>/results/', attack_results, name='intruder_attack_results'),
+    path('attack/<str:job_id>/clusters/', attack_clusters, name='intruder_attack_clusters'),
+    path('attack/<str:job_id>/clusters/<str:fingerprint>/', attack_cluster, name='intruder_attack_cluster'),
+]
@@ -1,101 +1,195 @@
-import requests
-import time
-from urllib.parse import urlparse
+from django.core.paginator import Paginator
 from django.shortcuts import render
+from django.http import JsonResponse
+from django.conf import settings
+
+from .attacks import AttackError
+from .config import config_from_request, int_param
+from .engine import attack_jobs, is_stale, run_snapshot, start_run
+from .models import IntruderCluster, IntruderResult, IntruderRun
+from .wordlists import server_wordlists
+
+# Taille de page par défaut / maximale des résultats
+RESULTS_PAGE_SIZE = 100
+RESULTS_MAX_PAGE_SIZE = 1000
 
 
 def intruder_view(request):
-    results = []
-    summary = {
-        "total": 0,
-        "vulnerable": 0
-    }
-
-    if request.method == "POST":
-
-        # Récupération sécurisée des données
-        target_url = request.POST.get("target_url", "").strip()
-        param_name = request.POST.get("param_name", "").strip()
-        payloads_raw = request.POST.get("payloads", "").strip()
-
-        # Vérification URL valide
-        parsed = urlparse(target_url)
-        if not parsed.scheme or not parsed.netloc:
-            return render(request, "intruder/intruder.html", {
-                "results": [],
-                "summary": summary,
-                "error": "URL invalide. Exemple: https://example.com"
-            })
-
-        # Transformation des payloads (un par ligne)
-        payloads = [p.strip() for p in payloads_raw.splitlines() if p.strip()]
-
-        summary["total"] = len(payloads)
-
-        for payload in payloads:
-            try:
-                start_time = time.time()
-
-                response = requests.get(
-                    target_url,
-                    params={param_name: payload},
-                    timeout=5
-                )
-
-                end_time = time.time()
-                response_time = round(end_time - start_time, 3)
-
-                content = response.text.lower()
-
-                # --- Détection simple SQL ---
-                sql_errors = [
-                    "sql syntax",
-                    "mysql",
-                    "warning",
-                    "unterminated",
-                    "odbc",
-                    "syntax error"
-                ]
-
-                # --- Détection simple XSS ---
-                xss_detected = payload.lower() in content
-
-                sql_detected = any(error in content for error in sql_errors)
-
-                vulnerable = False
-                risk = "Low"
-
-                if sql_detected:
-                    vulnerable = True
-                    risk = "High"
-
-                elif xss_detected:
-                    vulnerable = True
-                    risk = "Medium"
-
-                if vulnerable:
-                    summary["vulnerable"] += 1
-
-                results.append({
-                    "payload": payload,
-                    "status": response.status_code,
-                    "length": len(response.text),
-                    "time": response_time,
-                    "vulnerable": vulnerable,
-                    "risk": risk
-                })
-
-            except requests.exceptions.RequestException as e:
-                results.append({
-                    "payload": payload,
-                    "status": "Error",
-                    "length": 0,
-                    "time": 0,
-                    "vulnerable": False,
-                    "risk": "Low"
-                })
-
-    return render(request, "intruder/intruder.html", {
-        "results": results,
-        "summary": summary
-    })
\ No newline at end of file
+    """
+    GET : formulaire d'attaque et dernières attaques enregistrées.
+    POST : enregistre l'attaque, la lance en tâche de fond et renvoie son
+    identifiant ; la page suit ensuite la progression via attack_status.
+    """
+    if request.method != "POST":
+        return render(request, "intruder/intruder.html", {
+            "default_workers": getattr(settings, "INTRUDER_WORKERS", 10),
+            "max_workers": getattr(settings, "INTRUDER_MAX_WORKERS", 50),
+            "default_rps": getattr(settings, "INTRUDER_MAX_RPS", 0),
+            "wordlists": server_wordlists(),
+            "runs": IntruderRun.objects.all()[:20],
+        })
+
+    try:
+        config = config_from_request(request.POST, request.FILES)
+        # Validée par config_from_request : build() ne peut plus échouer ici
+        run = IntruderRun.objects.create(mode=config["mode"], target_url=config["target_url"], config=config)
+        job = start_run(run)
+    except AttackError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+
+    return JsonResponse({"success": True, "job_id": job.id, "mode": job.mode, "total": job.total}, status=202)
+
+
+def get_run(job_id):
+    try:
+        return IntruderRun.objects.get(pk=int(job_id))
+    except (ValueError, IntruderRun.DoesNotExist):
+        return None
+
+
+def attack_status(request, job_id):
+    """Progression de l'attaque (tâche en cours, ou état enregistré en base)"""
+    job = attack_jobs.get(job_id)
+    if job is not None:
+        return JsonResponse({"success": True, "job": job.snapshot()})
+    run = get_run(job_id)
+    if run is None:
+        return JsonResponse({"success": False, "error": "Attaque introuvable"}, status=404)
+    return JsonResponse({"success": True, "job": run_snapshot(run)})
+
+
+def attack_stop(request, job_id):
+    if request.method != "POST":
+        return JsonResponse({"success": False, "error": "POST requis"}, status=405)
+    job = attack_jobs.get(job_id)
+    if job is None:
+        return JsonResponse({"success": False, "error": "Attaque introuvable"}, status=404)
+    job.stop.set()
+    return JsonResponse({"success": True, "job": job.snapshot()})
+
+
+def attack_resume(request, job_id):
+    """Relance une attaque arrêtée ou interrompue (heartbeat trop ancien) à partir de son curseur"""
+    if request.method != "POST":
+        return JsonResponse({"success": False, "error": "POST requis"}, status=405)
+    run = get_run(job_id)
+    if run is None:
+        return JsonResponse({"success": False, "error": "Attaque introuvable"}, status=404)
+    if run.status == "done":
+        return JsonResponse({"success": False, "error": "Attaque déjà terminée"}, status=400)
+    if job_id not in attack_jobs and run.status in ("pending", "running") and not is_stale(run):
+        # La réclamation en base (claim_run) tranche de toute façon les courses entre processus
+        return JsonResponse({"success": False, "error": "Attaque en cours dans un autre processus"}, status=409)
+    try:
+        job = start_run(run)
+    except AttackError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+    return JsonResponse({"success": True, "job_id": job.id, "mode": job.mode, "total": job.total}, status=202)
+
+
+def attack_results(request, job_id):
+    """
+    Résultats enregistrés, page par page et dans l'ordre des payloads.
+    Filtres : ?status= (code HTTP ou "error"), ?min_length=, ?max_length=,
+    ?vulnerable=1, ?fingerprint= (un groupe) ; pagination : ?page=, ?page_size=.
+    """
+    run = get_run(job_id)
+    if run is None:
+        return JsonResponse({"success": False, "error": "Attaque introuvable"}, status=404)
+
+    results = IntruderResult.objects.filter(run=run)
+    status = request.GET.get("status", "").strip()
+    if status.lower() == "error":
+        results = results.filter(status__isnull=True)
+    elif status:
+        results = results.filter(status=int_param(status, 0))
+    if request.GET.get("min_length"):
+        results = results.filter(length__gte=int_param(request.GET["min_length"], 0))
+    if request.GET.get("max_length"):
+        results = results.filter(length__lte=int_param(request.GET["max_length"], 0))
+    if request.GET.get("vulnerable") in ("1", "on", "true"):
+        results = results.filter(vulnerable=True)
+    if request.GET.get("fingerprint"):
+        results = results.filter(fingerprint=request.GET["fingerprint"])
+
+    page_size = int_param(request.GET.get("page_size"), RESULTS_PAGE_SIZE, minimum=1, maximum=RESULTS_MAX_PAGE_SIZE)
+    page = Paginator(results.order_by("index"), page_size).get_page(request.GET.get("page"))
+    return JsonResponse({
+        "success": True,
+        "page": page.number,
+        "pages": page.paginator.num_pages,
+        "count": page.paginator.count,
+        "results": [
+            {
+                "index": result.index,
+                "payload": result.payload,
+                "position": result.position,
+                "status": result.status if result.status is not None else "Error",
+                "length": result.length,
+                "words": result.words,
+                "time": result.time,
+                "hash": result.hash or None,
+                "vulnerable": result.vulnerable,
+                "risk": result.risk,
+                "matches": result.matches,
+                "fingerprint": result.fingerprint,
+            }
+            for result in page.object_list
+        ]
+    })
+
+
+def attack_clusters(request, job_id):
+    """
+    Groupes de réponses similaires, les plus nombreux d'abord (sans les
+    corps). Filtres : ?status=, ?min_length=, ?max_length= ; pagination :
+    ?page=, ?page_size=.
+    """
+    run = get_run(job_id)
+    if run is None:
+        return JsonResponse({"success": False, "error": "Attaque introuvable"}, status=404)
+
+    clusters = IntruderCluster.objects.filter(run=run).defer("body")
+    status = request.GET.get("status", "").strip()
+    if status.lower() == "error":
+        clusters = clusters.filter(status__isnull=True)
+    elif status:
+        clusters = clusters.filter(status=int_param(status, 0))
+    if request.GET.get("min_length"):
+        clusters = clusters.filter(length__gte=int_param(request.GET["min_length"], 0))
+    if request.GET.get("max_length"):
+        clusters = clusters.filter(length__lte=int_param(request.GET["max_length"], 0))
+
+    page_size = int_param(request.GET.get("page_size"), RESULTS_PAGE_SIZE, minimum=1, maximum=RESULTS_MAX_PAGE_SIZE)
+    page = Paginator(clusters.order_by("-count", "first_index"), page_size).get_page(request.GET.get("page"))
+    return JsonResponse({
+        "success": True,
+        "page": page.number,
+        "pages": page.paginator.num_pages,
+        "count": page.paginator.count,
+        "clusters": [
+            {
+                "fingerprint": cluster.fingerprint,
+                "status": cluster.status if cluster.status is not None else "Error",
+                "length": cluster.length,
+                "count": cluster.count,
+                "index": cluster.first_index,
+                "payload": cluster.payload,
+            }
+            for cluster in page.object_list
+        ]
+    })
+
+
+def attack_cluster(request, job_id, fingerprint):
+    """Corps représentatif d'un groupe de réponses"""
+    cluster = IntruderCluster.objects.filter(run_id=int_param(job_id, 0), fingerprint=fingerprint).first()
+    if cluster is None:
+        return JsonResponse({"success": False, "error": "Groupe introuvable"}, status=404)
+    return JsonResponse({
+        "success": True,
+        "fingerprint": cluster.fingerprint,
+        "count": cluster.count,
+        "payload": cluster.payload,
+        "body": cluster.body
+    })
@@ -0,0 +1,173 @@
+"""
+Listes de payloads de l'intruder : saisie directe, fichier envoyé ou
+wordlist serveur (SecLists...) dans INTRUDER_WORDLIST_DIR.
+
+Les fichiers sont lus via mmap ligne par ligne : seule la ligne courante est
+en mémoire, quelle que soit la taille de la liste, et plusieurs parcours
+simultanés (cluster bomb) partagent les pages du cache système. Les
+transformations (casse, préfixe/suffixe, base64, URL-encode) sont appliquées
+à la volée, payload par payload.
+"""
+import base64
+import mmap
+import os
+import uuid
+from urllib.parse import quote
+
+from django.conf import settings
+
+WORDLIST_EXTENSIONS = (".txt", ".lst", ".dic")
+# Au-delà, la liste des wordlists serveur proposées est tronquée
+MAX_LISTED = 500
+
+
+def wordlist_dir():
+    return str(getattr(settings, "INTRUDER_WORDLIST_DIR", os.path.join(settings.BASE_DIR, "wordlists")))
+
+
+def decode_line(raw):
+    """Ligne brute → payload (UTF-8, ou Latin-1 pour les vieilles listes)"""
+    raw = raw.rstrip(b"\r\n")
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+class TextWordlist:
+    """Payloads saisis dans le formulaire (petite liste, gardée en mémoire)"""
+
+    def __init__(self, raw):
+        self.payloads = [p.strip() for p in raw.splitlines() if p.strip()]
+        self.name = "saisie"
+
+    def __iter__(self):
+        return iter(self.payloads)
+
+    def __len__(self):
+        return len(self.payloads)
+
+
+class FileWordlist:
+    """Wordlist sur disque, une entrée par ligne (lignes vides ignorées)"""
+
+    def __init__(self, path, name=None):
+        self.path = path
+        self.name = name or os.path.basename(path)
+        self._length = None
+
+    def _lines(self):
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for raw in iter(mm.readline, b""):
+                    if raw.strip():
+                        yield raw
+
+    def __iter__(self):
+        for raw in self._lines():
+            yield decode_line(raw)
+
+    def __len__(self):
+        # Compté une seule fois, sans décoder les lignes
+        if self._length is None:
+            self._length = sum(1 for _ in self._lines())
+        return self._length
+
+
+# --- transformations ---------------------------------------------------------
+
+def case_variants(payload):
+    """Variantes de casse distinctes : telle quelle, minuscules, MAJUSCULES, Capitalisée"""
+    seen = []
+    for variant in (payload, payload.lower(), payload.upper(), payload.capitalize()):
+        if variant not in seen:
+            seen.append(variant)
+    return seen
+
+
+class Transformed:
+    """
+    Applique les transformations à la volée, dans un ordre fixe :
+    casse → préfixe/suffixe → base64 → URL-encode.
+    `case` : "", "lower", "upper" ou "variants" (plusieurs payloads par entrée).
+    """
+
+    def __init__(self, wordlist, case="", prefix="", suffix="", b64=False, url_encode=False):
+        self.wordlist = wordlist
+        self.name = wordlist.name
+        self.case = case
+        self.prefix = prefix
+        self.suffix = suffix
+        self.b64 = b64
+        self.url_encode = url_encode
+        self._length = None
+
+    def _finish(self, payload):
+        payload = f"{self.prefix}{payload}{self.suffix}"
+        if self.b64:
+            payload = base64.b64encode(payload.encode("utf-8")).decode("ascii")
+        if self.url_encode:
+            payload = quote(payload, safe="")
+        return payload
+
+    def __iter__(self):
+        for payload in self.wordlist:
+            if self.case == "variants":
+                for variant in case_variants(payload):
+                    yield self._finish(variant)
+            elif self.case == "lower":
+                yield self._finish(payload.lower())
+            elif self.case == "upper":
+                yield self._finish(payload.upper())
+            else:
+                yield self._finish(payload)
+
+    def __len__(self):
+        if self.case != "variants":
+            return len(self.wordlist)
+        # Le nombre de variantes dépend de chaque entrée : un parcours suffit
+        if self._length is None:
+            self._length = sum(len(case_variants(payload)) for payload in self.wordlist)
+        return self._length
+
+
+# --- sources -----------------------------------------------------------------
+
+def server_wordlists():
+    """Wordlists disponibles sous INTRUDER_WORDLIST_DIR (chemins relatifs)"""
+    root = wordlist_dir()
+    found = []
+    for directory, subdirs, files in os.walk(root):
+        if directory == root and "uploads" in subdirs:
+            subdirs.remove("uploads")  # fichiers envoyés par les utilisateurs
+        for filename in sorted(files):
+            if filename.lower().endswith(WORDLIST_EXTENSIONS):
+                found.append(os.path.relpath(os.path.join(directory, filename), root))
+                if len(found) >= MAX_LISTED:
+                    return sorted(found)
+    return sorted(found)
+
+
+def open_server_wordlist(relative_path):
+    """Wordlist serveur ; None si le chemin sort du répertoire ou n'existe pas"""
+    root = os.path.realpath(wordlist_dir())
+    path = os.path.realpath(os.path.join(root, relative_path))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        return None
+    return FileWordlist(path, name=relative_path)
+
+
+def store_upload(upload):
+    """
+    Recopie un fichier envoyé par morceaux dans INTRUDER_WORDLIST_DIR/uploads
+    (jamais chargé entier en mémoire) et renvoie la wordlist correspondante
+    """
+    directory = os.path.join(wordlist_dir(), "uploads")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{uuid.uuid4().hex}.txt")
+    with open(path, "wb") as f:
+        for chunk in upload.chunks():
+            f.write(chunk)
+    return FileWordlist(path, name=upload.name)
@@ -1,3 +1,37 @@
 from django.contrib import admin
+from .models import ScanAlert, ScanReport, ScanSchedule, ZapScan
 
-# Register your models here.
+
+@admin.register(ZapScan)
+class ZapScanAdmin(admin.ModelAdmin):
+    list_display = ('id', 'target_url', 'priority', 'status', 'phase', 'spider_progress', 'ascan_progress', 'alert_count', 'created_at')
+    list_filter = ('status', 'phase', 'created_at')
+    search_fields = ('target_url',)
+    ordering = ('-created_at',)
+    readonly_fields = ('spider_id', 'ascan_id', 'created_at', 'updated_at', 'started_at', 'finished_at')
+
+
+@admin.register(ScanSchedule)
+class ScanScheduleAdmin(admin.ModelAdmin):
+    list_display = ('name', 'priority', 'scan_type', 'interval_minutes', 'enabled', 'next_run_at', 'last_run_at')
+    list_filter = ('enabled', 'scan_type')
+    search_fields = ('name', 'targets')
+    ordering = ('next_run_at',)
+    readonly_fields = ('last_run_at', 'created_at')
+
+
+@admin.register(ScanAlert)
+class ScanAlertAdmin(admin.ModelAdmin):
+    list_display = ('scan', 'risk', 'confidence', 'name', 'plugin_id', 'url', 'param')
+    list_filter = ('risk', 'confidence')
+    search_fields = ('name', 'plugin_id', 'url')
+    ordering = ('scan', '-risk', '-confidence')
+    raw_id_fields = ('scan',)
+
+
+@admin.register(ScanReport)
+class ScanReportAdmin(admin.ModelAdmin):
+    list_display = ('path', 'target_url', 'size', 'original_size', 'created_at')
+    search_fields = ('target_url', 'path', 'sha256')
+    ordering = ('-created_at',)
+    readonly_fields = ('scan', 'path', 'size', 'original_size', 'sha256', 'created_at')
@@ -0,0 +1,100 @@
+"""
+Import des alertes ZAP d'un scan dans ScanAlert.
+
+Les alertes sont lues page par page (start/count de core/view/alerts,
+ZAP_ALERTS_PAGE_SIZE par appel) et normalisées au fil de l'eau, hors
+transaction : les appels HTTP à ZAP ne bloquent jamais la base (SQLite, un
+seul écrivain). Seuls le remplacement de l'import précédent et les
+bulk_create tiennent dans une transaction courte : une erreur en cours de
+pagination laisse les alertes précédentes intactes, et les lecteurs ne
+voient jamais un import partiel. Seuls les champs propres à l'occurrence
+sont gardés (URL, paramètre, attaque, preuve tronquée) ; description et
+solution, identiques pour toutes les alertes d'un plugin, restent dans le
+rapport.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from .models import ScanAlert
+
+# Libellés ZAP → entiers du modèle
+RISK_LEVELS = {label: value for value, label in ScanAlert.RISK_CHOICES}
+CONFIDENCE_LEVELS = {label: value for value, label in ScanAlert.CONFIDENCE_CHOICES}
+
+# Compteur du ZapScan par niveau de risque
+RISK_FIELDS = {
+    3: 'high_count',
+    2: 'medium_count',
+    1: 'low_count',
+    0: 'info_count',
+}
+
+# Taille maximale des champs texte libres (attaque, preuve)
+TEXT_LIMIT = 2000
+
+
+def int_or_none(value):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 0 else None
+
+
+def level(alert, name, code_key, levels, default):
+    """Niveau entier : code numérique s'il est fourni (rapports), sinon libellé de l'API"""
+    code = int_or_none(alert.get(code_key))
+    if code is not None:
+        return code
+    return levels.get(alert.get(name), default)
+
+
+def normalize_alert(scan_id, alert):
+    """ScanAlert (non enregistrée) à partir d'une alerte JSON de ZAP"""
+    return ScanAlert(
+        scan_id=scan_id,
+        zap_id=str(alert.get('id', ''))[:20],
+        plugin_id=str(alert.get('pluginId', ''))[:20],
+        alert_ref=str(alert.get('alertRef', ''))[:30],
+        name=(alert.get('alert') or alert.get('name') or '')[:255],
+        risk=level(alert, 'risk', 'riskcode', RISK_LEVELS, 0),
+        confidence=level(alert, 'confidence', 'confidencecode', CONFIDENCE_LEVELS, 2),
+        url=(alert.get('url') or '')[:2048],
+        param=(alert.get('param') or '')[:500],
+        method=(alert.get('method') or '')[:10],
+        cwe_id=int_or_none(alert.get('cweid')),
+        wasc_id=int_or_none(alert.get('wascid')),
+        attack=(alert.get('attack') or '')[:TEXT_LIMIT],
+        evidence=(alert.get('evidence') or '')[:TEXT_LIMIT],
+    )
+
+
+def ingest_alerts(client, scan_id, baseurl, page_size=None, min_risk=0, on_page=None):
+    """
+    Importe les alertes de `baseurl` de risque au moins `min_risk` pour le
+    scan (celles d'un import précédent sont remplacées). `on_page(alertes
+    lues)` est appelé après chaque page. Renvoie les compteurs du ZapScan :
+    alert_count, high_count, medium_count, low_count, info_count.
+    """
+    page_size = page_size or getattr(settings, 'ZAP_ALERTS_PAGE_SIZE', 500)
+    counts = {field: 0 for field in RISK_FIELDS.values()}
+    rows = []
+
+    start = 0
+    while True:
+        page = client.alerts(baseurl=baseurl, start=start, count=page_size)
+        rows.extend(row for row in (normalize_alert(scan_id, alert) for alert in page) if row.risk >= min_risk)
+        start += len(page)
+        if on_page is not None:
+            on_page(start)
+        if len(page) < page_size:
+            break
+
+    for row in rows:
+        counts[RISK_FIELDS.get(row.risk, 'info_count')] += 1
+
+    with transaction.atomic():
+        ScanAlert.objects.filter(scan_id=scan_id).delete()
+        ScanAlert.objects.bulk_create(rows, batch_size=page_size)
+
+    return {'alert_count': len(rows), **counts}
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from scanner.reports import prune_reports, reports_dir
+
+
+class Command(BaseCommand):
+    help = (
+        "Rétention des rapports ZAP : supprime les rapports plus vieux que la limite "
+        "d'âge, puis les plus anciens tant que le total dépasse la limite de taille. "
+        "À planifier (cron) par exemple une fois par jour."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-age-days", type=int, help="Défaut : ZAP_REPORT_MAX_AGE_DAYS (0 = illimité)")
+        parser.add_argument("--max-total-mb", type=int, help="Défaut : ZAP_REPORT_MAX_TOTAL_MB (0 = illimité)")
+        parser.add_argument("--dry-run", action="store_true", help="Afficher sans supprimer")
+
+    def handle(self, *args, **options):
+        reports, orphans, freed = prune_reports(
+            max_age_days=options["max_age_days"],
+            max_total_mb=options["max_total_mb"],
+            dry_run=options["dry_run"],
+        )
+        verb = "à supprimer" if options["dry_run"] else "supprimé(s)"
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {reports} rapport(s) indexé(s) et {orphans} fichier(s) hors index {verb} "
+            f"dans {reports_dir()} — {freed / 1024 / 1024:.1f} Mo"
+        ))
@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scanner.models import ZapScan
+from scanner.scheduler import enqueue, parse_targets, scheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Met en file une liste de cibles ZAP (une URL par ligne, suivie éventuellement "
+        "d'une priorité) et/ou fait tourner l'ordonnanceur : files et planifications."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("targets_file", nargs="?", help="Fichier texte, une cible par ligne")
+        parser.add_argument("--priority", type=int, default=0, help="Priorité par défaut des cibles")
+        parser.add_argument("--max-depth", type=int, default=5)
+        parser.add_argument("--scan-type", choices=[choice for choice, _ in ZapScan.SCAN_TYPE_CHOICES], default="both")
+        parser.add_argument("--wait", action="store_true", help="Exécuter la file jusqu'à ce qu'elle soit vide")
+        parser.add_argument("--forever", action="store_true",
+                            help="Faire tourner l'ordonnanceur en continu (planifications récurrentes)")
+
+    def handle(self, *args, **options):
+        if options["targets_file"]:
+            try:
+                with open(options["targets_file"], encoding="utf-8") as f:
+                    targets = parse_targets(f.read(), options["priority"])
+            except OSError as e:
+                raise CommandError(f"Lecture impossible : {e}")
+            except ValueError as e:
+                raise CommandError(str(e))
+            if not targets:
+                raise CommandError("Aucune cible dans le fichier")
+            created, skipped = enqueue(targets, max_depth=options["max_depth"], scan_type=options["scan_type"])
+            self.stdout.write(f"🔄 {len(created)} scan(s) en file, {skipped} doublon(s) ignoré(s)")
+        elif not (options["wait"] or options["forever"]):
+            raise CommandError("Indiquez un fichier de cibles, --wait ou --forever")
+
+        if not (options["wait"] or options["forever"]):
+            return
+
+        started = time.time()
+        try:
+            scheduler.loop(until_idle=not options["forever"])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING(
+                "Interrompu : les scans en cours seront marqués interrompus, relancez pour traiter la file"
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(f"✅ File traitée en {time.time() - started:.1f}s"))
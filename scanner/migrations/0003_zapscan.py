@@ -0,0 +1,49 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('scanner', '0002_delete_scanresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ZapScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_url', models.URLField(max_length=2048)),
+                ('max_depth', models.IntegerField(default=5)),
+                ('scan_type', models.CharField(choices=[('passive', 'Scan Passif'), ('active', 'Scan Actif'), ('both', 'Passif + Actif')], default='both', max_length=20)),
+                ('alert_level', models.CharField(default='MEDIUM', max_length=10)),
+                ('scan_policy', models.CharField(default='default', max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('done', 'Terminé'), ('error', 'Erreur')], default='pending', max_length=10)),
+                ('phase', models.CharField(choices=[('queued', 'En file'), ('spider', 'Spider'), ('ascan', 'Scan actif'), ('report', 'Rapport'), ('finished', 'Fini')], default='queued', max_length=10)),
+                ('spider_id', models.CharField(blank=True, default='', max_length=20)),
+                ('ascan_id', models.CharField(blank=True, default='', max_length=20)),
+                ('spider_progress', models.IntegerField(default=0)),
+                ('ascan_progress', models.IntegerField(default=0)),
+                ('alert_count', models.IntegerField(default=0)),
+                ('high_count', models.IntegerField(default=0)),
+                ('medium_count', models.IntegerField(default=0)),
+                ('low_count', models.IntegerField(default=0)),
+                ('info_count', models.IntegerField(default=0)),
+                ('report_path', models.CharField(blank=True, default='', max_length=255)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Scan ZAP',
+                'verbose_name_plural': 'Scans ZAP',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='scanner_zap_status_2f6f88_idx')],
+            },
+        ),
+    ]
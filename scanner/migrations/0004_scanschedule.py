@@ -0,0 +1,50 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scanner', '0003_zapscan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScanSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('targets', models.TextField(help_text="Une URL par ligne, suivie éventuellement d'une priorité")),
+                ('priority', models.IntegerField(default=0)),
+                ('max_depth', models.IntegerField(default=5)),
+                ('scan_type', models.CharField(choices=[('passive', 'Scan Passif'), ('active', 'Scan Actif'), ('both', 'Passif + Actif')], default='both', max_length=20)),
+                ('interval_minutes', models.PositiveIntegerField(default=10080)),
+                ('enabled', models.BooleanField(default=True)),
+                ('next_run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Planification ZAP',
+                'verbose_name_plural': 'Planifications ZAP',
+                'ordering': ['next_run_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='zapscan',
+            name='priority',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='zapscan',
+            name='schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scans', to='scanner.scanschedule'),
+        ),
+        migrations.AddIndex(
+            model_name='zapscan',
+            index=models.Index(fields=['status', '-priority', 'created_at'], name='scanner_zap_status_37378f_idx'),
+        ),
+    ]
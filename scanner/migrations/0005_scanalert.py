@@ -0,0 +1,40 @@
+# Generated by Django 6.0.1 on 2026-10-18 22:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scanner', '0004_scanschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScanAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zap_id', models.CharField(blank=True, default='', help_text="Identifiant de l'alerte dans ZAP", max_length=20)),
+                ('plugin_id', models.CharField(max_length=20)),
+                ('alert_ref', models.CharField(blank=True, default='', max_length=30)),
+                ('name', models.CharField(max_length=255)),
+                ('risk', models.SmallIntegerField(choices=[(0, 'Informational'), (1, 'Low'), (2, 'Medium'), (3, 'High')])),
+                ('confidence', models.SmallIntegerField(choices=[(0, 'False Positive'), (1, 'Low'), (2, 'Medium'), (3, 'High'), (4, 'Confirmed')])),
+                ('url', models.CharField(max_length=2048)),
+                ('param', models.CharField(blank=True, default='', max_length=500)),
+                ('method', models.CharField(blank=True, default='', max_length=10)),
+                ('cwe_id', models.IntegerField(blank=True, null=True)),
+                ('wasc_id', models.IntegerField(blank=True, null=True)),
+                ('attack', models.TextField(blank=True, default='')),
+                ('evidence', models.TextField(blank=True, default='')),
+                ('scan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='scanner.zapscan')),
+            ],
+            options={
+                'verbose_name': 'Alerte ZAP',
+                'verbose_name_plural': 'Alertes ZAP',
+                'ordering': ['scan', '-risk', '-confidence', 'id'],
+                'indexes': [models.Index(fields=['scan', '-risk', '-confidence'], name='scanner_sca_scan_id_c86ceb_idx'), models.Index(fields=['plugin_id', 'risk'], name='scanner_sca_plugin__6842c4_idx'), models.Index(fields=['risk', 'scan'], name='scanner_sca_risk_be3d6d_idx'), models.Index(fields=['url'], name='scanner_sca_url_99f327_idx')],
+            },
+        ),
+    ]
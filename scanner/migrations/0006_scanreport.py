@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-18 22:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scanner', '0005_scanalert'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='zapscan',
+            name='report_path',
+        ),
+        migrations.CreateModel(
+            name='ScanReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_url', models.URLField(max_length=2048)),
+                ('path', models.CharField(help_text='Relatif à ZAP_REPORTS_DIR', max_length=255, unique=True)),
+                ('size', models.BigIntegerField(default=0, help_text='Taille compressée (octets)')),
+                ('original_size', models.BigIntegerField(default=0, help_text='Taille du HTML (octets)')),
+                ('sha256', models.CharField(help_text='Empreinte du HTML décompressé', max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('scan', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report', to='scanner.zapscan')),
+            ],
+            options={
+                'verbose_name': 'Rapport ZAP',
+                'verbose_name_plural': 'Rapports ZAP',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scanner', '0006_scanreport'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='zapscan',
+            name='alert_level',
+            field=models.CharField(default='MEDIUM', help_text='LOW, MEDIUM ou HIGH : alertes importées', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='zapscan',
+            name='phase',
+            field=models.CharField(choices=[('queued', 'En file'), ('waiting', "Attente d'un créneau"), ('spider', 'Spider'), ('pscan', 'Scan passif'), ('ascan', 'Scan actif'), ('report', 'Rapport'), ('finished', 'Fini')], default='queued', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='zapscan',
+            name='scan_policy',
+            field=models.CharField(default='default', help_text='Politique du scan actif dans ZAP (scanPolicyName)', max_length=50),
+        ),
+    ]
@@ -1,3 +1,185 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class ZapScan(models.Model):
+    """
+    Scan OWASP ZAP exécuté en tâche de fond : phase courante, progression
+    du spider et du scan actif, résultat et horodatages (lus par polling).
+    """
+    STATUS_CHOICES = [
+        ('pending', 'En attente'),
+        ('running', 'En cours'),
+        ('done', 'Terminé'),
+        ('error', 'Erreur'),
+    ]
+    PHASE_CHOICES = [
+        ('queued', 'En file'),
+        ('waiting', 'Attente d\'un créneau'),
+        ('spider', 'Spider'),
+        ('pscan', 'Scan passif'),
+        ('ascan', 'Scan actif'),
+        ('report', 'Rapport'),
+        ('finished', 'Fini'),
+    ]
+    SCAN_TYPE_CHOICES = [
+        ('passive', 'Scan Passif'),
+        ('active', 'Scan Actif'),
+        ('both', 'Passif + Actif'),
+    ]
+    # Risque minimal des alertes importées (ScanAlert.RISK_CHOICES) par niveau d'alerte
+    ALERT_LEVEL_MIN_RISK = {
+        'LOW': 0,
+        'MEDIUM': 2,
+        'HIGH': 3,
+    }
+
+    target_url = models.URLField(max_length=2048)
+    max_depth = models.IntegerField(default=5)
+    scan_type = models.CharField(max_length=20, choices=SCAN_TYPE_CHOICES, default='both')
+    alert_level = models.CharField(max_length=10, default='MEDIUM', help_text="LOW, MEDIUM ou HIGH : alertes importées")
+    scan_policy = models.CharField(max_length=50, default='default', help_text="Politique du scan actif dans ZAP (scanPolicyName)")
+    priority = models.IntegerField(default=0)
+    schedule = models.ForeignKey('ScanSchedule', on_delete=models.SET_NULL, blank=True, null=True, related_name='scans')
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    phase = models.CharField(max_length=10, choices=PHASE_CHOICES, default='queued')
+    spider_id = models.CharField(max_length=20, blank=True, default='')
+    ascan_id = models.CharField(max_length=20, blank=True, default='')
+    spider_progress = models.IntegerField(default=0)
+    ascan_progress = models.IntegerField(default=0)
+
+    alert_count = models.IntegerField(default=0)
+    high_count = models.IntegerField(default=0)
+    medium_count = models.IntegerField(default=0)
+    low_count = models.IntegerField(default=0)
+    info_count = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['status', '-priority', 'created_at']),
+        ]
+        verbose_name = "Scan ZAP"
+        verbose_name_plural = "Scans ZAP"
+
+    def __str__(self):
+        return f"#{self.pk} {self.target_url} ({self.status}, {self.phase})"
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'error')
+
+    @property
+    def min_risk(self):
+        return self.ALERT_LEVEL_MIN_RISK.get(self.alert_level.upper(), 0)
+
+    @property
+    def duration(self):
+        """Durée du scan en secondes (jusqu'à maintenant s'il tourne encore)"""
+        if self.started_at is None:
+            return None
+        return round(((self.finished_at or timezone.now()) - self.started_at).total_seconds(), 1)
+
+
+class ScanSchedule(models.Model):
+    """
+    Liste de cibles scannée à intervalle régulier : à chaque échéance,
+    l'ordonnanceur met en file un ZapScan par cible (sans doublon).
+    """
+    name = models.CharField(max_length=100)
+    targets = models.TextField(help_text="Une URL par ligne, suivie éventuellement d'une priorité")
+    priority = models.IntegerField(default=0)
+    max_depth = models.IntegerField(default=5)
+    scan_type = models.CharField(max_length=20, choices=ZapScan.SCAN_TYPE_CHOICES, default='both')
+    interval_minutes = models.PositiveIntegerField(default=7 * 24 * 60)
+    enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(default=timezone.now)
+    last_run_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['next_run_at']
+        verbose_name = "Planification ZAP"
+        verbose_name_plural = "Planifications ZAP"
+
+    def __str__(self):
+        return f"{self.name} (toutes les {self.interval_minutes} min)"
+
+
+class ScanAlert(models.Model):
+    """
+    Alerte ZAP d'un scan, normalisée : risque et confiance en entiers pour
+    que les filtres et tris (par scan ou entre scans) passent par les index.
+    """
+    RISK_CHOICES = [
+        (0, 'Informational'),
+        (1, 'Low'),
+        (2, 'Medium'),
+        (3, 'High'),
+    ]
+    CONFIDENCE_CHOICES = [
+        (0, 'False Positive'),
+        (1, 'Low'),
+        (2, 'Medium'),
+        (3, 'High'),
+        (4, 'Confirmed'),
+    ]
+
+    scan = models.ForeignKey(ZapScan, on_delete=models.CASCADE, related_name='alerts')
+    zap_id = models.CharField(max_length=20, blank=True, default='', help_text="Identifiant de l'alerte dans ZAP")
+    plugin_id = models.CharField(max_length=20)
+    alert_ref = models.CharField(max_length=30, blank=True, default='')
+    name = models.CharField(max_length=255)
+    risk = models.SmallIntegerField(choices=RISK_CHOICES)
+    confidence = models.SmallIntegerField(choices=CONFIDENCE_CHOICES)
+    url = models.CharField(max_length=2048)
+    param = models.CharField(max_length=500, blank=True, default='')
+    method = models.CharField(max_length=10, blank=True, default='')
+    cwe_id = models.IntegerField(blank=True, null=True)
+    wasc_id = models.IntegerField(blank=True, null=True)
+    attack = models.TextField(blank=True, default='')
+    evidence = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['scan', '-risk', '-confidence', 'id']
+        indexes = [
+            models.Index(fields=['scan', '-risk', '-confidence']),
+            models.Index(fields=['plugin_id', 'risk']),
+            models.Index(fields=['risk', 'scan']),
+            models.Index(fields=['url']),
+        ]
+        verbose_name = "Alerte ZAP"
+        verbose_name_plural = "Alertes ZAP"
+
+    def __str__(self):
+        return f"#{self.scan_id} [{self.get_risk_display()}] {self.name} → {self.url}"
+
+
+class ScanReport(models.Model):
+    """
+    Rapport HTML d'un scan, stocké compressé (gzip) sur disque : le fichier
+    est servi tel quel et supprimé par la politique de rétention.
+    """
+    scan = models.OneToOneField(ZapScan, on_delete=models.SET_NULL, blank=True, null=True, related_name='report')
+    target_url = models.URLField(max_length=2048)
+    path = models.CharField(max_length=255, unique=True, help_text="Relatif à ZAP_REPORTS_DIR")
+    size = models.BigIntegerField(default=0, help_text="Taille compressée (octets)")
+    original_size = models.BigIntegerField(default=0, help_text="Taille du HTML (octets)")
+    sha256 = models.CharField(max_length=64, help_text="Empreinte du HTML décompressé")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Rapport ZAP"
+        verbose_name_plural = "Rapports ZAP"
+
+    def __str__(self):
+        return f"{self.path} ({self.target_url})"
@@ -0,0 +1,154 @@
+"""
+Stockage des rapports HTML ZAP : compressés sur disque, indexés en base.
+
+Le rapport est lu en flux depuis ZAP et écrit morceau par morceau dans un
+fichier gzip (empreinte SHA-256 et taille calculées au passage) : la
+mémoire reste bornée à un morceau quelle que soit la taille du rapport. Le
+fichier n'apparaît sous son nom final qu'une fois complet (os.replace).
+
+La rétention supprime les rapports plus vieux que ZAP_REPORT_MAX_AGE_DAYS,
+puis les plus anciens tant que le total dépasse ZAP_REPORT_MAX_TOTAL_MB.
+Les fichiers du dossier absents de l'index (anciens rapports non
+compressés, écritures interrompues) suivent la règle d'âge.
+"""
+import gzip
+import hashlib
+import os
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import ScanReport
+
+CHUNK_SIZE = 64 * 1024
+# Niveau 6 : presque tout le gain du niveau 9 (HTML très redondant) pour bien moins de CPU
+COMPRESSLEVEL = 6
+
+
+def reports_dir():
+    return getattr(settings, 'ZAP_REPORTS_DIR', 'reports')
+
+
+def report_file(report):
+    """Chemin absolu du fichier d'un ScanReport"""
+    return os.path.join(reports_dir(), report.path)
+
+
+def store_report(chunks, scan):
+    """Écrit le rapport (itérable de bytes) compressé et l'indexe ; renvoie le ScanReport"""
+    directory = reports_dir()
+    os.makedirs(directory, exist_ok=True)
+    name = f"zap_report_{scan.pk}_{int(time.time())}.html.gz"
+    final_path = os.path.join(directory, name)
+    temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    original_size = 0
+    try:
+        with open(temp_path, 'wb') as raw, gzip.GzipFile(filename=name[:-3], mode='wb', fileobj=raw,
+                                                          compresslevel=COMPRESSLEVEL) as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                original_size += len(chunk)
+                f.write(chunk)
+        os.replace(temp_path, final_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return ScanReport.objects.create(
+        scan=scan,
+        target_url=scan.target_url,
+        path=name,
+        size=os.path.getsize(final_path),
+        original_size=original_size,
+        sha256=digest.hexdigest(),
+    )
+
+
+def delete_report(report):
+    try:
+        os.remove(report_file(report))
+    except FileNotFoundError:
+        pass
+    report.delete()
+
+
+def prune_reports(max_age_days=None, max_total_mb=None, dry_run=False):
+    """
+    Applique la rétention ; renvoie (rapports supprimés, fichiers hors index
+    supprimés, octets libérés).
+    """
+    if max_age_days is None:
+        max_age_days = getattr(settings, 'ZAP_REPORT_MAX_AGE_DAYS', 90)
+    if max_total_mb is None:
+        max_total_mb = getattr(settings, 'ZAP_REPORT_MAX_TOTAL_MB', 1024)
+    limit = timezone.now() - timedelta(days=max_age_days) if max_age_days else None
+    deleted = []
+
+    # 1. Âge
+    if limit is not None:
+        deleted.extend(ScanReport.objects.filter(created_at__lt=limit))
+
+    # 2. Taille totale : les plus anciens d'abord
+    if max_total_mb:
+        excess = (ScanReport.objects.aggregate(total=Sum('size'))['total'] or 0) - sum(r.size for r in deleted)
+        excess -= max_total_mb * 1024 * 1024
+        if excess > 0:
+            kept = ScanReport.objects.exclude(pk__in=[r.pk for r in deleted]).order_by('created_at')
+            for report in kept.only('id', 'path', 'size').iterator():
+                if excess <= 0:
+                    break
+                deleted.append(report)
+                excess -= report.size
+
+    freed = sum(report.size for report in deleted)
+    if not dry_run:
+        for report in deleted:
+            delete_report(report)
+
+    # 3. Fichiers hors index, selon leur date de modification
+    orphans = 0
+    directory = reports_dir()
+    if limit is not None and os.path.isdir(directory):
+        indexed = set(ScanReport.objects.values_list('path', flat=True))
+        cutoff = limit.timestamp()
+        for entry in os.scandir(directory):
+            if not entry.is_file() or entry.name in indexed or not entry.name.startswith(('zap_report_', '.zap_report_')):
+                continue
+            stat = entry.stat()
+            if stat.st_mtime < cutoff:
+                orphans += 1
+                freed += stat.st_size
+                if not dry_run:
+                    os.remove(entry.path)
+
+    return len(deleted), orphans, freed
+
+
+def iter_file_range(path, start, length, chunk_size=CHUNK_SIZE):
+    """Octets [start, start + length) du fichier, morceau par morceau"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def iter_decompressed(path, chunk_size=CHUNK_SIZE):
+    """HTML décompressé à la volée, morceau par morceau"""
+    with gzip.open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
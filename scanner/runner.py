@@ -0,0 +1,213 @@
+"""
+Exécution des scans OWASP ZAP en tâche de fond.
+
+Un scan (spider, scan actif, rapport) dure plusieurs minutes : il tourne
+dans un thread démon (comme les tests perforNet) et non plus dans la
+requête POST, qui rend la main tout de suite. La progression est écrite
+dans le modèle ZapScan au fil du scan ; la page la lit par polling.
+
+Le spider et le scan actif prennent chacun un créneau (ZAP_MAX_SPIDERS,
+ZAP_MAX_ASCANS) : le démon ZAP n'est jamais surchargé et le spider d'une
+cible avance pendant le scan actif d'une autre (voir scheduler.py). Les
+créneaux sont comptés en base (champ phase des scans en cours) : la limite
+vaut pour tous les processus qui partagent le démon.
+
+Les options du scan sont transmises à ZAP : un scan passif s'arrête après
+le spider et le scan passif, la politique choisie est celle du scan actif
+et seules les alertes du niveau demandé sont importées.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+
+from .alerts import ingest_alerts
+from .models import ZapScan
+from .reports import prune_reports, store_report
+from .zap import ZapError, ZapTimeout, get_client
+
+# Scans en cours dans ce processus, par identifiant
+scan_threads = {}
+
+# Un scan « running » qui n'a rien écrit depuis STALE_AFTER secondes est
+# considéré comme abandonné (processus redémarré) : chaque phase rafraîchit
+# updated_at (polls de ZAP, attente d'un créneau, rapport et alertes au plus
+# toutes les SLOT_POLL secondes).
+SLOT_POLL = 5
+STALE_AFTER = 300
+
+# Politique du formulaire qui correspond à celle par défaut de ZAP
+DEFAULT_POLICY = 'default'
+
+
+def update(scan_id, **fields):
+    """Écrit l'état du scan (une requête UPDATE, sans relire l'objet)"""
+    ZapScan.objects.filter(pk=scan_id).update(updated_at=timezone.now(), **fields)
+
+
+def phase_limits():
+    return {
+        'spider': getattr(settings, 'ZAP_MAX_SPIDERS', 2),
+        'ascan': getattr(settings, 'ZAP_MAX_ASCANS', 2),
+    }
+
+
+def claim_phase(scan_id, phase):
+    """
+    Passe le scan dans `phase` s'il reste un créneau, tous processus
+    confondus. Les scans en cours sont verrouillés (select_for_update) : deux
+    réclamations simultanées sont sérialisées et la seconde compte la
+    première. Renvoie True si le créneau est obtenu.
+    """
+    try:
+        with transaction.atomic():
+            running = ZapScan.objects.select_for_update().filter(status='running').order_by('pk')
+            busy = sum(1 for pk, current in running.values_list('pk', 'phase') if current == phase and pk != scan_id)
+            if busy >= phase_limits()[phase]:
+                return False
+            update(scan_id, phase=phase)
+            return True
+    except OperationalError:
+        # SQLite (pas de select_for_update) : une écriture concurrente fait échouer la transaction,
+        # le créneau sera redemandé au prochain essai
+        return False
+
+
+def beating(scan_id, chunks, every=SLOT_POLL):
+    """Itère `chunks` en rafraîchissant updated_at au plus toutes les `every` secondes"""
+    last = time.monotonic()
+    for chunk in chunks:
+        if time.monotonic() - last >= every:
+            update(scan_id)
+            last = time.monotonic()
+        yield chunk
+
+
+def stop_quietly(stop, zap_id):
+    """Arrête un scan dans ZAP en quittant sa phase sur erreur ; ZAP injoignable : rien à faire"""
+    try:
+        stop(zap_id)
+    except (ZapError, requests.exceptions.RequestException) as e:
+        print(f"[!] Arrêt du scan ZAP {zap_id} impossible : {e}")
+
+
+@contextmanager
+def slot(scan_id, phase):
+    """Créneau ZAP pour une phase du scan, rendu en quittant la phase"""
+    update(scan_id, phase='waiting')
+    while not claim_phase(scan_id, phase):
+        time.sleep(SLOT_POLL)
+        update(scan_id)
+    try:
+        yield
+    finally:
+        ZapScan.objects.filter(pk=scan_id, phase=phase).update(phase='waiting', updated_at=timezone.now())
+
+
+def run_scan(scan_id):
+    """Spider, scan actif, rapport HTML et alertes d'un ZapScan"""
+    scan = ZapScan.objects.get(pk=scan_id)
+    target = scan.target_url
+    client = get_client()
+
+    def progress(field):
+        return lambda value: update(scan_id, **{field: value})
+
+    update(scan_id, status='running')
+    try:
+        # 1. Spider (découverte)
+        with slot(scan_id, 'spider'):
+            print(f"[*] Spider → {target}")
+            update(scan_id, started_at=timezone.now())
+            spider_id = client.spider_scan(target, max_children=scan.max_depth)
+            update(scan_id, spider_id=spider_id)
+            try:
+                client.wait(client.spider_status, spider_id, on_progress=progress('spider_progress'))
+            except BaseException:
+                # Sans arrêt, le spider continuerait dans ZAP hors créneau
+                stop_quietly(client.spider_stop, spider_id)
+                raise
+
+        # 2. Scan passif du trafic du spider (sans créneau : il tourne déjà dans ZAP)
+        if scan.scan_type in ('passive', 'both'):
+            print("[*] Passive scan...")
+            update(scan_id, phase='pscan')
+            client.wait_passive(timeout=settings.ZAP_TIMEOUT, on_progress=lambda remaining: update(scan_id))
+
+        # 3. Active scan, avec la politique choisie
+        if scan.scan_type in ('active', 'both'):
+            with slot(scan_id, 'ascan'):
+                print(f"[*] Active scan (politique {scan.scan_policy})...")
+                policy = None if scan.scan_policy == DEFAULT_POLICY else scan.scan_policy
+                ascan_id = client.ascan_scan(target, scan_policy=policy)
+                update(scan_id, ascan_id=ascan_id)
+                try:
+                    client.wait(client.ascan_status, ascan_id, on_progress=progress('ascan_progress'),
+                                timeout=settings.ZAP_TIMEOUT)
+                except BaseException:
+                    # Timeout compris : le créneau n'est rendu qu'une fois le scan arrêté dans ZAP
+                    stop_quietly(client.ascan_stop, ascan_id)
+                    raise
+
+        # 4. Rapport HTML, écrit compressé en flux
+        update(scan_id, phase='report')
+        report = store_report(beating(scan_id, client.iter_html_report()), scan)
+        print(f"[*] Rapport {report.path} : {report.original_size} → {report.size} octets")
+
+        # Alertes du niveau demandé, importées page par page dans ScanAlert
+        counts = ingest_alerts(client, scan_id, target, min_risk=scan.min_risk, on_page=lambda read: update(scan_id))
+
+        update(
+            scan_id,
+            status='done',
+            phase='finished',
+            finished_at=timezone.now(),
+            **counts
+        )
+        print(f"[*] Scan {scan_id} terminé : {counts['alert_count']} alerte(s)")
+
+        # Rétention des rapports (âge, taille totale)
+        pruned, orphans, freed = prune_reports()
+        if pruned or orphans:
+            print(f"[*] Rétention : {pruned + orphans} rapport(s) supprimé(s), {freed} octets libérés")
+
+    except ZapTimeout as e:
+        update(scan_id, status='error', error=f"Timeout : {e}", finished_at=timezone.now())
+    except ZapError as e:
+        update(scan_id, status='error', error=f"Erreur de l'API ZAP : {e}", finished_at=timezone.now())
+    except requests.exceptions.RequestException as e:
+        update(scan_id, status='error', error=f"Erreur de connexion à ZAP : {str(e)}", finished_at=timezone.now())
+    except Exception as e:
+        print(f"[!] Erreur scan {scan_id}: {e}")
+        update(scan_id, status='error', error=str(e), finished_at=timezone.now())
+    finally:
+        scan_threads.pop(scan_id, None)
+        connection.close()
+
+
+def start_scan(scan, on_done=None):
+    """Lance le scan dans un thread démon (on_done appelé à la fin, ex: réveil de l'ordonnanceur)"""
+    def target():
+        run_scan(scan.pk)
+        if on_done is not None:
+            on_done()
+
+    thread = threading.Thread(target=target, daemon=True)
+    scan_threads[scan.pk] = thread
+    thread.start()
+    return thread
+
+
+def is_running(scan_id):
+    thread = scan_threads.get(scan_id)
+    return thread is not None and thread.is_alive()
+
+
+def is_stale(scan):
+    """Scan « running » abandonné : plus aucune écriture depuis STALE_AFTER secondes"""
+    return (scan.status == 'running' and not is_running(scan.pk)
+            and (timezone.now() - scan.updated_at).total_seconds() > STALE_AFTER)
@@ -0,0 +1,219 @@
+"""
+Ordonnanceur des scans ZAP multi-cibles.
+
+Les cibles (liste envoyée depuis la page de file, la commande zap_schedule
+ou une ScanSchedule arrivée à échéance) sont mises en file comme ZapScan
+« pending », sans doublon : une cible déjà en file ou en cours avec les
+mêmes options (type, politique, niveau d'alerte) n'est pas ajoutée une
+seconde fois.
+
+Un thread unique distribue la file par priorité décroissante, puis par
+durée attendue décroissante (historique des scans de la cible) : lancer
+les scans les plus longs d'abord réduit la durée totale de la liste. Au
+plus ZAP_MAX_SPIDERS + ZAP_MAX_ASCANS scans sont en vol (tous processus
+confondus, compté en base), chaque phase attendant son créneau dans
+runner.py (lui aussi compté en base) : un spider avance pendant le scan
+actif d'une autre cible sans surcharger le démon.
+"""
+import threading
+from datetime import timedelta
+from urllib.parse import urlsplit, urlunsplit
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from .models import ScanSchedule, ZapScan
+from .runner import STALE_AFTER, is_running, scan_threads, start_scan
+
+# Intervalle de l'ordonnanceur (secondes) ; wake() le réveille plus tôt
+TICK = 5
+
+# Durée supposée (secondes) d'un scan sans historique
+DEFAULT_DURATION = 600.0
+# Derniers scans terminés pris en compte par cible
+HISTORY = 5
+
+_validate_url = URLValidator(schemes=['http', 'https'])
+_enqueue_lock = threading.Lock()
+
+
+def normalize_target(url):
+    """URL canonique pour le dédoublonnage (schéma et hôte en minuscules, sans / final ni fragment)"""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), parts.query, ''))
+
+
+def parse_targets(text, default_priority=0):
+    """
+    Lignes « URL [priorité] » → [(url, priorité), ...] sans doublon
+    (la priorité la plus haute l'emporte). Lignes vides et # ignorées.
+    """
+    targets = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        fields = line.split()
+        priority = default_priority
+        if len(fields) > 1:
+            try:
+                priority = int(fields[1])
+            except ValueError:
+                raise ValueError(f"Priorité invalide : {line}")
+        try:
+            _validate_url(fields[0])
+        except ValidationError:
+            raise ValueError(f"URL invalide : {fields[0]}")
+        url = normalize_target(fields[0])
+        targets[url] = max(priority, targets.get(url, priority))
+    return list(targets.items())
+
+
+def dedup_key(options):
+    """Options qui distinguent deux scans d'une même cible"""
+    return {field: options[field] for field in ('scan_type', 'scan_policy', 'alert_level')}
+
+
+def enqueue(targets, schedule=None, **options):
+    """
+    Met en file [(url, priorité), ...] avec les options du ZapScan
+    (max_depth, scan_type, alert_level, scan_policy). Les cibles déjà en
+    file ou en cours avec les mêmes options de scan sont ignorées. Renvoie
+    (scans créés, cibles ignorées).
+    """
+    options['scan_type'] = options.get('scan_type') or 'both'
+    options['alert_level'] = options.get('alert_level') or 'MEDIUM'
+    options['scan_policy'] = options.get('scan_policy') or 'default'
+    with _enqueue_lock:
+        active = set(
+            ZapScan.objects.filter(status__in=('pending', 'running'), **dedup_key(options))
+            .values_list('target_url', flat=True)
+        )
+        scans = []
+        for url, priority in targets:
+            if url in active:
+                continue
+            active.add(url)
+            scans.append(ZapScan(target_url=url, priority=priority, schedule=schedule, **options))
+        created = ZapScan.objects.bulk_create(scans)
+    if created:
+        print(f"[ZAP] {len(created)} scan(s) en file, {len(targets) - len(created)} doublon(s) ignoré(s)")
+        scheduler.wake()
+    return created, len(targets) - len(created)
+
+
+def expected_durations(urls):
+    """Durée médiane (secondes) des derniers scans terminés de chaque cible"""
+    durations = {}
+    rows = (
+        ZapScan.objects.filter(target_url__in=urls, status='done')
+        .exclude(started_at=None).exclude(finished_at=None)
+        .order_by('-finished_at')
+        .values_list('target_url', 'started_at', 'finished_at')
+    )
+    for url, started_at, finished_at in rows:
+        samples = durations.setdefault(url, [])
+        if len(samples) < HISTORY:
+            samples.append((finished_at - started_at).total_seconds())
+    return {url: sorted(samples)[len(samples) // 2] for url, samples in durations.items()}
+
+
+class Scheduler:
+    """Distribution de la file des ZapScan dans la limite des créneaux ZAP"""
+
+    def __init__(self, tick=TICK):
+        self.tick = tick
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def capacity(self):
+        return getattr(settings, 'ZAP_MAX_SPIDERS', 2) + getattr(settings, 'ZAP_MAX_ASCANS', 2)
+
+    def wake(self):
+        self._wake.set()
+
+    def ensure_started(self):
+        """Démarre le thread de l'ordonnanceur s'il ne tourne pas déjà dans ce processus"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self.loop, daemon=True)
+            self._thread.start()
+
+    def loop(self, until_idle=False):
+        """Boucle principale ; until_idle : s'arrête quand la file est vide et plus rien ne tourne"""
+        while True:
+            try:
+                self.expire_stale()
+                self.run_due_schedules()
+                self.dispatch()
+                if until_idle and not ZapScan.objects.filter(status__in=('pending', 'running')).exists():
+                    return
+            except DatabaseError as e:
+                print(f"[ZAP] Ordonnanceur : {e}")
+            finally:
+                connection.close()
+            self._wake.wait(self.tick)
+            self._wake.clear()
+
+    def expire_stale(self):
+        """Scans abandonnés (processus redémarré) : en erreur, leur créneau est rendu"""
+        limit = timezone.now() - timedelta(seconds=STALE_AFTER)
+        # Un scan dont le thread tourne dans ce processus n'est jamais abandonné
+        alive = [scan_id for scan_id in list(scan_threads) if is_running(scan_id)]
+        count = ZapScan.objects.filter(status='running', updated_at__lt=limit).exclude(pk__in=alive).update(
+            status='error',
+            error='Scan interrompu (serveur redémarré ?)',
+            finished_at=timezone.now(),
+            updated_at=timezone.now()
+        )
+        if count:
+            print(f"[ZAP] {count} scan(s) interrompu(s)")
+
+    def run_due_schedules(self):
+        """Met en file les cibles des planifications arrivées à échéance"""
+        now = timezone.now()
+        for schedule in ScanSchedule.objects.filter(enabled=True, next_run_at__lte=now):
+            try:
+                targets = parse_targets(schedule.targets, schedule.priority)
+            except ValueError as e:
+                print(f"[ZAP] Planification {schedule.name} ignorée : {e}")
+                targets = []
+            enqueue(targets, schedule=schedule, max_depth=schedule.max_depth, scan_type=schedule.scan_type)
+            # Pas de rattrapage des échéances manquées (serveur arrêté)
+            interval = timedelta(minutes=schedule.interval_minutes)
+            schedule.next_run_at = max(schedule.next_run_at + interval, now + interval)
+            schedule.last_run_at = now
+            schedule.save(update_fields=['next_run_at', 'last_run_at'])
+
+    def dispatch(self):
+        """Démarre les scans en file les plus prioritaires tant qu'il reste des créneaux"""
+        free = self.capacity - ZapScan.objects.filter(status='running').count()
+        if free <= 0:
+            return []
+        pending = list(ZapScan.objects.filter(status='pending').only('id', 'target_url', 'priority', 'created_at'))
+        if not pending:
+            return []
+        durations = expected_durations({scan.target_url for scan in pending})
+        pending.sort(key=lambda scan: (
+            -scan.priority,
+            -durations.get(scan.target_url, DEFAULT_DURATION),
+            scan.created_at,
+        ))
+        started = []
+        for scan in pending:
+            if len(started) >= free:
+                break
+            # Réservation atomique : un autre processus ne démarre pas le même scan
+            if ZapScan.objects.filter(pk=scan.pk, status='pending').update(status='running', updated_at=timezone.now()):
+                start_scan(scan, on_done=self.wake)
+                started.append(scan)
+        return started
+
+
+scheduler = Scheduler()
@@ -1,3 +1,82 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+import requests
+from django.test import SimpleTestCase
+
+from .zap import ZapClient, ZapError, poll_interval
+
+
+def response(status, payload=None):
+    result = mock.Mock(status_code=status)
+    result.json.return_value = payload or {}
+    return result
+
+
+class PollIntervalTests(SimpleTestCase):
+    def setUp(self):
+        # Sans gigue : intervalles exacts
+        patcher = mock.patch('scanner.zap.random.uniform', return_value=1.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_quarter_of_remaining_time(self):
+        # 25 % en 40 s : il reste ~120 s, prochain poll dans 30 s
+        self.assertEqual(poll_interval(25, 40, 1, 60), 30)
+
+    def test_without_progress_half_of_elapsed(self):
+        self.assertEqual(poll_interval(0, 8, 1, 60), 4)
+
+    def test_clamped_to_bounds(self):
+        self.assertEqual(poll_interval(100, 500, 1, 15), 1)
+        self.assertEqual(poll_interval(1, 500, 1, 15), 15)
+        self.assertEqual(poll_interval(0, 0, 1, 15), 1)
+
+    def test_jitter_stays_within_bounds(self):
+        with mock.patch('scanner.zap.random.uniform', return_value=1.2):
+            self.assertEqual(poll_interval(50, 40, 1, 15), 12)
+            self.assertEqual(poll_interval(50, 400, 1, 15), 15)
+
+
+class ZapClientRetryTests(SimpleTestCase):
+    def setUp(self):
+        self.client = ZapClient('http://zap.test', retries=2, backoff=0.5)
+        self.get = mock.patch.object(self.client.session, 'get').start()
+        self.sleep = mock.patch('scanner.zap.time.sleep').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_connection_error_is_retried(self):
+        self.get.side_effect = [requests.exceptions.ConnectionError(), response(200, {'scan': '1'})]
+        self.assertEqual(self.client.json('/JSON/spider/action/scan/', idempotent=False), {'scan': '1'})
+        self.assertEqual(self.get.call_count, 2)
+        self.assertEqual(self.sleep.call_count, 1)
+
+    def test_timeout_not_retried_when_not_idempotent(self):
+        self.get.side_effect = requests.exceptions.ReadTimeout()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.client.request('/JSON/ascan/action/scan/', idempotent=False)
+        self.assertEqual(self.get.call_count, 1)
+        self.sleep.assert_not_called()
+
+    def test_unavailable_is_retried_with_backoff(self):
+        self.get.side_effect = [response(503), response(502), response(200)]
+        with mock.patch('scanner.zap.random.uniform', return_value=1.0):
+            self.assertEqual(self.client.request('/JSON/core/view/version/').status_code, 200)
+        self.assertEqual([c.args[0] for c in self.sleep.call_args_list], [0.5, 1.0])
+
+    def test_unavailable_not_retried_when_not_idempotent(self):
+        self.get.return_value = response(503)
+        with self.assertRaises(ZapError):
+            self.client.request('/JSON/ascan/action/scan/', idempotent=False)
+        self.assertEqual(self.get.call_count, 1)
+
+    def test_exhausted_retries_raise(self):
+        self.get.return_value = response(504, {'code': 'timeout', 'message': 'busy'})
+        with self.assertRaisesMessage(ZapError, 'timeout : busy'):
+            self.client.request('/JSON/core/view/version/')
+        self.assertEqual(self.get.call_count, 3)
+
+        self.get.reset_mock(return_value=True)
+        self.get.side_effect = requests.exceptions.ConnectionError()
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.request('/JSON/core/view/version/')
+        self.assertEqual(self.get.call_count, 3)
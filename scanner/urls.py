@@ -1,6 +1,11 @@
 from django.urls import path
-from .views import HomeView
+from .views import HomeView, alert_list, scan_detail, scan_queue, scan_report, scan_status
 
 urlpatterns = [
     path('', HomeView.as_view(), name='home'),
-]
\ No newline at end of file
+    path('queue/', scan_queue, name='scan_queue'),
+    path('alerts/', alert_list, name='alert_list'),
+    path('scan/<int:scan_id>/', scan_detail, name='scan_detail'),
+    path('scan/<int:scan_id>/status/', scan_status, name='scan_status'),
+    path('scan/<int:scan_id>/report/', scan_report, name='scan_report'),
+]
@@ -1,11 +1,26 @@
-import time
 import os
-import requests
-from django.shortcuts import render
+import re
+from django.core.paginator import Paginator
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
 from django.views import View
-from django.conf import settings
+from django.views.decorators.clickjacking import xframe_options_sameorigin
 from django import forms
 
+from .models import ScanAlert, ScanReport, ScanSchedule, ZapScan
+from .reports import iter_decompressed, iter_file_range, report_file
+from .runner import is_stale
+from .scheduler import dedup_key, enqueue, normalize_target, parse_targets, scheduler
+
+# Alertes affichées sur la page d'un scan / par page de l'API
+ALERTS_SHOWN = 100
+ALERTS_PAGE_SIZE = 100
+ALERTS_MAX_PAGE_SIZE = 1000
+
+# En-tête Range : une seule plage (bytes=début-fin, début- ou -suffixe)
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
 # Formulaire (on le met ici pour que le fichier soit autonome)
 class ScanForm(forms.Form):
     target_url = forms.URLField(
@@ -19,6 +34,9 @@ class ScanForm(forms.Form):
         min_value=0,
         required=False
     )
+    scan_type = forms.ChoiceField(choices=ZapScan.SCAN_TYPE_CHOICES, required=False)
+    alert_level = forms.CharField(max_length=10, required=False)
+    scan_policy = forms.CharField(max_length=50, required=False)
 
 class HomeView(View):
     template_name = 'scanner/home.html'
@@ -32,93 +50,272 @@ class HomeView(View):
         if not form.is_valid():
             return render(request, self.template_name, {'form': form})
 
-        target = form.cleaned_data['target_url'].rstrip('/')
-        max_depth = form.cleaned_data.get('max_depth', 5)
+        target = normalize_target(form.cleaned_data['target_url'])
+        options = scan_options(form.cleaned_data)
+        created, _ = enqueue([(target, 0)], **options)
+        if created:
+            scan = created[0]
+        else:
+            # Cible déjà en file ou en cours : on suit le scan existant
+            scan = ZapScan.objects.filter(
+                target_url=target, status__in=('pending', 'running'), **dedup_key(options)
+            ).order_by('-created_at').first()
+        # Le scan tourne en tâche de fond : la requête rend la main tout de suite
+        scheduler.ensure_started()
+
+        if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+            return JsonResponse({'success': True, 'scan_id': scan.pk, 'status': scan.status}, status=202)
+        return redirect('scan_detail', scan_id=scan.pk)
+
+
+def scan_options(data):
+    """Options d'un ZapScan à partir des données d'un formulaire validé"""
+    max_depth = data.get('max_depth')
+    return {
+        'max_depth': 5 if max_depth is None else max_depth,
+        'scan_type': data.get('scan_type') or 'both',
+        'alert_level': data.get('alert_level') or 'MEDIUM',
+        'scan_policy': data.get('scan_policy') or 'default',
+    }
+
+
+def scan_state(scan):
+    """État d'un scan pour le polling (interrompu s'il n'avance plus)"""
+    status = 'interrupted' if is_stale(scan) else scan.status
+    return {
+        'id': scan.pk,
+        'target': scan.target_url,
+        'status': status,
+        'phase': scan.phase,
+        'priority': scan.priority,
+        'spider_progress': scan.spider_progress,
+        'ascan_progress': scan.ascan_progress,
+        'alert_count': scan.alert_count,
+        'high_count': scan.high_count,
+        'medium_count': scan.medium_count,
+        'low_count': scan.low_count,
+        'info_count': scan.info_count,
+        'error': scan.error,
+        'created_at': scan.created_at.isoformat(),
+        'started_at': scan.started_at.isoformat() if scan.started_at else None,
+        'finished_at': scan.finished_at.isoformat() if scan.finished_at else None,
+        'duration': scan.duration,
+    }
+
+
+def scan_detail(request, scan_id):
+    """Page du scan : progression tant qu'il tourne, rapport une fois terminé"""
+    scan = get_object_or_404(ZapScan, pk=scan_id)
+    state = scan_state(scan)
+    context = {
+        'scan': scan,
+        'state': state,
+        'target': scan.target_url,
+        'scan_type': scan.get_scan_type_display(),
+        'now': timezone.now(),
+    }
+    if state['status'] == 'interrupted':
+        context['error'] = "Scan interrompu (serveur redémarré ?)"
+    elif scan.status == 'error':
+        context['error'] = scan.error
+    elif scan.status == 'done':
+        context.update({
+            'success': True,
+            # Le rapport n'est plus lu ici : la page l'affiche via scan_report
+            'report': ScanReport.objects.filter(scan=scan).first(),
+            'scan_duration': f"{scan.duration}s" if scan.duration is not None else None,
+            'alert_count': scan.alert_count,
+            'high_count': scan.high_count,
+            'medium_count': scan.medium_count,
+            'low_count': scan.low_count,
+            'info_count': scan.info_count,
+            # Les plus graves d'abord, lues via l'index (scan, -risk, -confidence)
+            'alerts': scan.alerts.all()[:ALERTS_SHOWN],
+        })
+    return render(request, 'scanner/result.html', context)
+
+
+def ranged_response(request, path, size, etag):
+    """
+    Réponse en flux du fichier, ou de la plage demandée par l'en-tête Range
+    (206) si If-Range, s'il est fourni, désigne encore cette représentation
+    """
+    start, end, status = 0, size - 1, 200
+    match = RANGE_RE.match(request.headers.get('Range', '').strip())
+    if_range = request.headers.get('If-Range')
+    if match and any(match.groups()) and (if_range is None or if_range == etag):
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            start = max(0, size - int(last))
+        if start >= size or start > end:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        status = 206
+
+    length = end - start + 1
+    response = StreamingHttpResponse(iter_file_range(path, start, length), status=status)
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+@xframe_options_sameorigin
+def scan_report(request, scan_id):
+    """
+    Rapport HTML d'un scan, lu en flux depuis le fichier gzip (mémoire
+    constante) : servi compressé tel quel, avec prise en charge de Range, si
+    le client accepte gzip ; décompressé à la volée sinon (sans Range : les
+    octets de la plage n'existent pas sur disque). Chaque représentation a
+    son ETag (suffixe -gz pour la version compressée). ?download=1 : en
+    pièce jointe.
+    """
+    report = ScanReport.objects.filter(scan_id=scan_id).first()
+    if report is None or not os.path.exists(report_file(report)):
+        raise Http404("Rapport introuvable")
 
-        context = self.perform_zap_scan(target, max_depth)
-        return render(request, 'scanner/result.html', context)
+    gzipped = 'gzip' in request.headers.get('Accept-Encoding', '')
+    etag = f'"{report.sha256}-gz"' if gzipped else f'"{report.sha256}"'
+    if etag in (tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Vary'] = 'Accept-Encoding'
+        return response
 
-    def perform_zap_scan(self, target, max_depth=5):
+    path = report_file(report)
+    if gzipped:
+        response = ranged_response(request, path, report.size, etag)
+        if response.status_code == 416:
+            return response
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = StreamingHttpResponse(iter_decompressed(path))
+        response['Accept-Ranges'] = 'none'
+    response['Content-Type'] = 'text/html; charset=utf-8'
+    response['ETag'] = etag
+    response['Vary'] = 'Accept-Encoding'
+    # Le rapport reprend du contenu de la cible : isolé du reste de l'application
+    response['Content-Security-Policy'] = 'sandbox'
+    if request.GET.get('download'):
+        response['Content-Disposition'] = f'attachment; filename="zap_report_{scan_id}.html"'
+    return response
+
+
+def scan_status(request, scan_id):
+    """Endpoint JSON léger interrogé par la page pendant le scan"""
+    try:
+        scan = ZapScan.objects.get(pk=scan_id)
+    except ZapScan.DoesNotExist:
+        return JsonResponse({'success': False, 'error': 'Scan introuvable'}, status=404)
+    return JsonResponse({'success': True, **scan_state(scan)})
+
+
+class TargetListForm(forms.Form):
+    targets = forms.CharField(widget=forms.Textarea, required=True)
+    priority = forms.IntegerField(initial=0, required=False)
+    max_depth = forms.IntegerField(initial=5, min_value=0, required=False)
+    scan_type = forms.ChoiceField(choices=ZapScan.SCAN_TYPE_CHOICES, required=False)
+
+
+def scan_queue(request):
+    """
+    GET : file des scans (en attente, en cours, derniers terminés) et planifications.
+    POST : met en file une liste de cibles (« URL [priorité] » par ligne).
+    """
+    if request.method == 'POST':
+        form = TargetListForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({'success': False, 'error': 'Formulaire invalide', 'errors': form.errors}, status=400)
         try:
-            base_url = settings.ZAP_DAEMON_URL.rstrip('/')  # ex: http://127.0.0.1:8080
-            apikey = settings.ZAP_API_KEY
-
-            params = {}
-            if apikey:
-                params['apikey'] = apikey
-
-            # 1. Spider (découverte)
-            print(f"[*] Spider → {target}")
-            spider_resp = requests.get(
-                f"{base_url}/JSON/spider/action/scan/",
-                params={**params, 'url': target, 'maxChildren': max_depth or None}
-            )
-            spider_resp.raise_for_status()
-            spider_id = spider_resp.json()['scan']
-
-            # Attente spider
-            while True:
-                status = requests.get(
-                    f"{base_url}/JSON/spider/view/status/",
-                    params={**params, 'scanId': spider_id}
-                ).json()['status']
-                if int(status) >= 100:
-                    break
-                time.sleep(5)
-
-            # 2. Active scan
-            print("[*] Active scan...")
-            ascan_resp = requests.get(
-                f"{base_url}/JSON/ascan/action/scan/",
-                params={**params, 'url': target, 'recurse': 'true', 'inScopeOnly': 'true'}
-            )
-            ascan_resp.raise_for_status()
-            ascan_id = ascan_resp.json()['scan']
-
-            # Attente active scan
-            start_time = time.time()
-            while True:
-                status = requests.get(
-                    f"{base_url}/JSON/ascan/view/status/",
-                    params={**params, 'scanId': ascan_id}
-                ).json()['status']
-                if int(status) >= 100:
-                    break
-                if time.time() - start_time > settings.ZAP_TIMEOUT:
-                    return {'error': 'Scan actif timeout'}
-                time.sleep(10)
-
-            # 3. Rapport HTML
-            report_resp = requests.get(
-                f"{base_url}/OTHER/core/other/htmlreport/",
-                params=params
-            )
-            report_resp.raise_for_status()
-            html_report = report_resp.text
-
-            # Sauvegarde optionnelle
-            os.makedirs("reports", exist_ok=True)
-            report_filename = f"zap_report_{int(time.time())}.html"
-            report_path = os.path.join("reports", report_filename)
-            with open(report_path, "w", encoding="utf-8") as f:
-                f.write(html_report)
-
-            # Nombre d'alertes (simple appel API)
-            alerts_resp = requests.get(
-                f"{base_url}/JSON/core/view/alerts/",
-                params={**params, 'baseurl': target}
-            )
-            alert_count = len(alerts_resp.json()) if alerts_resp.ok else 0
-
-            return {
+            targets = parse_targets(form.cleaned_data['targets'], form.cleaned_data.get('priority') or 0)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        if not targets:
+            return JsonResponse({'success': False, 'error': 'Aucune cible'}, status=400)
+
+        created, skipped = enqueue(targets, **scan_options(form.cleaned_data))
+        scheduler.ensure_started()
+        if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+            return JsonResponse({
                 'success': True,
-                'target': target,
-                'html_report': html_report,
-                'report_path': report_path,
-                'alert_count': alert_count
-            }
+                'queued': [scan.pk for scan in created],
+                'skipped': skipped,
+            }, status=202)
+        return redirect('scan_queue')
+
+    scheduler.ensure_started()
+    active = list(ZapScan.objects.filter(status__in=('pending', 'running')).order_by('-priority', 'created_at'))
+    finished = list(ZapScan.objects.filter(status__in=('done', 'error'))[:20])
+    return render(request, 'scanner/queue.html', {
+        'form': TargetListForm(),
+        'running': [scan for scan in active if scan.status == 'running'],
+        'pending': [scan for scan in active if scan.status == 'pending'],
+        'finished': finished,
+        'schedules': ScanSchedule.objects.all(),
+        'capacity': scheduler.capacity,
+        'now': timezone.now(),
+    })
+
+
+def int_param(value, default, minimum=0, maximum=None):
+    """Entier d'un paramètre GET, borné (valeur par défaut si invalide)"""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    value = max(minimum, value)
+    return min(value, maximum) if maximum is not None else value
 
-        except requests.exceptions.RequestException as e:
-            return {'error': f"Erreur de connexion à ZAP : {str(e)}"}
-        except Exception as e:
-            return {'error': str(e)}
\ No newline at end of file
+
+def alert_list(request):
+    """
+    Alertes enregistrées, d'un scan ou de tous les scans, les plus graves
+    d'abord. Filtres : ?scan=, ?min_risk= (0-3), ?min_confidence= (0-4),
+    ?plugin_id=, ?url= (préfixe), ?param= ; pagination : ?page=, ?page_size=.
+    """
+    alerts = ScanAlert.objects.all()
+    if request.GET.get('scan'):
+        alerts = alerts.filter(scan_id=int_param(request.GET['scan'], 0))
+    if request.GET.get('min_risk'):
+        alerts = alerts.filter(risk__gte=int_param(request.GET['min_risk'], 0, maximum=3))
+    if request.GET.get('min_confidence'):
+        alerts = alerts.filter(confidence__gte=int_param(request.GET['min_confidence'], 0, maximum=4))
+    if request.GET.get('plugin_id'):
+        alerts = alerts.filter(plugin_id=request.GET['plugin_id'].strip())
+    if request.GET.get('url'):
+        alerts = alerts.filter(url__startswith=request.GET['url'].strip())
+    if request.GET.get('param'):
+        alerts = alerts.filter(param=request.GET['param'])
+
+    page_size = int_param(request.GET.get('page_size'), ALERTS_PAGE_SIZE, minimum=1, maximum=ALERTS_MAX_PAGE_SIZE)
+    page = Paginator(alerts.order_by('-risk', '-confidence', 'scan_id', 'id'), page_size).get_page(request.GET.get('page'))
+    return JsonResponse({
+        'success': True,
+        'page': page.number,
+        'pages': page.paginator.num_pages,
+        'count': page.paginator.count,
+        'alerts': [
+            {
+                'id': alert.pk,
+                'scan': alert.scan_id,
+                'plugin_id': alert.plugin_id,
+                'alert_ref': alert.alert_ref,
+                'name': alert.name,
+                'risk': alert.get_risk_display(),
+                'confidence': alert.get_confidence_display(),
+                'url': alert.url,
+                'param': alert.param,
+                'method': alert.method,
+                'cwe_id': alert.cwe_id,
+                'wasc_id': alert.wasc_id,
+                'attack': alert.attack,
+                'evidence': alert.evidence,
+            }
+            for alert in page.object_list
+        ]
+    })
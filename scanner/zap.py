@@ -0,0 +1,242 @@
+"""
+Client de l'API OWASP ZAP partagé par les scans du processus.
+
+Une seule requests.Session dont le pool keep-alive vers le démon est
+dimensionné sur les créneaux de l'ordonnanceur : les polls de statut ne
+rouvrent plus une connexion TCP à chaque appel. Les erreurs transitoires
+sont rejouées avec un backoff exponentiel (ZAP_RETRIES, ZAP_RETRY_BACKOFF) :
+coupure de connexion toujours, timeout et 502/503/504 seulement pour les
+vues (lancer deux fois une action créerait deux scans).
+
+Le polling est adaptatif : l'intervalle suit le temps restant estimé à
+partir de la progression (long au début, court près de la fin), borné par
+ZAP_POLL_MIN / ZAP_POLL_MAX, avec ±20 % de gigue pour que les scans
+parallèles ne pollent pas en rafale.
+"""
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = (502, 503, 504)
+
+# Délai maximal d'une requête à l'API ZAP (secondes)
+API_TIMEOUT = 30
+
+# Gigue relative des intervalles de polling et des backoffs
+JITTER = 0.2
+
+
+class ZapError(Exception):
+    """Erreur renvoyée par l'API ZAP (ou réponse inexploitable)"""
+
+
+class ZapTimeout(ZapError):
+    """Le scan n'est pas terminé dans le délai imparti"""
+
+
+def jittered(delay):
+    return delay * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+def poll_interval(progress, elapsed, minimum, maximum):
+    """
+    Intervalle avant le prochain poll : le quart du temps restant estimé
+    (progression linéaire) ; sans progression, la moitié du temps écoulé.
+    """
+    if progress <= 0:
+        interval = elapsed / 2
+    elif progress >= 100:
+        interval = 0
+    else:
+        interval = elapsed * (100 - progress) / progress / 4
+    return min(maximum, max(minimum, jittered(interval)))
+
+
+class ZapClient:
+    """Méthodes typées sur l'API JSON/OTHER de ZAP (spider, scan actif, alertes, rapports)"""
+
+    def __init__(self, base_url, api_key='', pool_size=4, retries=3, backoff=0.5,
+                 poll_min=1.0, poll_max=15.0, timeout=API_TIMEOUT):
+        self.base_url = base_url.rstrip('/')  # ex: http://127.0.0.1:8080
+        self.api_key = api_key
+        self.retries = retries
+        self.backoff = backoff
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Le démon est local : pas de proxy d'environnement (ni de recherche par requête)
+        self.session.trust_env = False
+        if api_key:
+            self.session.headers['X-ZAP-API-Key'] = api_key
+
+    def request(self, path, params=None, idempotent=True, stream=False):
+        """GET sur l'API avec rejeux des erreurs transitoires ; renvoie la réponse"""
+        # La clé passe en en-tête (X-ZAP-API-Key), pas dans l'URL
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout, stream=stream)
+                if not (idempotent and response.status_code in RETRY_STATUSES and attempt < self.retries):
+                    break
+                response.close()
+            except requests.exceptions.ConnectionError:
+                if attempt >= self.retries:
+                    raise
+            except requests.exceptions.Timeout:
+                if not idempotent or attempt >= self.retries:
+                    raise
+            time.sleep(jittered(self.backoff * 2 ** attempt))
+            attempt += 1
+
+        if response.status_code >= 400:
+            raise ZapError(self._error_message(response))
+        return response
+
+    def _error_message(self, response):
+        try:
+            data = response.json()
+            return f"{data.get('code', response.status_code)} : {data.get('message', '')}".strip(' :')
+        except ValueError:
+            return f"HTTP {response.status_code}"
+
+    def json(self, path, params=None, idempotent=True):
+        try:
+            return self.request(path, params, idempotent).json()
+        except ValueError:
+            raise ZapError(f"Réponse JSON invalide pour {path}")
+
+    # Spider
+
+    def spider_scan(self, url, max_children=None):
+        """Lance le spider ; renvoie l'identifiant de scan ZAP (str)"""
+        return str(self.json(
+            "/JSON/spider/action/scan/", {'url': url, 'maxChildren': max_children or None}, idempotent=False
+        )['scan'])
+
+    def spider_status(self, scan_id):
+        """Progression du spider en % (int)"""
+        return int(self.json("/JSON/spider/view/status/", {'scanId': scan_id})['status'])
+
+    def spider_stop(self, scan_id):
+        """Arrête le spider dans ZAP"""
+        self.json("/JSON/spider/action/stop/", {'scanId': scan_id})
+
+    # Scan actif
+
+    def ascan_scan(self, url, recurse=True, in_scope_only=True, scan_policy=None):
+        """Lance le scan actif (politique `scan_policy` de ZAP si fournie) ; renvoie l'identifiant de scan ZAP (str)"""
+        return str(self.json(
+            "/JSON/ascan/action/scan/",
+            {'url': url, 'recurse': str(recurse).lower(), 'inScopeOnly': str(in_scope_only).lower(),
+             'scanPolicyName': scan_policy or None},
+            idempotent=False
+        )['scan'])
+
+    def ascan_status(self, scan_id):
+        """Progression du scan actif en % (int)"""
+        return int(self.json("/JSON/ascan/view/status/", {'scanId': scan_id})['status'])
+
+    def ascan_stop(self, scan_id):
+        """Arrête le scan actif dans ZAP"""
+        self.json("/JSON/ascan/action/stop/", {'scanId': scan_id})
+
+    # Scan passif (automatique sur le trafic du spider)
+
+    def pscan_records_to_scan(self):
+        """Requêtes encore en attente du scan passif (int)"""
+        return int(self.json("/JSON/pscan/view/recordsToScan/")['recordsToScan'])
+
+    # Alertes et rapports
+
+    def alerts(self, baseurl=None, start=0, count=0):
+        """Alertes (list de dict), éventuellement une page `start`/`count` (0 = toutes)"""
+        data = self.json("/JSON/core/view/alerts/", {'baseurl': baseurl, 'start': start or None, 'count': count or None})
+        return data.get('alerts', []) if isinstance(data, dict) else data
+
+    def number_of_alerts(self, baseurl=None):
+        """Nombre d'alertes (int)"""
+        return int(self.json("/JSON/core/view/numberOfAlerts/", {'baseurl': baseurl})['numberOfAlerts'])
+
+    def html_report(self):
+        """Rapport HTML complet (str)"""
+        return self.request("/OTHER/core/other/htmlreport/").text
+
+    def iter_html_report(self, chunk_size=64 * 1024):
+        """Rapport HTML en flux (morceaux de bytes), sans le charger en mémoire"""
+        with self.request("/OTHER/core/other/htmlreport/", stream=True) as response:
+            yield from response.iter_content(chunk_size)
+
+    # Attente
+
+    def wait(self, status, scan_id, on_progress=None, timeout=None):
+        """
+        Attend qu'un scan atteigne 100 % ; `status` est spider_status ou
+        ascan_status, `on_progress(%)` est appelé à chaque poll.
+        Lève ZapTimeout après `timeout` secondes.
+        """
+        started = time.monotonic()
+        while True:
+            progress = status(scan_id)
+            if on_progress is not None:
+                on_progress(min(progress, 100))
+            if progress >= 100:
+                return
+            elapsed = time.monotonic() - started
+            if timeout and elapsed > timeout:
+                raise ZapTimeout(f"Scan {scan_id} non terminé après {int(elapsed)}s")
+            delay = poll_interval(progress, elapsed, self.poll_min, self.poll_max)
+            if timeout:
+                delay = min(delay, max(0.0, timeout - elapsed) + self.poll_min)
+            time.sleep(delay)
+
+    def wait_passive(self, timeout=None, on_progress=None):
+        """
+        Attend que le scan passif ait traité toutes les requêtes enregistrées
+        (sans progression connue : intervalle de la moitié du temps écoulé,
+        borné). `on_progress(requêtes restantes)` est appelé à chaque poll.
+        Lève ZapTimeout après `timeout` secondes.
+        """
+        started = time.monotonic()
+        while True:
+            remaining = self.pscan_records_to_scan()
+            if on_progress is not None:
+                on_progress(remaining)
+            if remaining <= 0:
+                return
+            elapsed = time.monotonic() - started
+            if timeout and elapsed > timeout:
+                raise ZapTimeout(f"Scan passif non terminé après {int(elapsed)}s")
+            time.sleep(poll_interval(0, elapsed, self.poll_min, self.poll_max))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Client ZAP du processus, créé au premier appel"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ZapClient(
+                    settings.ZAP_DAEMON_URL,
+                    settings.ZAP_API_KEY,
+                    # Un poll par scan en vol, plus les vues
+                    pool_size=getattr(settings, 'ZAP_MAX_SPIDERS', 2) + getattr(settings, 'ZAP_MAX_ASCANS', 2) + 2,
+                    retries=getattr(settings, 'ZAP_RETRIES', 3),
+                    backoff=getattr(settings, 'ZAP_RETRY_BACKOFF', 0.5),
+                    poll_min=getattr(settings, 'ZAP_POLL_MIN', 1.0),
+                    poll_max=getattr(settings, 'ZAP_POLL_MAX', 15.0),
+                )
+    return _client
@@ -128,6 +128,55 @@ STATIC_URL = 'static/'
 ZAP_DAEMON_URL = os.environ.get('ZAP_DAEMON_URL', 'http://127.0.0.1:8080')
 ZAP_API_KEY = os.environ.get('ZAP_API_KEY', '')
 ZAP_TIMEOUT = int(os.environ.get('ZAP_TIMEOUT', '300'))  # 5 minutes par défaut
+ZAP_MAX_SPIDERS = int(os.environ.get('ZAP_MAX_SPIDERS', '2'))  # spiders simultanés sur le démon ZAP
+ZAP_MAX_ASCANS = int(os.environ.get('ZAP_MAX_ASCANS', '2'))  # scans actifs simultanés (chacun déjà multi-threadé par ZAP)
+ZAP_RETRIES = int(os.environ.get('ZAP_RETRIES', '3'))  # rejeux sur erreur transitoire de l'API ZAP
+ZAP_RETRY_BACKOFF = float(os.environ.get('ZAP_RETRY_BACKOFF', '0.5'))  # secondes, doublées à chaque rejeu
+ZAP_POLL_MIN = float(os.environ.get('ZAP_POLL_MIN', '1'))  # intervalle de polling minimal (fin de scan)
+ZAP_POLL_MAX = float(os.environ.get('ZAP_POLL_MAX', '15'))  # intervalle de polling maximal (début de scan)
+ZAP_ALERTS_PAGE_SIZE = int(os.environ.get('ZAP_ALERTS_PAGE_SIZE', '500'))  # alertes lues par appel à l'API ZAP
+ZAP_REPORTS_DIR = os.environ.get('ZAP_REPORTS_DIR', 'reports')  # rapports HTML compressés (relatif au dossier de lancement, comme avant)
+ZAP_REPORT_MAX_AGE_DAYS = int(os.environ.get('ZAP_REPORT_MAX_AGE_DAYS', '90'))  # rétention par âge (0 = illimitée)
+ZAP_REPORT_MAX_TOTAL_MB = int(os.environ.get('ZAP_REPORT_MAX_TOTAL_MB', '1024'))  # rétention par taille totale compressée (0 = illimitée)
 
 # Default ID for TYPE
 DEFAULT_TYPE=int(os.environ.get('DEFAULT_TYPE', '1'))
+
+# Checker (WhatsMyName)
+CHECKER_MAX_WORKERS = int(os.environ.get('CHECKER_MAX_WORKERS', '64'))  # plafond global de sondes simultanées
+CHECKER_PER_HOST_LIMIT = int(os.environ.get('CHECKER_PER_HOST_LIMIT', '4'))  # sondes simultanées par hôte
+CHECKER_TIMEOUT = float(os.environ.get('CHECKER_TIMEOUT', '10'))
+
+# Cache des sondes checker (secondes) : TTL par défaut puis par verdict
+CHECKER_CACHE_TTL = int(os.environ.get('CHECKER_CACHE_TTL', '3600'))
+CHECKER_CACHE_TTL_FOUND = int(os.environ.get('CHECKER_CACHE_TTL_FOUND', str(CHECKER_CACHE_TTL * 24)))
+CHECKER_CACHE_TTL_MISSING = int(os.environ.get('CHECKER_CACHE_TTL_MISSING', str(CHECKER_CACHE_TTL * 6)))
+CHECKER_CACHE_TTL_ERROR = int(os.environ.get('CHECKER_CACHE_TTL_ERROR', '300'))
+CHECKER_CACHE_RETENTION_DAYS = int(os.environ.get('CHECKER_CACHE_RETENTION_DAYS', '7'))  # sondes expirées gardées pour l'historique, puis supprimées (0 = jamais)
+CHECKER_HISTORY_DAYS = int(os.environ.get('CHECKER_HISTORY_DAYS', '7'))  # fenêtre des taux de succès utilisés pour l'ordonnancement
+CHECKER_CACHE_MAX_ENTRIES = int(os.environ.get('CHECKER_CACHE_MAX_ENTRIES', '20000'))  # tier LRU en mémoire
+CHECKER_MAX_BODY_BYTES = int(os.environ.get('CHECKER_MAX_BODY_BYTES', str(2 * 1024 * 1024)))  # lecture max du corps d'une réponse
+CHECKER_RUNTIME_DIR = os.environ.get('CHECKER_RUNTIME_DIR', os.path.join(BASE_DIR, 'checker_data'))  # fichiers produits à l'exécution (catalogue actif wmn-active.json)
+CHECKER_BATCH_DIR = os.environ.get('CHECKER_BATCH_DIR', os.path.join(BASE_DIR, 'checker_batches'))  # lots checker_batch (entrées + résultats)
+CHECKER_BREAKER_THRESHOLD = int(os.environ.get('CHECKER_BREAKER_THRESHOLD', '5'))  # échecs consécutifs avant ouverture
+CHECKER_BREAKER_COOLDOWN = int(os.environ.get('CHECKER_BREAKER_COOLDOWN', '300'))  # secondes, doublé à chaque rechute
+CHECKER_BREAKER_MAX_COOLDOWN = int(os.environ.get('CHECKER_BREAKER_MAX_COOLDOWN', '3600'))
+CHECKER_POOL_HOSTS = int(os.environ.get('CHECKER_POOL_HOSTS', '256'))  # hôtes dont les connexions keep-alive sont gardées
+CHECKER_RETRIES = int(os.environ.get('CHECKER_RETRIES', '1'))  # rejeux sur erreur de connexion ou 429/502/503/504
+CHECKER_RETRY_BACKOFF = float(os.environ.get('CHECKER_RETRY_BACKOFF', '0.3'))  # secondes, doublées à chaque rejeu
+CHECKER_DNS_TTL = int(os.environ.get('CHECKER_DNS_TTL', '300'))  # durée de vie des résolutions DNS en cache, 0 = désactivé
+CHECKER_DEFAULT_BUDGET = float(os.environ.get('CHECKER_DEFAULT_BUDGET', '0'))  # secondes par recherche, 0 = sans limite
+
+# Intruder
+INTRUDER_WORKERS = int(os.environ.get('INTRUDER_WORKERS', '10'))  # workers par attaque par défaut
+INTRUDER_MAX_WORKERS = int(os.environ.get('INTRUDER_MAX_WORKERS', '50'))  # plafond demandé par formulaire
+INTRUDER_MAX_RPS = int(os.environ.get('INTRUDER_MAX_RPS', '0'))  # plafond de requêtes/seconde par attaque, 0 = sans limite
+INTRUDER_TIMEOUT = float(os.environ.get('INTRUDER_TIMEOUT', '5'))
+INTRUDER_WORDLIST_DIR = os.environ.get('INTRUDER_WORDLIST_DIR', os.path.join(BASE_DIR, 'wordlists'))  # wordlists serveur (SecLists...) et fichiers envoyés
+INTRUDER_MAX_BODY_BYTES = int(os.environ.get('INTRUDER_MAX_BODY_BYTES', str(1024 * 1024)))  # octets de réponse analysés par les détecteurs
+INTRUDER_BASELINE_REQUESTS = int(os.environ.get('INTRUDER_BASELINE_REQUESTS', '5'))  # requêtes de référence avant chaque attaque
+INTRUDER_CLUSTER_SAMPLE_BYTES = int(os.environ.get('INTRUDER_CLUSTER_SAMPLE_BYTES', str(64 * 1024)))  # corps représentatif gardé par groupe de réponses
+INTRUDER_TIMING_REPEATS = int(os.environ.get('INTRUDER_TIMING_REPEATS', '5'))  # rejeux par payload lent (et autant de baselines)
+INTRUDER_TIMING_CONCURRENCY = int(os.environ.get('INTRUDER_TIMING_CONCURRENCY', '2'))  # rejeux simultanés, faible pour ne pas fausser les temps
+INTRUDER_TIMING_MIN_DELAY = float(os.environ.get('INTRUDER_TIMING_MIN_DELAY', '1.0'))  # retard médian minimal retenu (secondes)
+INTRUDER_TIMING_ALPHA = float(os.environ.get('INTRUDER_TIMING_ALPHA', '0.01'))  # seuil de significativité du test de Mann-Whitney